@@ -59,5 +59,18 @@ class Cache_Conf(_config.ConfigNamespace):
         cfgtype='boolean'
     )
 
+    cache_max_size = _config.ConfigItem(
+        0,
+        ('Maximum size (bytes) of the cache of each service. When exceeded, the least '
+         'recently used entries are evicted. Default is 0, meaning no limit.'),
+        cfgtype='integer'
+    )
+
+    cache_compression = _config.ConfigItem(
+        False,
+        "Whether to gzip-compress the bodies of newly cached responses.",
+        cfgtype='boolean'
+    )
+
 
 cache_conf = Cache_Conf()
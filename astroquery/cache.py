@@ -0,0 +1,371 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Indexed on-disk cache used by `~astroquery.query.BaseQuery`.
+
+Each service keeps its cached responses in its own ``cache_location``. The
+entries of a location are tracked in a single SQLite index holding their size,
+creation and last access times, so that lookups, expiry and eviction never
+need to scan the directory. The body of each response is stored as a plain
+(optionally gzip-compressed) file, while its status, headers and originating
+request are kept as a small metadata record in the index.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from astroquery import log
+
+
+__all__ = ['CacheStore']
+
+
+def _response_metadata(response):
+    """JSON-serializable record of everything but the body of ``response``."""
+    request = getattr(response, 'request', None)
+    body = getattr(request, 'body', None)
+    body_is_bytes = isinstance(body, bytes)
+    if body_is_bytes:
+        body = body.decode('latin-1')
+    elif not isinstance(body, str):
+        body = None
+    return {'status_code': response.status_code,
+            'reason': response.reason,
+            'url': response.url,
+            'encoding': response.encoding,
+            'headers': dict(response.headers),
+            'cookies': [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                         'path': cookie.path, 'secure': cookie.secure, 'expires': cookie.expires}
+                        for cookie in response.cookies],
+            'history': [_response_metadata(redirect) for redirect in response.history],
+            'content_is_str': isinstance(response._content, str),
+            'request': {'method': getattr(request, 'method', None),
+                        'url': getattr(request, 'url', None),
+                        'body': body,
+                        'body_is_bytes': body_is_bytes}}
+
+
+def _response_from_metadata(metadata):
+    """
+    Rebuild a body-less `requests.Response` from `_response_metadata`.
+
+    The responses of the redirection history are rebuilt as well, with an
+    empty body.
+    """
+    response = requests.Response()
+    response.status_code = metadata['status_code']
+    response.reason = metadata['reason']
+    response.url = metadata['url']
+    response.encoding = metadata['encoding']
+    response.headers = CaseInsensitiveDict(metadata['headers'])
+    for cookie in metadata.get('cookies', []):
+        response.cookies.set_cookie(requests.cookies.create_cookie(**cookie))
+    response.history = []
+    for redirect_metadata in metadata.get('history', []):
+        redirect = _response_from_metadata(redirect_metadata)
+        redirect._content = b''
+        response.history.append(redirect)
+
+    request_metadata = metadata['request']
+    request = requests.PreparedRequest()
+    request.method = request_metadata['method']
+    request.url = request_metadata['url']
+    request.body = request_metadata['body']
+    if request_metadata['body_is_bytes']:
+        request.body = request.body.encode('latin-1')
+    response.request = request
+    return response
+
+
+class _CachedBody:
+    """
+    Body file of a cached response handed out as ``Response.raw``. Like a
+    consumed HTTP stream, it closes itself once read to the end.
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def read(self, size=-1):
+        if self._fileobj.closed:
+            return b''
+        data = self._fileobj.read(size)
+        if not data or size is None or size < 0:
+            self._fileobj.close()
+        return data
+
+    def close(self):
+        self._fileobj.close()
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+
+def _atomic_write(path, writer):
+    """
+    Write ``path`` through ``writer(fileobj)`` so that readers never see a
+    partially written file.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer(f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class CacheStore:
+    """
+    Size-bounded response cache for a single service cache location.
+
+    The body of each entry is stored as an individual file next to an SQLite
+    index (``cache_index.sqlite``) which holds the rest of the response.
+    Files are written atomically, lookups go through the index, and when the
+    total size of the entries exceeds ``max_size`` the least recently used
+    entries are evicted. Hit and miss counters are kept in the index as well,
+    so they persist between sessions.
+
+    Any object providing the ``get``, ``put``, ``remove``, ``clear`` and
+    ``info`` methods can be plugged into
+    `~astroquery.query.BaseQuery.cache_store` instead of this class.
+
+    Parameters
+    ----------
+    location : str or `~pathlib.Path`
+        Directory holding the cache entries and the index.
+    max_size : int, optional
+        Maximum total size of the entries in bytes. ``None`` or ``0`` means
+        no limit.
+    compress : bool, optional
+        Whether to gzip-compress the bodies of new entries. Defaults to False.
+    """
+
+    INDEX_NAME = 'cache_index.sqlite'
+    _SCHEMA_VERSION = 2
+
+    def __init__(self, location, *, max_size=None, compress=False):
+        self.location = Path(location)
+        self.max_size = max_size
+        self.compress = compress
+
+    @property
+    def index_file(self):
+        return self.location / self.INDEX_NAME
+
+    def entry_file(self, key):
+        """Path of the file holding the body of the entry ``key``."""
+        return self.location / (f"{key}.body.gz" if self.compress else f"{key}.body")
+
+    def _connect(self):
+        self.location.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_file, timeout=30)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self._SCHEMA_VERSION:
+            with conn:
+                # Take the write lock before checking again, so that a single
+                # process creates or migrates the index
+                conn.execute("BEGIN IMMEDIATE")
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version == self._SCHEMA_VERSION:
+                    return conn
+                if version:
+                    # Entries written in an older format can't be read any more
+                    self._unlink(row[0] for row in conn.execute("SELECT filename FROM entries"))
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute("CREATE TABLE entries ("
+                             "key TEXT PRIMARY KEY, "
+                             "filename TEXT NOT NULL, "
+                             "compressed INTEGER NOT NULL, "
+                             "metadata TEXT NOT NULL, "
+                             "size INTEGER NOT NULL, "
+                             "created REAL NOT NULL, "
+                             "accessed REAL NOT NULL, "
+                             "hits INTEGER NOT NULL DEFAULT 0)")
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+                conn.execute("CREATE TABLE IF NOT EXISTS stats ("
+                             "name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+                conn.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+        return conn
+
+    @staticmethod
+    def _count(conn, name):
+        conn.execute("INSERT INTO stats (name, value) VALUES (?, 1) "
+                     "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+
+    def _unlink(self, filenames):
+        for filename in filenames:
+            try:
+                (self.location / filename).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _open_body(self, filename, compressed):
+        body_file = self.location / filename
+        return gzip.open(body_file, 'rb') if compressed else open(body_file, 'rb')
+
+    def get(self, key, timeout=-1, *, stream=False):
+        """
+        Return the cached response for ``key``, or `None` on a miss.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the request, see `~astroquery.query.AstroQuery.hash`.
+        timeout : int, optional
+            Age in seconds after which an entry is considered expired.
+            ``-1`` (default) means entries never expire.
+        stream : bool, optional
+            If True, the body is not read into memory: the response ``raw``
+            attribute is the open (and transparently decompressed) body file,
+            so it can be streamed with ``iter_content`` or passed directly to
+            a parser. As for any streamed response, it is up to the caller to
+            consume it or to ``close`` it.
+        """
+        now = time.time()
+        stale = []
+        response = None
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT filename, compressed, metadata, created FROM entries WHERE key = ?",
+                               (key,)).fetchone()
+            if row is not None:
+                filename, compressed, metadata, created = row
+                if timeout != -1 and now - created > timeout:
+                    log.debug(f"Cache expired for {filename}...")
+                    stale.append(filename)
+                else:
+                    try:
+                        body = self._open_body(filename, compressed)
+                    except FileNotFoundError:
+                        pass
+                    else:
+                        metadata = json.loads(metadata)
+                        response = _response_from_metadata(metadata)
+                        if stream:
+                            response.raw = _CachedBody(body)
+                        else:
+                            with body:
+                                response._content = body.read()
+                            if metadata.get('content_is_str'):
+                                response._content = response._content.decode('utf-8')
+                            response._content_consumed = True
+                if response is None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                else:
+                    conn.execute("UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?",
+                                 (now, key))
+            self._count(conn, 'hits' if response is not None else 'misses')
+        self._unlink(stale)
+        if response is not None:
+            log.debug("Retrieved data from {0}".format(self.location / row[0]))
+        return response
+
+    def put(self, key, response):
+        """
+        Store ``response`` under ``key``, evicting the least recently used
+        entries if the store grows beyond ``max_size``.
+        """
+        if not isinstance(response, requests.Response):
+            return
+        body_file = self.entry_file(key)
+        log.debug("Caching data to {0}".format(body_file))
+        content = response.content
+        if isinstance(content, str):
+            # Mocked responses may have a text body
+            content = content.encode('utf-8')
+
+        def write_body(f):
+            if self.compress:
+                with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                    gz.write(content)
+            else:
+                f.write(content)
+
+        _atomic_write(body_file, write_body)
+        metadata = json.dumps(_response_metadata(response))
+        size = body_file.stat().st_size + len(metadata)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            previous = conn.execute("SELECT filename FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO entries "
+                         "(key, filename, compressed, metadata, size, created, accessed) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (key, body_file.name, int(self.compress), metadata, size, now, now))
+            evicted = self._evict(conn)
+        if previous and previous[0] != body_file.name:
+            evicted.append(previous[0])
+        self._unlink(evicted)
+
+    def _evict(self, conn):
+        if not self.max_size:
+            return []
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        evicted = []
+        if total > self.max_size:
+            for key, filename, size in conn.execute(
+                    "SELECT key, filename, size FROM entries ORDER BY accessed").fetchall():
+                if total <= self.max_size:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted.append(filename)
+                total -= size
+            log.debug(f"Evicted {len(evicted)} entries from {self.location}")
+        return evicted
+
+    def remove(self, key):
+        """
+        Remove the entry ``key``.
+
+        Raises
+        ------
+        FileNotFoundError
+            If there is no such entry.
+        """
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT filename FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        filename = row[0] if row else self.entry_file(key).name
+        if not (self.location / filename).exists():
+            raise FileNotFoundError(f"Tried to remove cache file {self.location / filename} but "
+                                    "it does not exist")
+        self._unlink([filename])
+
+    def clear(self):
+        """Remove all entries and reset the hit and miss counters."""
+        with closing(self._connect()) as conn, conn:
+            filenames = [row[0] for row in conn.execute("SELECT filename FROM entries")]
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM stats")
+        self._unlink(filenames)
+        # Pickled responses left behind by the cache of previous versions
+        for fle in self.location.glob("*.pickle"):
+            fle.unlink()
+
+    def info(self):
+        """
+        Summary of the store content.
+
+        Returns
+        -------
+        info : dict
+            Number of ``entries``, their total ``size`` in bytes, the
+            ``max_size`` and the ``hits`` and ``misses`` counters.
+        """
+        with closing(self._connect()) as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        return {'entries': entries, 'size': size, 'max_size': self.max_size,
+                'hits': stats.get('hits', 0), 'misses': stats.get('misses', 0)}
@@ -20,6 +20,13 @@ class Conf(_config.ConfigNamespace):
         'ivo://cadc.nrc.ca/gms', 'CADC login service identified')
     TIMEOUT = _config.ConfigItem(
         30, 'Time limit for connecting to template_module server.')
+    DATALINK_BATCH_SIZE = _config.ConfigItem(
+        20, 'Number of publisher IDs resolved by each DataLink request')
+    DATALINK_WORKERS = _config.ConfigItem(
+        4, 'Maximum number of DataLink requests sent concurrently')
+    DATALINK_CACHE_SIZE = _config.ConfigItem(
+        10000, 'Maximum number of publisher IDs whose DataLink document is '
+        'kept in memory')
 
 
 conf = Conf()
@@ -8,8 +8,11 @@ Module to query the Canadian Astronomy Data Centre (CADC).
 """
 
 from astroquery import log
+import threading
 import warnings
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from numpy import ma
 from pathlib import Path
 from urllib.parse import urlencode
@@ -69,6 +72,9 @@ class CadcClass(BaseVOQuery, BaseQuery):
     CADCDATALINK_SERVICE_URI = conf.CADCDATLINK_SERVICE_URI
     CADCLOGIN_SERVICE_URI = conf.CADCLOGIN_SERVICE_URI
     TIMEOUT = conf.TIMEOUT
+    DATALINK_BATCH_SIZE = conf.DATALINK_BATCH_SIZE
+    DATALINK_WORKERS = conf.DATALINK_WORKERS
+    DATALINK_CACHE_SIZE = conf.DATALINK_CACHE_SIZE
 
     def __init__(self, *, url=None, auth_session=None):
         """
@@ -96,6 +102,11 @@ class CadcClass(BaseVOQuery, BaseQuery):
             self._auth_session = auth_session
         else:
             self._auth_session = authsession.AuthSession()
+        # DataLink documents already resolved, by request parameters and
+        # publisher ID, for the DATALINK_CACHE_SIZE most recently used
+        # publisher IDs. They depend on the credentials, see login/logout
+        self._datalink_cache = OrderedDict()
+        self._datalink_cache_lock = threading.Lock()
 
     @property
     def cadctap(self):
@@ -153,6 +164,7 @@ class CadcClass(BaseVOQuery, BaseQuery):
         if not certificate_file and not (user and password):
             raise AttributeError('login credentials missing (user/password '
                                  'or certificate)')
+        self._clear_datalink_cache()
         if certificate_file:
             if isinstance(self.cadctap._session, authsession.AuthSession):
                 self.cadctap._session.credentials.\
@@ -202,6 +214,7 @@ class CadcClass(BaseVOQuery, BaseQuery):
         it was passed when the object was first instantiated)
         """
 
+        self._clear_datalink_cache()
         if isinstance(self._auth_session, pyvo.auth.AuthSession):
             # Remove the existing credentials (if any)
             # PyVO should provide this reset credentials functionality
@@ -399,7 +412,8 @@ class CadcClass(BaseVOQuery, BaseQuery):
                                       show_progress=show_progress)
                 for url in images_urls]
 
-    def get_image_list(self, query_result, coordinates, radius):
+    def get_image_list(self, query_result, coordinates, radius, *,
+                       batch_size=None):
         """
         Function to map the results of a CADC query into URLs to
         corresponding data and cutouts that can be later downloaded.
@@ -412,6 +426,9 @@ class CadcClass(BaseVOQuery, BaseQuery):
         contain the 'publisherID' column. This column is part of the
         'caom2.Plane' table.
 
+        The DataLink requests are sent concurrently, see
+        `iter_image_list`.
+
         Parameters
         ----------
         query_result : A `~astropy.table.Table` object
@@ -423,12 +440,54 @@ class CadcClass(BaseVOQuery, BaseQuery):
             Center of the cutout area.
         radius : str or `astropy.units.Quantity`.
             The radius of the cutout area.
+        batch_size : int, optional
+            Number of publisher IDs resolved by each DataLink request.
+            Defaults to ``conf.DATALINK_BATCH_SIZE``.
 
         Returns
         -------
         list : A list of URLs to cutout data.
         """
+        return _sorted_urls(self._image_urls(query_result, coordinates,
+                                             radius, batch_size=batch_size))
+
+    def iter_image_list(self, query_result, coordinates, radius, *,
+                        batch_size=None):
+        """
+        Same as `get_image_list`, but returns an iterator over the URLs to
+        cutout data, yielded as soon as the DataLink request of their
+        publisher IDs completes.
+
+        The publisher IDs are resolved in batches of ``batch_size``, at most
+        ``conf.DATALINK_WORKERS`` requests being sent at the same time. The
+        DataLink documents are kept by publisher ID, so that they are not
+        requested again by this object until `login` or `logout`.
 
+        Parameters
+        ----------
+        query_result : A `~astropy.table.Table` object
+            Result returned by `query_region` or
+            `query_name`. In general, the result of any
+            CADC TAP query that contains the 'publisherID'
+            column can be used here.
+        coordinates : str or `astropy.coordinates`.
+            Center of the cutout area.
+        radius : str or `astropy.units.Quantity`.
+            The radius of the cutout area.
+        batch_size : int, optional
+            Number of publisher IDs resolved by each DataLink request.
+            Defaults to ``conf.DATALINK_BATCH_SIZE``.
+
+        Returns
+        -------
+        iterator : URLs to cutout data, in the order their batches complete.
+        """
+        return (url for _, urls in self._image_urls(query_result, coordinates,
+                                                    radius, batch_size=batch_size)
+                for url in urls)
+
+    def _image_urls(self, query_result, coordinates, radius, *,
+                    batch_size=None):
         if not query_result:
             raise AttributeError('Missing query_result argument')
 
@@ -444,18 +503,7 @@ class CadcClass(BaseVOQuery, BaseQuery):
             raise AttributeError(
                 'publisherID column missing from query_result argument')
 
-        result = []
-
-        # Send datalink requests in batches of 20 publisher ids
-        batch_size = 20
-
-        # Iterate through list of sublists to send datalink requests in batches
-        for pid_sublist in (publisher_ids[pos:pos + batch_size] for pos in
-                            range(0, len(publisher_ids), batch_size)):
-            datalink = pyvo.dal.adhoc.DatalinkResults.from_result_url(
-                '{}?{}'.format(self.data_link_url,
-                               urlencode({'ID': pid_sublist}, True)),
-                session=self.cadcdatalink._session)
+        def cutout_urls(datalink):
             for service_def in datalink.bysemantics('#cutout'):
                 access_url = service_def.access_url
 
@@ -465,13 +513,15 @@ class CadcClass(BaseVOQuery, BaseQuery):
                                     for param in service_params if
                                     param.name in ['ID', 'RUNID']}
                     input_params.update(cutout_params)
-                    result.append('{}?{}'.format(access_url,
-                                                 urlencode(input_params)))
+                    yield service_def, '{}?{}'.format(access_url,
+                                                      urlencode(input_params))
 
-        return result
+        return self._resolve_datalinks(publisher_ids, cutout_urls,
+                                       batch_size=batch_size)
 
     @class_or_instance
-    def get_data_urls(self, query_result, *, include_auxiliaries=False):
+    def get_data_urls(self, query_result, *, include_auxiliaries=False,
+                      batch_size=None):
         """
         Function to map the results of a CADC query into URLs to
         corresponding data that can be later downloaded.
@@ -484,6 +534,8 @@ class CadcClass(BaseVOQuery, BaseQuery):
         contain the 'publisherID' column. This column is part of the
         'caom2.Plane' table.
 
+        The DataLink requests are sent concurrently, see `iter_data_urls`.
+
         Parameters
         ----------
         query_result : A `~astropy.table.Table` object
@@ -494,12 +546,54 @@ class CadcClass(BaseVOQuery, BaseQuery):
         include_auxiliaries : boolean
                 ``True`` to return URLs to auxiliary files such as
                 previews, ``False`` otherwise
+        batch_size : int, optional
+                Number of publisher IDs resolved by each DataLink request.
+                Defaults to ``conf.DATALINK_BATCH_SIZE``.
 
         Returns
         -------
         A list of URLs to data.
         """
+        return _sorted_urls(self._data_urls(
+            query_result, include_auxiliaries=include_auxiliaries,
+            batch_size=batch_size))
+
+    def iter_data_urls(self, query_result, *, include_auxiliaries=False,
+                       batch_size=None):
+        """
+        Same as `get_data_urls`, but returns an iterator over the URLs to
+        data, yielded as soon as the DataLink request of their publisher IDs
+        completes.
+
+        The publisher IDs are resolved in batches of ``batch_size``, at most
+        ``conf.DATALINK_WORKERS`` requests being sent at the same time. The
+        DataLink documents are kept by publisher ID, so that they are not
+        requested again by this object until `login` or `logout`.
+
+        Parameters
+        ----------
+        query_result : A `~astropy.table.Table` object
+                Result returned by `query_region` or
+                `query_name`. In general, the result of any
+                CADC TAP query that contains the 'publisherID' column
+                can be use here.
+        include_auxiliaries : boolean
+                ``True`` to return URLs to auxiliary files such as
+                previews, ``False`` otherwise
+        batch_size : int, optional
+                Number of publisher IDs resolved by each DataLink request.
+                Defaults to ``conf.DATALINK_BATCH_SIZE``.
 
+        Returns
+        -------
+        iterator : URLs to data, in the order their batches complete.
+        """
+        return (url for _, urls in self._data_urls(
+            query_result, include_auxiliaries=include_auxiliaries,
+            batch_size=batch_size) for url in urls)
+
+    def _data_urls(self, query_result, *, include_auxiliaries=False,
+                   batch_size=None):
         if not query_result:
             raise AttributeError('Missing metadata argument')
 
@@ -508,21 +602,8 @@ class CadcClass(BaseVOQuery, BaseQuery):
         except KeyError:
             raise AttributeError(
                 'publisherID column missing from query_result argument')
-        result = []
-        # Send datalink requests in batches of 20 publisher ids
-        batch_size = 20
-
-        # Iterate through list of sublists to send datalink requests in batches
-        for pid_sublist in (publisher_ids[pos:pos + batch_size] for pos in
-                            range(0, len(publisher_ids), batch_size)):
-            # REQUEST=download-only is a CADC optimization to restrict
-            # results to downloadable URLs as opposed to redirects
-            # to other services such as cutouts that are not required
-            datalink = pyvo.dal.adhoc.DatalinkResults.from_result_url(
-                '{}?{}'.format(self.data_link_url,
-                               urlencode({'ID': pid_sublist,
-                                          'REQUEST': 'downloads-only'}, True)),
-                session=self.cadcdatalink._session)
+
+        def data_urls(datalink):
             for service_def in datalink:
                 if service_def.semantics in ['http://www.opencadc.org/caom2#pkg', '#package']:
                     # TODO http://www.openadc.org/caom2#pkg has been replaced
@@ -535,8 +616,102 @@ class CadcClass(BaseVOQuery, BaseQuery):
                 if not include_auxiliaries \
                    and service_def.semantics != '#this':
                     continue
-                result.append(service_def.access_url)
-        return result
+                yield service_def, service_def.access_url
+
+        # REQUEST=download-only is a CADC optimization to restrict
+        # results to downloadable URLs as opposed to redirects
+        # to other services such as cutouts that are not required
+        return self._resolve_datalinks(publisher_ids, data_urls,
+                                       batch_size=batch_size,
+                                       REQUEST='downloads-only')
+
+    def _resolve_datalinks(self, publisher_ids, extract_urls, *,
+                           batch_size=None, **params):
+        """
+        Generator of the URLs found in the DataLink documents of
+        ``publisher_ids``, as ``(index, urls)`` pairs where ``index`` is the
+        position in ``publisher_ids`` of the publisher ID of the ``urls``.
+
+        Documents already in the cache come first. The others are requested
+        concurrently in batches of ``batch_size`` publisher IDs, with the
+        extra request parameters ``params``, and are yielded as the batches
+        complete. ``extract_urls`` yields the ``(record, url)`` pairs of a
+        document.
+        """
+        batch_size = batch_size or self.DATALINK_BATCH_SIZE
+        request = tuple(sorted(params.items()))
+        positions = {}
+        for index, publisher_id in enumerate(publisher_ids):
+            positions.setdefault(publisher_id, index)
+
+        def select(datalink, batch, requested_ids):
+            # A cached document may also describe publisher IDs that are not
+            # requested this time. The URLs of records without a requested
+            # publisher ID go with the first publisher ID of the document
+            whole = set(batch) <= requested_ids
+            first = min(positions[publisher_id]
+                        for publisher_id in requested_ids)
+            urls = {}
+            for record, url in extract_urls(datalink):
+                if record.id in requested_ids:
+                    urls.setdefault(positions[record.id], []).append(url)
+                elif whole:
+                    urls.setdefault(first, []).append(url)
+            return urls.items()
+
+        cached = {}
+        missing = []
+        with self._datalink_cache_lock:
+            for publisher_id in positions:
+                entry = self._datalink_cache.get((request, publisher_id))
+                if entry is None:
+                    missing.append(publisher_id)
+                else:
+                    self._datalink_cache.move_to_end((request, publisher_id))
+                    cached.setdefault(id(entry), (entry, []))[1].append(
+                        publisher_id)
+        for entry, requested_ids in cached.values():
+            yield from select(*entry, set(requested_ids))
+        if not missing:
+            return
+
+        data_link_url = self.data_link_url
+        session = self.cadcdatalink._session
+
+        def resolve(batch):
+            return pyvo.dal.adhoc.DatalinkResults.from_result_url(
+                '{}?{}'.format(data_link_url,
+                               urlencode({'ID': batch, **params}, True)),
+                session=session)
+
+        batches = [missing[pos:pos + batch_size]
+                   for pos in range(0, len(missing), batch_size)]
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.DATALINK_WORKERS, len(batches))))
+        try:
+            futures = {executor.submit(resolve, batch): batch
+                       for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                entry = (future.result(), tuple(batch))
+                with self._datalink_cache_lock:
+                    for publisher_id in batch:
+                        self._datalink_cache[(request, publisher_id)] = entry
+                    while len(self._datalink_cache) > \
+                            max(0, self.DATALINK_CACHE_SIZE):
+                        self._datalink_cache.popitem(last=False)
+                yield from select(*entry, set(batch))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _clear_datalink_cache(self):
+        with self._datalink_cache_lock:
+            self._datalink_cache.clear()
+
+    def clear_cache(self):
+        """Removes all cache files and the DataLink documents kept in memory."""
+        super().clear_cache()
+        self._clear_datalink_cache()
 
     def get_tables(self, *, only_names=False):
         """
@@ -818,4 +993,13 @@ def get_access_url(service, *, capability=None):
                        "anonymous or cookie access".format(capability))
 
 
+def _sorted_urls(resolved):
+    """
+    Flattens the ``(index, urls)`` pairs of ``CadcClass._resolve_datalinks``
+    into a list of URLs in the order of their publisher IDs.
+    """
+    return [url for _, urls in sorted(resolved, key=lambda item: item[0])
+            for url in urls]
+
+
 Cadc = CadcClass()
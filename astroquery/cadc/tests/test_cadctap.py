@@ -263,6 +263,95 @@ def test_get_data_urls():
         cadc.get_data_urls({'noPublisherID': 'test'})
 
 
+@patch('astroquery.cadc.core.get_access_url',
+       Mock(side_effect=lambda x, capability=None: 'https://some.url'))
+@patch('astroquery.cadc.core.pyvo.dal.adhoc.DatalinkService',
+       Mock(return_value=Mock(capabilities=[])))  # DL capabilities not needed
+def test_get_data_urls_batches():
+    requested = []
+
+    def from_result_url(url, session=None):
+        ids = parse_qs(urlsplit(url).query)['ID']
+        requested.append(ids)
+        records = []
+        for publisher_id in ids:
+            record = Mock(id=publisher_id, semantics='#this',
+                          access_url='https://get.your.data/' + publisher_id)
+            records.append(record)
+        return records
+
+    publisher_ids = ['ivo://cadc.nrc.ca/{}'.format(i) for i in range(5)]
+    expected = ['https://get.your.data/' + pid for pid in publisher_ids]
+    with patch('pyvo.dal.adhoc.DatalinkResults.from_result_url',
+               side_effect=from_result_url):
+        cadc = Cadc()
+        assert cadc.get_data_urls({'publisherID': publisher_ids},
+                                  batch_size=2) == expected
+        assert sorted(map(tuple, requested)) == [tuple(publisher_ids[0:2]),
+                                                 tuple(publisher_ids[2:4]),
+                                                 tuple(publisher_ids[4:])]
+
+        # the documents are cached by publisher ID, even when a batch
+        # also describes other publisher IDs
+        requested.clear()
+        assert cadc.get_data_urls(
+            {'publisherID': publisher_ids[1:4]}) == expected[1:4]
+        assert sorted(cadc.iter_data_urls(
+            {'publisherID': publisher_ids + ['ivo://cadc.nrc.ca/5']})) == \
+            expected + ['https://get.your.data/ivo://cadc.nrc.ca/5']
+        assert requested == [['ivo://cadc.nrc.ca/5']]
+
+        # the documents depend on the credentials
+        requested.clear()
+        cadc.logout()
+        cadc.get_data_urls({'publisherID': publisher_ids[:1]})
+        assert requested == [publisher_ids[:1]]
+
+
+@patch('astroquery.cadc.core.get_access_url',
+       Mock(side_effect=lambda x, capability=None: 'https://some.url'))
+@patch('astroquery.cadc.core.pyvo.dal.adhoc.DatalinkService',
+       Mock(return_value=Mock(capabilities=[])))  # DL capabilities not needed
+def test_datalink_cache():
+    requested = []
+
+    def from_result_url(url, session=None):
+        ids = parse_qs(urlsplit(url).query)['ID']
+        requested.append(ids)
+        return [Mock(id=publisher_id, semantics='#this',
+                     access_url='https://get.your.data/' + publisher_id)
+                for publisher_id in ids]
+
+    publisher_ids = ['ivo://cadc.nrc.ca/{}'.format(i) for i in range(4)]
+    expected = ['https://get.your.data/' + pid for pid in publisher_ids]
+    with patch('pyvo.dal.adhoc.DatalinkResults.from_result_url',
+               side_effect=from_result_url):
+        cadc = Cadc()
+        cadc.get_data_urls({'publisherID': publisher_ids})
+
+        # the URLs of a cached document are in the order of their publisher
+        # IDs, not of the first publisher ID of the document
+        requested.clear()
+        reordered = [publisher_ids[2], publisher_ids[0], publisher_ids[3]]
+        assert cadc.get_data_urls({'publisherID': reordered}) == \
+            [expected[2], expected[0], expected[3]]
+        assert requested == []
+
+        # only the most recently used publisher IDs are kept
+        cadc.DATALINK_CACHE_SIZE = 2
+        cadc.get_data_urls({'publisherID': publisher_ids[:1]})
+        cadc.get_data_urls({'publisherID': ['ivo://cadc.nrc.ca/4']})
+        assert len(cadc._datalink_cache) == 2
+        requested.clear()
+        cadc.get_data_urls({'publisherID': publisher_ids[:1]})
+        assert requested == []
+        cadc.get_data_urls({'publisherID': publisher_ids[1:2]})
+        assert requested == [publisher_ids[1:2]]
+
+        cadc.clear_cache()
+        assert len(cadc._datalink_cache) == 0
+
+
 @patch('astroquery.cadc.core.get_access_url',
        Mock(side_effect=lambda x, capability=None: 'https://some.url'))
 def test_misc():
@@ -19,7 +19,16 @@ class Conf(_config.ConfigNamespace):
     )
     poll_interval = _config.ConfigItem(
         20,
-        'Number of seconds to wait between checks on the status of a submitted job.'
+        'Maximum number of seconds to wait between checks on the status of a submitted job.'
+    )
+    min_poll_interval = _config.ConfigItem(
+        0.5,
+        'Number of seconds to wait before the first check on the status of a submitted job. '
+        'The wait is doubled after each check, up to poll_interval.'
+    )
+    download_workers = _config.ConfigItem(
+        4,
+        'Maximum number of files downloaded concurrently.'
     )
     soda_base_url = _config.ConfigItem(
         ['https://casda.csiro.au/casda_data_access/'],
@@ -1,5 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 from io import BytesIO
 import os
 from urllib.parse import unquote, urlparse
@@ -38,6 +40,8 @@ class CasdaClass(QueryWithLogin):
     URL = conf.server
     TIMEOUT = conf.timeout
     POLL_INTERVAL = conf.poll_interval
+    MIN_POLL_INTERVAL = conf.min_poll_interval
+    DOWNLOAD_WORKERS = conf.download_workers
     USERNAME = conf.username
     _soda_base_url = conf.soda_base_url
     _login_url = conf.login_url
@@ -368,16 +372,23 @@ class CasdaClass(QueryWithLogin):
 
         return self._complete_job(job_url, verbose)
 
-    def download_files(self, urls, *, savedir=''):
+    def download_files(self, urls, *, savedir='', verify=True):
         """
         Download a series of files
 
+        The files are downloaded concurrently, by up to ``DOWNLOAD_WORKERS`` threads. Partially downloaded files are
+        resumed where the server supports it.
+
         Parameters
         ----------
         urls: list of strings
             The list of URLs of the files to be downloaded.
         savedir: str, optional
             The directory in which to save the files.
+        verify: bool, optional
+            Check each file against its checksum file, if it has been downloaded too. A file that doesn't match is
+            downloaded again once, and if it still doesn't match it is deleted and left out of the returned list.
+            Defaults to True.
 
         Returns
         -------
@@ -392,9 +403,45 @@ class CasdaClass(QueryWithLogin):
                 # Windows doesn't allow special characters in filenames like
                 # ":" so replace them with an underscore
                 local_filename = local_filename.replace(':', '_')
-            local_filepath = os.path.join(savedir or self.cache_location or '.', local_filename)
-            self._download_file(url, local_filepath, timeout=self.TIMEOUT, cache=False)
-            filenames.append(local_filepath)
+            filenames.append(os.path.join(savedir or self.cache_location or '.', local_filename))
+        if not filenames:
+            return filenames
+
+        workers = max(1, min(self.DOWNLOAD_WORKERS, len(filenames)))
+        checksum_files = {filename[:-len('.checksum')]: filename for filename in filenames
+                          if filename.endswith('.checksum')}
+
+        def download(url, local_filepath):
+            # Progress bars of concurrent downloads would be mixed up
+            self._download_file(url, local_filepath, timeout=self.TIMEOUT, cache=False, verbose=workers == 1)
+
+        def verify_file(url, local_filepath):
+            checksum = _read_checksum(checksum_files[local_filepath])
+            if checksum is None or _matches_checksum(local_filepath, checksum):
+                return True
+            # Most likely a download resumed from a stale partial file, start from scratch
+            log.warning(f"{local_filepath} does not match its checksum, downloading it again.")
+            os.remove(local_filepath)
+            download(url, local_filepath)
+            if _matches_checksum(local_filepath, checksum):
+                return True
+            log.warning(f"{local_filepath} does not match its checksum {checksum_files[local_filepath]}, "
+                        "it has been deleted.")
+            os.remove(local_filepath)
+            return False
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(download, url, filename) for url, filename in zip(urls, filenames)]
+            for future in futures:
+                future.result()
+            if verify:
+                futures = {filename: executor.submit(verify_file, url, filename)
+                           for url, filename in zip(urls, filenames) if filename in checksum_files}
+                corrupted = {filename for filename, future in futures.items() if not future.result()}
+                filenames = [filename for filename in filenames if filename not in corrupted]
+        finally:
+            executor.shutdown(cancel_futures=True)
 
         return filenames
 
@@ -493,6 +540,9 @@ class CasdaClass(QueryWithLogin):
         """
         Start an async job (e.g. TAP or SODA) and wait for it to be completed.
 
+        The status of the job is first checked after ``MIN_POLL_INTERVAL`` seconds, then the wait is doubled after
+        each check, up to ``poll_interval`` seconds, so that short jobs are not held up by a long poll interval.
+
         Parameters
         ----------
         job_location: str
@@ -500,7 +550,7 @@ class CasdaClass(QueryWithLogin):
         verbose: bool
             Should progress be logged periodically
         poll_interval: int, optional
-            The number of seconds to wait between checks on the status of the job.
+            The maximum number of seconds to wait between checks on the status of the job.
 
         Returns
         -------
@@ -514,15 +564,17 @@ class CasdaClass(QueryWithLogin):
         # Poll until the async job has finished
         prev_status = None
         count = 0
+        wait = min(self.MIN_POLL_INTERVAL, poll_interval)
         job_details = self._get_job_details_xml(job_location)
         status = self._read_job_status(job_details, verbose)
         while status == 'EXECUTING' or status == 'QUEUED' or status == 'PENDING' or status == 'SUSPENDED':
             count += 1
             if verbose and (status != prev_status or count > 10):
-                log.info("Job is %s, polling every %d seconds." % (status, poll_interval))
+                log.info("Job is %s, polling every %g seconds at most." % (status, poll_interval))
                 count = 0
                 prev_status = status
-            time.sleep(poll_interval)
+            time.sleep(wait)
+            wait = min(wait * 2, poll_interval)
             job_details = self._get_job_details_xml(job_location)
             status = self._read_job_status(job_details, verbose)
         return status
@@ -573,5 +625,37 @@ class CasdaClass(QueryWithLogin):
         return status
 
 
+def _read_checksum(checksum_filepath):
+    """
+    Read a CASDA checksum file, which holds the CRC32, the SHA-1 digest and the size in hexadecimal of a file.
+
+    Returns the ``(sha1, size)`` of the file, or None if the checksum file is missing or not in that format.
+    """
+    try:
+        with open(checksum_filepath) as checksum_file:
+            crc, sha1, size = checksum_file.read().split()
+        if len(sha1) != 40:
+            raise ValueError(f"{sha1} is not a SHA-1 digest")
+        int(sha1, 16)
+        return sha1.lower(), int(size, 16)
+    except (OSError, ValueError, UnicodeDecodeError) as err:
+        log.debug(f"Cannot read checksum file {checksum_filepath}: {err}")
+        return None
+
+
+def _matches_checksum(filepath, checksum):
+    """
+    Returns whether the file at ``filepath`` matches ``checksum``, a ``(sha1, size)`` tuple.
+    """
+    sha1, size = checksum
+    if not os.path.exists(filepath) or os.path.getsize(filepath) != size:
+        return False
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest() == sha1
+
+
 # the default tool for users to interact with is an instance of the Class
 Casda = CasdaClass()
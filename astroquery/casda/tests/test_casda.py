@@ -4,7 +4,9 @@
 
 import pytest
 import requests
+import hashlib
 import os
+import time
 import keyring
 
 from astropy.coordinates import SkyCoord
@@ -576,3 +578,60 @@ def test_download_file(patch_get):
     assert filenames[0].endswith('askap_img.fits')
     assert filenames[1].endswith('askap_img.fits.checksum')
     assert filenames[2].endswith('RACS-DR1_0000+18A.fits')
+
+
+def test_download_files_verify(tmp_path):
+    content = b'ASKAP image data'
+    checksum = '1a2b3c4d {} {:x}'.format(hashlib.sha1(content).hexdigest(), len(content))
+    urls = ['https://ingest.pawsey.org/bucket_name/path/askap_img.fits?security=stuff',
+            'http://casda.csiro.au/download/web/111-000-111-000/askap_img.fits.checksum']
+    downloads = []
+
+    def download_file(url, local_filepath, **kwargs):
+        downloads.append(os.path.basename(local_filepath))
+        if local_filepath.endswith('.checksum'):
+            data = checksum.encode()
+        else:
+            # The first download of the image is corrupted
+            data = content if 'askap_img.fits' in downloads[:-1] else b'corrupted image'
+        with open(local_filepath, 'wb') as f:
+            f.write(data)
+
+    casda = Casda()
+    casda._download_file = download_file
+    filenames = casda.download_files(urls, savedir=str(tmp_path))
+
+    assert filenames == [str(tmp_path / 'askap_img.fits'), str(tmp_path / 'askap_img.fits.checksum')]
+    assert sorted(downloads) == ['askap_img.fits', 'askap_img.fits', 'askap_img.fits.checksum']
+    assert (tmp_path / 'askap_img.fits').read_bytes() == content
+
+    # Without verification, or with a checksum file in an unknown format, the files are kept as downloaded
+    downloads.clear()
+    casda.download_files(urls[:1], savedir=str(tmp_path), verify=False)
+    assert downloads == ['askap_img.fits']
+    checksum = 'not a checksum'
+    downloads.clear()
+    casda.download_files(urls, savedir=str(tmp_path))
+    assert sorted(downloads) == ['askap_img.fits', 'askap_img.fits.checksum']
+
+    # A file still corrupted once downloaded again is deleted and left out
+    checksum = '1a2b3c4d {} {:x}'.format(hashlib.sha1(b'other data').hexdigest(), len(content))
+    downloads.clear()
+    filenames = casda.download_files(urls, savedir=str(tmp_path))
+    assert filenames == [str(tmp_path / 'askap_img.fits.checksum')]
+    assert sorted(downloads) == ['askap_img.fits', 'askap_img.fits', 'askap_img.fits.checksum']
+    assert not (tmp_path / 'askap_img.fits').exists()
+
+
+def test_run_job_backoff(patch_get, monkeypatch):
+    waits = []
+    monkeypatch.setattr(time, 'sleep', waits.append)
+    prefix = 'https://somewhere/casda/datalink/links?'
+    table = Table([Column(data=[prefix + 'cube-244'], name='access_url')])
+    casda = Casda()
+    fake_login(casda, USERNAME, PASSWORD)
+    with pytest.warns(W50, match="Invalid unit string 'pixels'"):
+        casda.stage_data(table)
+
+    # The job is suspended, then running, before it completes
+    assert waits == [casda.MIN_POLL_INTERVAL, 2 * casda.MIN_POLL_INTERVAL]
@@ -30,6 +30,7 @@ class Conf(_config.ConfigNamespace):
     EHST_MESSAGES = _config.ConfigItem("notification?action=GetNotifications", "eHST Messages")
     EHST_LOGIN_SERVER = _config.ConfigItem(EHST_COMMON_SERVER + 'login', "eHST Login Server")
     EHST_LOGOUT_SERVER = _config.ConfigItem(EHST_COMMON_SERVER + 'logout', "eHST Logout Server")
+    EHST_DOWNLOAD_WORKERS = _config.ConfigItem(4, "Maximum number of files downloaded concurrently from eHST")
     TIMEOUT = 60
 
     cache_location = os.path.join(paths.get_cache_dir(), 'astroquery/ehst', )
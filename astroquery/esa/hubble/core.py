@@ -37,6 +37,7 @@ class ESAHubbleClass(EsaTap):
     TAP_URL = conf.EHST_TAP_SERVER
     LOGIN_URL = conf.EHST_LOGIN_SERVER
     LOGOUT_URL = conf.EHST_LOGOUT_SERVER
+    DOWNLOAD_WORKERS = conf.EHST_DOWNLOAD_WORKERS
 
     calibration_levels = {"AUXILIARY": 0, "RAW": 1, "CALIBRATED": 2,
                           "PRODUCT": 3}
@@ -244,9 +245,11 @@ class ESAHubbleClass(EsaTap):
     def download_files_from_program(self, program, *, folder=None, calibration_level=None,
                                     data_product_type=None, intent=None,
                                     obs_collection=None, instrument_name=None,
-                                    filters=None, only_fits=False):
+                                    filters=None, only_fits=False, verbose=False):
         """
         Download artifacts from EHST. Artifact is a single Hubble product file.
+        The artifacts are downloaded concurrently by ``DOWNLOAD_WORKERS`` threads,
+        files already downloaded are skipped and partial files are resumed.
 
         Parameters
         ----------
@@ -274,6 +277,9 @@ class ESAHubbleClass(EsaTap):
         only_fits : bool
             optional, default 'False'
             flag to download only FITS files
+        verbose : bool
+            optional, default 'False'
+            flag to display information about the process
 
         Returns
         -------
@@ -287,11 +293,16 @@ class ESAHubbleClass(EsaTap):
                                            proposal=program,
                                            async_job=False)
         if only_fits:
-            self.download_fits_files(observation_id=observations['observation_id'], folder=folder)
+            self.download_fits_files(observation_id=observations['observation_id'], folder=folder, verbose=verbose)
         else:
             files = self.get_associated_files(observation_id=observations['observation_id'])
-            for file in files['filename']:
-                self.download_file(file=file, folder=folder)
+
+            def download(file):
+                return self.__get_download_path(
+                    folder, self.download_file(file=file, folder=folder, resume=True, verbose=verbose))
+
+            esautils.download_files_concurrently(download, files['filename'],
+                                                 max_workers=self.DOWNLOAD_WORKERS, verbose=verbose)
 
     def _select_related_members(self, observation_id):
         query = f"select members from ehst.observation where observation_id='{observation_id}'"
@@ -372,7 +383,9 @@ class ESAHubbleClass(EsaTap):
 
     def download_fits_files(self, observation_id, *, folder=None, verbose=False):
         """
-        Retrieves all the FITS files associated to an observation
+        Retrieves all the FITS files associated to an observation. The files are
+        downloaded concurrently, skipping the ones already downloaded and resuming
+        the partial ones.
 
         Parameters
         ----------
@@ -392,12 +405,17 @@ class ESAHubbleClass(EsaTap):
         None. The file is associated
         """
         results = self.get_associated_files(observation_id=observation_id, verbose=verbose)
-        for file in [i['filename'] for i in results if i['filename'].endswith('.fits')]:
+        files = [i['filename'] for i in results if i['filename'].endswith('.fits')]
+
+        def download(file):
             if verbose:
                 print(f"Downloading {file} ...")
-            self.download_file(file=file, filename=file, folder=folder, verbose=verbose)
+            return self.__get_download_path(
+                folder, self.download_file(file=file, filename=file, folder=folder, resume=True, verbose=verbose))
+
+        esautils.download_files_concurrently(download, files, max_workers=self.DOWNLOAD_WORKERS, verbose=verbose)
 
-    def download_file(self, file, *, filename=None, folder=None, verbose=False):
+    def download_file(self, file, *, filename=None, folder=None, resume=False, verbose=False):
         """
         Download a file from eHST based on its filename.
 
@@ -411,6 +429,10 @@ class ESAHubbleClass(EsaTap):
         folder : string
             optional, default current path
             Local folder to store the file
+        resume : bool
+            optional, default 'False'
+            if the file already exists, only download the bytes missing from it,
+            and nothing if it is complete
         verbose : bool
             optional, default 'False'
             flag to display information about the process
@@ -424,12 +446,18 @@ class ESAHubbleClass(EsaTap):
         if filename is None:
             filename = file
         output_file = self.__get_download_path(folder, filename)
+        if resume and not os.path.exists(output_file) and not str(output_file).endswith('.fits.gz'):
+            # A previous download may have been renamed after its gzip content
+            renamed_file = os.path.splitext(output_file)[0] + '.fits.gz'
+            if os.path.exists(renamed_file):
+                output_file = renamed_file
         esautils.download_file(
             url=conf.EHST_DATA_SERVER,
             session=self.tap._session,
             params=params,
             verbose=verbose,
-            filename=output_file
+            filename=output_file,
+            resume=resume
         )
         return esautils.check_rename_to_gz(filename=output_file)
 
@@ -267,6 +267,17 @@ class TestESAHubble:
         rename_mock.return_value = path
         assert ehst.download_file(file=path, filename=path) == path
 
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_file')
+    def test_download_file_resume_renamed(self, download_mock, tmp_path):
+        ehst = ESAHubbleClass(show_messages=False)
+        path = Path(tmp_path, 'w0ji0v01t_c2f.fits.gz')
+        with gzip.open(path, 'wb') as file:
+            file.write(b'data')
+        assert ehst.download_file(file='w0ji0v01t_c2f.fits', folder=tmp_path, resume=True) == path.name
+        assert download_mock.call_args.kwargs['filename'] == str(path)
+        assert download_mock.call_args.kwargs['resume']
+
     @patch.object(ESAHubbleClass, 'tap', new_callable=PropertyMock)
     def test_get_associated_files(self, mock_tap_prop):
         observation_id = 'test'
@@ -294,7 +305,8 @@ class TestESAHubble:
         mock_download_file.return_value = path
         ehst = ESAHubbleClass(show_messages=False)
         ehst.download_fits_files(observation_id=observation_id)
-        mock_download_file.assert_called_once_with(file=filename, filename=filename, folder=None, verbose=False)
+        mock_download_file.assert_called_once_with(file=filename, filename=filename, folder=None, resume=True,
+                                                   verbose=False)
 
     def test_is_not_gz(self, tmp_path):
         target_file = data_path('cone_search.vot')
@@ -375,7 +387,8 @@ class TestESAHubble:
         mock_files.return_value = [{'filename': 'test.fits'}]
         ehst = ESAHubbleClass(show_messages=False)
         ehst.download_files_from_program(program=12345, only_fits=True)
-        mock_download_file.assert_called_once_with(file='test.fits', filename='test.fits', folder=None, verbose=False)
+        mock_download_file.assert_called_once_with(file='test.fits', filename='test.fits', folder=None, resume=True,
+                                                   verbose=False)
 
     @patch.object(ESAHubbleClass, 'download_file')
     @patch.object(ESAHubbleClass, 'get_associated_files')
@@ -385,8 +398,8 @@ class TestESAHubble:
         mock_files.return_value = {'filename': ['test.fits', 'test2.fits']}
         ehst = ESAHubbleClass(show_messages=False)
         ehst.download_files_from_program(program=12345, only_fits=False)
-        mock_download_file.assert_any_call(file='test.fits', folder=None)
-        mock_download_file.assert_any_call(file='test2.fits', folder=None)
+        mock_download_file.assert_any_call(file='test.fits', folder=None, resume=True, verbose=False)
+        mock_download_file.assert_any_call(file='test2.fits', folder=None, resume=True, verbose=False)
         assert mock_download_file.call_count == 2
 
     def test_query_criteria(self):
@@ -172,7 +172,7 @@ class IntegralClass(EsaTap):
                                   output_format=output_format)
 
     def download_science_windows(self, *, science_windows=None, observation_id=None, revolution=None, proposal=None,
-                                 output_file=None, cache=False, read_fits=True):
+                                 output_file=None, cache=False, read_fits=True, stream_extract=False):
         """Method to download science windows associated to one of these parameters:
         science_windows, observation_id, revolution or proposal
 
@@ -192,6 +192,9 @@ class IntegralClass(EsaTap):
                 Flag to determine if the file is stored in the cache or not
         read_fits: bool, optional, default True
             Open the downloaded file and parse the existing FITS files
+        stream_extract: bool, optional, default False
+            If read_fits=True, only store the FITS files extracted while the tar file is downloaded, and
+            not the tar file itself
 
         Returns
         -------
@@ -203,12 +206,10 @@ class IntegralClass(EsaTap):
         params = self.__get_science_window_parameter(science_windows, observation_id, revolution, proposal)
         params['RETRIEVAL_TYPE'] = 'SCW'
         try:
-
-            downloaded_file = esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
-                                                     filename=output_file, params=params,
-                                                     cache=cache, cache_folder=self.cache_location, verbose=True)
+            downloaded_file = self.__download(params=params, filename=output_file, cache=cache,
+                                              read_fits=read_fits, keep_archive=not stream_extract)
             if read_fits:
-                return esautils.read_downloaded_fits([downloaded_file])
+                return esautils.read_downloaded_fits(downloaded_file, extract=False)
             else:
                 return downloaded_file
 
@@ -326,11 +327,10 @@ class IntegralClass(EsaTap):
                   'source': target_name,
                   'instrument_oid': self.instrument_band_map[value]['instrument_oid']}
         try:
-            downloaded_file = esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
-                                                     params=params, path=path, filename=filename,
-                                                     cache=cache, cache_folder=self.cache_location, verbose=True)
+            downloaded_file = self.__download(params=params, path=path, filename=filename, cache=cache,
+                                              read_fits=read_fits)
             if read_fits:
-                return esautils.read_downloaded_fits([downloaded_file])
+                return esautils.read_downloaded_fits(downloaded_file, extract=False)
             else:
                 return downloaded_file
         except HTTPError as err:
@@ -378,12 +378,11 @@ class IntegralClass(EsaTap):
                   'epoch': epoch}
 
         try:
-            downloaded_file = esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
-                                                     params=params, path=path, filename=filename,
-                                                     cache=cache, cache_folder=self.cache_location, verbose=True)
+            downloaded_file = self.__download(params=params, path=path, filename=filename, cache=cache,
+                                              read_fits=read_fits)
 
             if read_fits:
-                return esautils.read_downloaded_fits([downloaded_file])
+                return esautils.read_downloaded_fits(downloaded_file, extract=False)
             else:
                 return downloaded_file
         except HTTPError as err:
@@ -444,13 +443,15 @@ class IntegralClass(EsaTap):
             for element in request_result:
                 params = {'RETRIEVAL_TYPE': 'spectras',
                           'spectra_oid': element['spectraOid']}
-                downloaded_files.append(
-                    esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
-                                           params=params, path=path, filename=filename,
-                                           cache=cache, cache_folder=self.cache_location, verbose=True))
+                downloaded_file = self.__download(params=params, path=path, filename=filename, cache=cache,
+                                                  read_fits=read_fits)
+                if read_fits:
+                    downloaded_files.extend(downloaded_file)
+                else:
+                    downloaded_files.append(downloaded_file)
 
             if read_fits:
-                return esautils.read_downloaded_fits(downloaded_files)
+                return esautils.read_downloaded_fits(downloaded_files, extract=False)
             else:
                 return downloaded_files
         except ValueError as err:
@@ -508,12 +509,14 @@ class IntegralClass(EsaTap):
             for element in request_result:
                 params = {'RETRIEVAL_TYPE': 'mosaics',
                           'mosaic_oid': element['mosaicOid']}
-                downloaded_files.append(
-                    esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
-                                           params=params, path=path, filename=filename,
-                                           cache=cache, cache_folder=self.cache_location, verbose=True))
+                downloaded_file = self.__download(params=params, path=path, filename=filename, cache=cache,
+                                                  read_fits=read_fits)
+                if read_fits:
+                    downloaded_files.extend(downloaded_file)
+                else:
+                    downloaded_files.append(downloaded_file)
             if read_fits:
-                return esautils.read_downloaded_fits(downloaded_files)
+                return esautils.read_downloaded_fits(downloaded_files, extract=False)
             else:
                 return downloaded_files
         except ValueError as err:
@@ -704,5 +707,37 @@ class IntegralClass(EsaTap):
 
         raise ValueError("Input parameters are wrong")
 
+    def __download(self, params, *, read_fits, path='', filename=None, cache=False, keep_archive=True):
+        """
+        Download a file from the ISLA data server
+
+        Parameters
+        ----------
+        params : dict, mandatory
+            parameters of the request
+        read_fits : bool, mandatory
+            If True, the tar files are extracted while they are downloaded
+        path: str, optional
+            Path for the downloaded file
+        filename: str, optional
+            Filename for the downloaded file
+        cache: bool, optional, default False
+            Flag to determine if the file is stored in the cache or not
+        keep_archive: bool, optional, default True
+            If read_fits=True, also store the downloaded tar file
+
+        Returns
+        -------
+        If read_fits=True, the list of extracted files. If read_fits=False, the path of the downloaded file
+        """
+        if read_fits:
+            return esautils.download_and_extract_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session,
+                                                      params=params, path=path, filename=filename, cache=cache,
+                                                      cache_folder=self.cache_location, keep_archive=keep_archive,
+                                                      verbose=True)
+        return esautils.download_file(url=conf.ISLA_DATA_SERVER, session=self.tap._session, params=params,
+                                      path=path, filename=filename, cache=cache, cache_folder=self.cache_location,
+                                      verbose=True)
+
 
 Integral = IntegralClass()
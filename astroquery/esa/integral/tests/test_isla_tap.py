@@ -21,6 +21,7 @@ import pytest
 from requests import HTTPError
 
 from astroquery.esa.integral.tests import mocks
+import astroquery.esa.utils.utils as esautils
 
 
 def mock_instrument_bands(isla_module):
@@ -331,7 +332,7 @@ class TestIntegralTap:
         assert 'Only one parameter can be provided at a time.' in err.value.args[0]
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
-    @patch('astroquery.esa.utils.utils.download_file')
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
     def test_download_science_windows(self, instrument_band_mock, download_mock):
         instrument_band_mock.return_value = mocks.get_instrument_bands()
@@ -348,12 +349,35 @@ class TestIntegralTap:
         temp_path = create_temp_folder()
         temp_file = copy_to_temporal_path(data_path=data_path('zip_file.zip'), temp_folder=temp_path,
                                           filename='zip_file.zip')
-        download_mock.return_value = temp_file
+        download_mock.return_value = esautils.extract_file(temp_file)
 
         sc = isla.download_science_windows(science_windows='sc')
 
         args, kwargs = download_mock.call_args
         assert kwargs['params']['RETRIEVAL_TYPE'] == 'SCW'
+        assert kwargs['keep_archive'] is True
+        assert len(sc) == 2
+
+        close_files(sc)
+        temp_path.cleanup()
+
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
+    @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
+    def test_download_science_windows_stream_extract(self, instrument_band_mock, download_mock):
+        instrument_band_mock.return_value = mocks.get_instrument_bands()
+        temp_path = create_temp_folder()
+        temp_file = copy_to_temporal_path(data_path=data_path('zip_file.zip'), temp_folder=temp_path,
+                                          filename='zip_file.zip')
+        download_mock.return_value = esautils.extract_file(temp_file)
+
+        isla = IntegralClass()
+        sc = isla.download_science_windows(science_windows='sc', stream_extract=True)
+
+        args, kwargs = download_mock.call_args
+        assert kwargs['params']['RETRIEVAL_TYPE'] == 'SCW'
+        assert kwargs['keep_archive'] is False
+        assert len(sc) == 2
 
         close_files(sc)
         temp_path.cleanup()
@@ -396,7 +420,7 @@ class TestIntegralTap:
                                           "(instrument_oid = id1 or band_oid = id2)")
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
-    @patch('astroquery.esa.utils.utils.download_file')
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.integral.core.log')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
     def test_get_long_term_timeseries_error(self, instrument_band_mock, log_mock, download_mock):
@@ -411,7 +435,7 @@ class TestIntegralTap:
         log_mock.error.assert_called_with('No long term timeseries have been found with these inputs. ' + error_message)
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
-    @patch('astroquery.esa.utils.utils.download_file')
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.integral.core.log')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
     def test_get_long_term_timeseries_exception(self, instrument_band_mock, log_mock, download_mock):
@@ -426,15 +450,17 @@ class TestIntegralTap:
         log_mock.error.assert_called_with('Problem when retrieving long term timeseries. ' + error_message)
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.utils.utils.download_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
-    def test_get_long_term_timeseries(self, instrument_band_mock, download_mock):
+    def test_get_long_term_timeseries(self, instrument_band_mock, download_mock, extract_mock):
         instrument_band_mock.return_value = mocks.get_instrument_bands()
 
         temp_path = create_temp_folder()
         temp_file = copy_to_temporal_path(data_path=data_path('zip_file.zip'), temp_folder=temp_path,
                                           filename='zip_file.zip')
         download_mock.return_value = temp_file
+        extract_mock.side_effect = lambda *args, **kwargs: esautils.extract_file(temp_file)
 
         isla = IntegralClass()
         mock_instrument_bands(isla_module=isla)
@@ -449,7 +475,7 @@ class TestIntegralTap:
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
     @patch('astroquery.esa.integral.core.log')
-    @patch('astroquery.esa.utils.utils.download_file')
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_epochs')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
     def test_get_short_term_timeseries_error(self, instrument_band_mock, epoch_mock, download_mock, log_mock):
@@ -467,7 +493,7 @@ class TestIntegralTap:
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
     @patch('astroquery.esa.integral.core.log')
-    @patch('astroquery.esa.utils.utils.download_file')
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_epochs')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
     def test_get_short_term_timeseries_exception(self, instrument_band_mock, epoch_mock, download_mock, log_mock):
@@ -498,10 +524,11 @@ class TestIntegralTap:
         assert 'Epoch time is not available for this target and instrument/band.' in err.value.args[0]
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.utils.utils.download_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_epochs')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
-    def test_get_short_term_timeseries(self, instrument_band_mock, epoch_mock, download_mock):
+    def test_get_short_term_timeseries(self, instrument_band_mock, epoch_mock, download_mock, extract_mock):
 
         instrument_band_mock.return_value = mocks.get_instrument_bands()
         epoch_mock.return_value = {'epoch': ['time']}
@@ -509,6 +536,7 @@ class TestIntegralTap:
         temp_file = copy_to_temporal_path(data_path=data_path('tar_file.tar'), temp_folder=temp_path,
                                           filename='tar_file.tar')
         download_mock.return_value = temp_file
+        extract_mock.side_effect = lambda *args, **kwargs: esautils.extract_file(temp_file)
 
         isla = IntegralClass()
         mock_instrument_bands(isla_module=isla)
@@ -577,11 +605,12 @@ class TestIntegralTap:
                                           "object of type 'Mock' has no len()")
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.utils.utils.download_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_epochs')
     @patch('astroquery.esa.utils.utils.execute_servlet_request')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
-    def test_get_spectra(self, instrument_band_mock, servlet_mock, epoch_mock, download_mock):
+    def test_get_spectra(self, instrument_band_mock, servlet_mock, epoch_mock, download_mock, extract_mock):
         instrument_band_mock.return_value = mocks.get_instrument_bands()
         servlet_mock.return_value = mocks.get_mock_spectra()
         epoch_mock.return_value = {'epoch': ['today']}
@@ -589,6 +618,7 @@ class TestIntegralTap:
         temp_file = copy_to_temporal_path(data_path=data_path('tar_file.tar'), temp_folder=temp_path,
                                           filename='tar_file.tar')
         download_mock.return_value = temp_file
+        extract_mock.side_effect = lambda *args, **kwargs: esautils.extract_file(temp_file)
 
         isla = IntegralClass()
         mock_instrument_bands(isla_module=isla)
@@ -637,11 +667,12 @@ class TestIntegralTap:
                                           "Error")
 
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.download_and_extract_file')
     @patch('astroquery.esa.utils.utils.download_file')
     @patch('astroquery.esa.integral.core.IntegralClass.get_epochs')
     @patch('astroquery.esa.utils.utils.execute_servlet_request')
     @patch('astroquery.esa.integral.core.IntegralClass.get_instrument_band_map')
-    def test_get_mosaic(self, instrument_band_mock, servlet_mock, epoch_mock, download_mock):
+    def test_get_mosaic(self, instrument_band_mock, servlet_mock, epoch_mock, download_mock, extract_mock):
         instrument_band_mock.return_value = mocks.get_instrument_bands()
         servlet_mock.return_value = mocks.get_mock_mosaic()
         epoch_mock.return_value = {'epoch': ['today']}
@@ -649,6 +680,7 @@ class TestIntegralTap:
         temp_file = copy_to_temporal_path(data_path=data_path('tar_gz_file.gz'), temp_folder=temp_path,
                                           filename='tar_gz_file.gz')
         download_mock.return_value = temp_file
+        extract_mock.side_effect = lambda *args, **kwargs: esautils.extract_file(temp_file)
 
         isla = IntegralClass()
         mock_instrument_bands(isla_module=isla)
@@ -47,6 +47,8 @@ class Conf(_config.ConfigNamespace):
 
     JWST_ARCHIVE_TABLE = _config.ConfigItem("jwst.archive", "JWST archive table")
 
+    JWST_DOWNLOAD_WORKERS = _config.ConfigItem(4, "Maximum number of observations downloaded concurrently")
+
 
 conf = Conf()
 
@@ -53,6 +53,8 @@ class JwstClass(BaseQuery):
     Proxy class to default TapPlus object (pointing to JWST Archive)
     """
 
+    DOWNLOAD_WORKERS = conf.JWST_DOWNLOAD_WORKERS
+
     JWST_DEFAULT_COLUMNS = ['observationid', 'calibrationlevel', 'public',
                             'dataproducttype', 'instrument_name',
                             'energy_bandpassname', 'target_name', 'target_ra',
@@ -1038,6 +1040,10 @@ class JwstClass(BaseQuery):
     def download_files_from_program(self, proposal_id, *, product_type=None, verbose=False):
         """Get JWST products given its proposal ID.
 
+        The products of the observations are downloaded concurrently by
+        ``DOWNLOAD_WORKERS`` threads, each observation into its own
+        directory of a ``temp_<date>`` directory.
+
         Parameters
         ----------
         proposal_id : int, mandatory
@@ -1064,9 +1070,17 @@ class JwstClass(BaseQuery):
             print(query)
         job = self.__jwsttap.launch_job_async(query=query, verbose=verbose)
         allobs = set(JwstClass.get_decoded_string(job.get_results()['observationid']))
-        for oid in allobs:
+        now = datetime.now(timezone.utc)
+        output_dir = os.getcwd() + os.sep + "temp_" + now.strftime("%Y%m%d_%H%M%S")
+
+        def download(oid):
             log.info(f"Downloading products for Observation ID: {oid}")
-            self.get_obs_products(observation_id=oid, product_type=product_type)
+            # Separate directories, as the files of an observation are found by listing its directory
+            return self.get_obs_products(observation_id=oid, product_type=product_type,
+                                         output_file=os.path.join(output_dir, oid, oid + "_all_products"))
+
+        esautils.download_files_concurrently(download, allobs, max_workers=self.DOWNLOAD_WORKERS,
+                                             verbose=verbose)
         return list(allobs)
 
     def __check_file_number(self, output_dir, output_file_name,
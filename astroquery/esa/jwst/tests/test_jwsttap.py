@@ -691,6 +691,24 @@ class TestTap:
             jwst.download_files_from_program()
         assert "missing 1 required positional argument: 'proposal_id'" in err.value.args[0]
 
+    @patch.object(JwstClass, 'get_obs_products')
+    def test_download_files_from_program_concurrently(self, mock_get_obs_products):
+        tap = MagicMock()
+        tap.launch_job_async.return_value.get_results.return_value = Table({'observationid': ['o1', 'o2', 'o3']})
+        mock_get_obs_products.return_value = []
+        jwst = JwstClass(tap_plus_handler=tap, data_handler=tap, show_messages=False)
+
+        assert sorted(jwst.download_files_from_program(proposal_id=1234, product_type='science')) == ['o1', 'o2', 'o3']
+
+        assert mock_get_obs_products.call_count == 3
+        output_files = [call.kwargs['output_file'] for call in mock_get_obs_products.call_args_list]
+        for call in mock_get_obs_products.call_args_list:
+            oid = call.kwargs['observation_id']
+            assert call.kwargs['product_type'] == 'science'
+            assert call.kwargs['output_file'].endswith(os.path.join(oid, oid + '_all_products'))
+        # every observation is downloaded into its own directory
+        assert len({os.path.dirname(output_file) for output_file in output_files}) == 3
+
     def test_get_obs_products(self):
         dummyTapHandler = DummyTapHandler()
         jwst = JwstClass(tap_plus_handler=dummyTapHandler, data_handler=dummyTapHandler, show_messages=False)
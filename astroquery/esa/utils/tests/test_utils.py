@@ -8,6 +8,7 @@ European Space Astronomy Centre (ESAC)
 European Space Agency (ESA)
 
 """
+import io
 import os.path
 import shutil
 import tempfile
@@ -16,6 +17,7 @@ from unittest.mock import patch, Mock, PropertyMock
 import astroquery.esa.utils.utils as esautils
 from astroquery.esa.utils import EsaTap
 from astropy.io.registry import IORegistryError
+from astropy.io.votable import from_table
 from astropy.table import Table
 from requests import HTTPError
 from astropy import units as u
@@ -215,6 +217,112 @@ class TestEsaUtils:
         assert not os.path.exists(filename)
         assert os.path.exists(esautils.get_cache_filepath(filename=filename, cache_path=cache_folder))
 
+    def mock_streamed_response(self, mock_get, file_path):
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        mock_response = Mock()
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = (content[i:i + 100] for i in range(0, len(content), 100))
+        mock_get.return_value.__enter__.return_value = mock_response
+        return content
+
+    @patch("pyvo.auth.authsession.AuthSession.get")
+    def test_download_and_extract_tar_gz(self, mock_get, tmp_cwd):
+        self.mock_streamed_response(mock_get, data_path('tar_gz_file.tar.gz'))
+
+        files = esautils.download_and_extract_file(url='http://dummyurl.com/download',
+                                                   session=esautils.ESAAuthSession(), filename='sc.tar.gz',
+                                                   member_filter=lambda name: not name.startswith('._'),
+                                                   keep_archive=False)
+
+        assert [os.path.basename(file) for file in files] == ['test.fits']
+        assert os.path.dirname(files[0]).startswith('sc_')
+        assert not os.path.exists('sc.tar.gz')
+
+        fits_files = esautils.read_downloaded_fits(files, extract=False)
+        assert len(fits_files) == 1
+        assert fits_files[0]['filename'] == 'test.fits'
+        close_files(fits_files)
+
+    @patch("pyvo.auth.authsession.AuthSession.get")
+    def test_download_and_extract_tar_keep_archive(self, mock_get, tmp_cwd):
+        content = self.mock_streamed_response(mock_get, data_path('tar_file.tar'))
+
+        files = esautils.download_and_extract_file(url='http://dummyurl.com/download',
+                                                   session=esautils.ESAAuthSession(), filename='sc.tar')
+
+        assert 'test.fits' in [os.path.basename(file) for file in files]
+        with open('sc.tar', 'rb') as file:
+            assert file.read() == content
+
+    @patch("pyvo.auth.authsession.AuthSession.get")
+    def test_download_and_extract_zip(self, mock_get, tmp_cwd):
+        self.mock_streamed_response(mock_get, data_path('zip_file.zip'))
+
+        files = esautils.download_and_extract_file(url='http://dummyurl.com/download',
+                                                   session=esautils.ESAAuthSession(), filename='sc.zip')
+
+        assert 'test.fits' in [os.path.basename(file) for file in files]
+        assert os.path.exists('sc.zip')
+
+    @patch("pyvo.auth.authsession.AuthSession.get")
+    def test_download_file_resume(self, mock_get, tmp_cwd):
+        with open('test_file.fits', 'wb') as file:
+            file.write(b'0123')
+        mock_response = Mock()
+        mock_response.status_code = 206
+        mock_response.headers = {'Content-Length': '4'}
+        mock_response.iter_content.return_value = [b'4567']
+        mock_get.return_value.__enter__.return_value = mock_response
+
+        esautils.download_file(url='http://dummyurl.com/download', session=esautils.ESAAuthSession(),
+                               filename='test_file.fits', resume=True)
+
+        mock_get.assert_called_once_with('http://dummyurl.com/download', stream=True,
+                                         params={'TAPCLIENT': 'ASTROQUERY'}, headers={'Range': 'bytes=4-'})
+        with open('test_file.fits', 'rb') as file:
+            assert file.read() == b'01234567'
+
+    @patch("pyvo.auth.authsession.AuthSession.get")
+    def test_download_file_resume_complete(self, mock_get, tmp_cwd):
+        with open('test_file.fits', 'wb') as file:
+            file.write(b'0123')
+        mock_response = Mock()
+        mock_response.status_code = 416
+        mock_get.return_value.__enter__.return_value = mock_response
+
+        file_path = esautils.download_file(url='http://dummyurl.com/download', session=esautils.ESAAuthSession(),
+                                           filename='test_file.fits', resume=True)
+
+        assert file_path == 'test_file.fits'
+        mock_response.raise_for_status.assert_not_called()
+        mock_response.iter_content.assert_not_called()
+
+        # A server ignoring the range sends the whole file, which has the size of the local one
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Length': '4'}
+        esautils.download_file(url='http://dummyurl.com/download', session=esautils.ESAAuthSession(),
+                               filename='test_file.fits', resume=True)
+        mock_response.iter_content.assert_not_called()
+        with open('test_file.fits', 'rb') as file:
+            assert file.read() == b'0123'
+
+    def test_download_files_concurrently(self, tmp_cwd):
+        def download(name):
+            with open(name, 'wb') as file:
+                file.write(b'data')
+            return name
+
+        names = [f'file_{index}.fits' for index in range(10)]
+        assert esautils.download_files_concurrently(download, names, max_workers=3, verbose=True) == names
+        assert esautils.download_files_concurrently(download, []) == []
+
+        def fail(name):
+            raise HTTPError(f'Cannot download {name}')
+
+        with pytest.raises(HTTPError, match='Cannot download file_0.fits'):
+            esautils.download_files_concurrently(fail, names)
+
     def test_read_tar(self):
         temp_path = create_temp_folder()
         tar_file = copy_to_temporal_path(data_path=data_path('tar_file.tar'), temp_folder=temp_path,
@@ -264,6 +372,38 @@ class TestEsaUtils:
 
         close_files(files)
 
+    def test_read_fits_lazily(self, tmp_cwd):
+        for ii in range(3):
+            shutil.copy(data_path('test.fits'), f'test{ii}.fits')
+        with open('readme.txt', 'w') as file:
+            file.write('Not a FITS file')
+
+        files = esautils.read_downloaded_fits(['test0.fits', 'test1.fits', 'test2.fits', 'readme.txt'],
+                                              extract=False)
+        assert [file['filename'] for file in files] == ['test0.fits', 'test1.fits', 'test2.fits']
+        assert files[0]['header']['SIMPLE']
+        # nothing is opened until the FITS files are accessed
+        assert len(files._open_files) == 0
+
+        # without max_open, the files returned are never closed behind the caller's back
+        opened = [file['fits'] for file in files]
+        assert not any(hdu_list._file.closed for hdu_list in opened)
+        files.close()
+        assert all(hdu_list._file.closed for hdu_list in opened)
+
+        files = esautils.read_downloaded_fits(['test0.fits', 'test1.fits', 'test2.fits'], extract=False, max_open=2)
+
+        first = files[0]['fits']
+        assert files[1]['fits'] is files[1]['fits']
+        files[2]['fits']
+        # the least recently accessed file is closed
+        assert first._file.closed
+        assert list(files._open_files) == ['test1.fits', 'test2.fits']
+        assert not files[0]['fits']._file.closed
+
+        files.close()
+        assert len(files._open_files) == 0
+
     @patch('astroquery.esa.utils.utils.ESAAuthSession.get')
     def test_resolve_target(self, mock_get):
         mock_response = Mock()
@@ -427,6 +567,43 @@ class TestEsaUtils:
         esa_tap.query_tap(query=query, async_job=True)
         async_job_mock.assert_called_with(query)
 
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.create_query')
+    def test_iter_query_tap_sync(self, create_query_mock):
+        votable = io.BytesIO()
+        from_table(Table({'source_id': range(25)})).to_xml(votable)
+        response = Mock()
+        response.raw = io.BytesIO(votable.getvalue())
+        create_query_mock.return_value.submit.return_value = response
+
+        query = 'select * from ivoa.obscore'
+        esa_tap = DummyTapClass()
+        chunks = list(esa_tap.iter_query_tap(query=query, chunk_rows=10))
+        create_query_mock.assert_called_with(query)
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        response.raise_for_status.assert_called()
+        response.close.assert_called()
+
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
+    @patch('astroquery.esa.utils.utils.ESAAuthSession.get')
+    @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.submit_job')
+    def test_iter_query_tap_async(self, submit_job_mock, get_mock):
+        votable = io.BytesIO()
+        from_table(Table({'source_id': range(25)})).to_xml(votable)
+        response = Mock()
+        response.raw = io.BytesIO(votable.getvalue())
+        get_mock.return_value = response
+        job = submit_job_mock.return_value
+        job.result_uri = 'https://example.com/tap/async/1/results/result'
+
+        query = 'select * from ivoa.obscore'
+        esa_tap = DummyTapClass()
+        chunks = list(esa_tap.iter_query_tap(query=query, chunk_rows=20, async_job=True))
+        submit_job_mock.assert_called_with(query)
+        get_mock.assert_called_with(job.result_uri, stream=True)
+        assert [len(chunk) for chunk in chunks] == [20, 5]
+        job.delete.assert_called()
+
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.capabilities', [])
     @patch('astroquery.esa.utils.utils.pyvo.dal.TAPService.search')
     def test_query_table(self, async_job_mock):
@@ -7,11 +7,16 @@ European Space Astronomy Centre (ESAC)
 European Space Agency (ESA)
 
 """
+import collections
 import datetime
 import getpass
+import io
 import os
 import binascii
 import shutil
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 import tarfile as esatar
 import zipfile
@@ -27,12 +32,20 @@ import pyvo
 import numbers
 
 from astroquery.query import BaseVOQuery, BaseQuery
+from astroquery.utils.tap.xmlparser import utils as tap_utils
 
 __all__ = ['ESAAuthSession', 'EsaTap']
 
 
 TARGET_RESOLVERS = ['ALL', 'SIMBAD', 'NED', 'VIZIER']
 
+# Limits of the size of the chunks read from the download streams
+MIN_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Default number of files downloaded at the same time by download_files_concurrently
+DOWNLOAD_WORKERS = 4
+
 
 # We do trust the ESA tar files, this is to avoid the new to Python 3.12 deprecation warning
 # https://docs.python.org/3.12/library/tarfile.html#tarfile-extraction-filter
@@ -429,6 +442,59 @@ class EsaTap(BaseVOQuery, BaseQuery):
 
         return result
 
+    def iter_query_tap(self, query, *, chunk_rows=100000, async_job=False, output_file=None, verbose=False):
+        """
+        Launches a synchronous or asynchronous job to query the {ESA_ARCHIVE_NAME} TAP and returns
+        the results as successive tables, parsed while they are downloaded
+
+        Parameters
+        ----------
+        query : str, mandatory
+            query (adql) to be executed
+        chunk_rows : int, optional, default 100000
+            number of rows of each table (the last one may be shorter)
+        async_job : bool, optional, default 'False'
+            executes the query (job) in asynchronous/synchronous mode (default
+            synchronous)
+        output_file : str, optional, default None
+            Parquet ('.parquet', '.pq') or HDF5 ('.h5', '.hdf5') file where
+            the chunks are appended as they are returned
+        verbose: bool, optional, default False
+            To log the query when executing this method.
+
+        Returns
+        -------
+        A generator of astropy.table objects containing the results
+        """
+        if output_file:
+            with tap_utils.TableChunkWriter(output_file) as writer:
+                for chunk in self.iter_query_tap(query, chunk_rows=chunk_rows, async_job=async_job,
+                                                 verbose=verbose):
+                    writer.write(chunk)
+                    yield chunk
+            return
+
+        job = None
+        if async_job:
+            job = self.tap.submit_job(query)
+            job.run().wait()
+            job.raise_if_error()
+            response = self._auth_session.get(job.result_uri, stream=True)
+        else:
+            response = self.tap.create_query(query).submit()
+
+        try:
+            response.raise_for_status()
+            if verbose:
+                print(f"Executed query:{query}")
+            # requests doesn't decode the content by default
+            response.raw.decode_content = True
+            yield from tap_utils.iter_http_response(response.raw, 'votable', chunk_rows)
+        finally:
+            response.close()
+            if job is not None:
+                job.delete()
+
     def create_cone_search_query(self, ra, dec, ra_column, dec_column, radius):
         return f"1=CONTAINS(POINT('ICRS', {ra_column}, {dec_column}),CIRCLE('ICRS', {ra}, {dec}, {radius}))"
 
@@ -715,7 +781,8 @@ def execute_servlet_request(url, tap, *, query_params=None, parser_method=None):
         response.raise_for_status()
 
 
-def download_file(url, session, *, params=None, path='', filename=None, cache=False, cache_folder=None, verbose=False):
+def download_file(url, session, *, params=None, path='', filename=None, cache=False, cache_folder=None,
+                  resume=False, verbose=False):
     """
     Download a file in streaming mode using an existing session
 
@@ -735,6 +802,9 @@ def download_file(url, session, *, params=None, path='', filename=None, cache=Fa
         flag to store the file in the Astroquery cache
     cache_folder: str, optional
         folder to store the cached file
+    resume: bool, optional, default False
+        if ``filename`` already exists, only request the bytes that are missing from it. A file that is
+        already complete is not downloaded again. Requires ``filename``
     verbose: boolean, optional, default False
         Write the outputs in console
 
@@ -746,30 +816,270 @@ def download_file(url, session, *, params=None, path='', filename=None, cache=Fa
         params = {}
     if 'TAPCLIENT' not in params:
         params['TAPCLIENT'] = 'ASTROQUERY'
-    with session.get(url, stream=True, params=params) as response:
+
+    request_args = {}
+    offset = 0
+    if resume and filename is not None:
+        file_path = get_download_filepath(None, url, path=path, filename=filename,
+                                          cache=cache, cache_folder=cache_folder)
+        if os.path.exists(file_path):
+            offset = os.path.getsize(file_path)
+        if offset > 0:
+            request_args['headers'] = {'Range': f'bytes={offset}-'}
+
+    with session.get(url, stream=True, params=params, **request_args) as response:
+        if offset > 0 and response.status_code == 416:
+            # Nothing left to download: the local file is complete
+            if verbose:
+                log.info(f"File {file_path} is already complete")
+            return file_path
         response.raise_for_status()
 
-        if filename is None:
-            content_disposition = response.headers.get('Content-Disposition')
-            if content_disposition:
-                filename = content_disposition.split('filename=')[-1].strip('"')
-            else:
-                filename = os.path.basename(url.split('?')[0])
-        if cache:
-            filename = get_cache_filepath(filename, cache_folder)
-            path = ''
+        file_path = get_download_filepath(response, url, path=path, filename=filename,
+                                          cache=cache, cache_folder=cache_folder)
+        mode = 'wb'
+        if offset > 0:
+            if response.status_code == 206:
+                mode = 'ab'
+            elif response.headers.get('Content-Length') == str(offset):
+                # The server ignored the range, but the local file has the size of the remote one
+                if verbose:
+                    log.info(f"File {file_path} is already complete")
+                return file_path
         # Open a local file in binary write mode
         if verbose:
-            log.info('Downloading: ' + filename)
-        file_path = os.path.join(path, filename)
-        with open(file_path, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=8192):
+            log.info(('Resuming: ' if mode == 'ab' else 'Downloading: ') + file_path)
+        with open(file_path, mode) as file:
+            for chunk in response.iter_content(chunk_size=get_download_chunk_size(response)):
                 file.write(chunk)
         if verbose:
             log.info(f"File {file_path} has been downloaded successfully")
         return file_path
 
 
+def download_files_concurrently(download, items, *, max_workers=DOWNLOAD_WORKERS, verbose=False):
+    """
+    Call ``download`` on each of ``items`` from a pool of at most ``max_workers`` threads
+
+    Parameters
+    ----------
+    download: callable, mandatory
+        function downloading one item and returning the path, or list of paths, of the downloaded files
+    items: iterable, mandatory
+        items to be downloaded
+    max_workers: int, optional, default DOWNLOAD_WORKERS
+        maximum number of concurrent downloads
+    verbose: boolean, optional, default False
+        log the number of files, their total size and the download rate
+
+    Returns
+    -------
+    The list of the values returned by ``download``, in the order of ``items``. The first
+    error raised by a download is raised again once the running downloads are finished.
+    """
+    items = list(items)
+    if not items:
+        return []
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    try:
+        futures = [executor.submit(download, item) for item in items]
+        results = [future.result() for future in futures]
+    finally:
+        executor.shutdown(cancel_futures=True)
+    if verbose:
+        elapsed = max(time.monotonic() - start, 1e-6)
+        paths = [path for result in results
+                 for path in (result if isinstance(result, list) else [result])
+                 if isinstance(path, (str, os.PathLike)) and os.path.isfile(path)]
+        size = sum(os.path.getsize(path) for path in paths)
+        log.info(f"{len(paths)} files, {size / 1e6:.1f} MB, downloaded in {elapsed:.1f} s "
+                 f"({size / 1e6 / elapsed:.2f} MB/s)")
+    return results
+
+
+def download_and_extract_file(url, session, *, params=None, path='', filename=None, cache=False, cache_folder=None,
+                              member_filter=None, keep_archive=True, verbose=False):
+    """
+    Download a file in streaming mode and, if it is a tar file (compressed or not), extract its
+    members while the file is being downloaded, instead of extracting them once the whole file
+    is on disk
+
+    Parameters
+    ----------
+    url: str, mandatory
+        URL to be downloaded
+    session: ESAAuthSession, mandatory
+        session to download the file, including the cookies from ESA login
+    params: dict, optional
+        Additional params for the request
+    path: str, optional
+        Path where the file will be stored
+    filename: str, optional
+        filename to be given to the final file
+    cache: bool, optional, default False
+        flag to store the file in the Astroquery cache
+    cache_folder: str, optional
+        folder to store the cached file
+    member_filter: callable, optional
+        function receiving the name of each member of the tar file and returning True if it has to be
+        extracted, e.g. ``lambda name: not name.lower().endswith('png')``. By default, all the members
+        are extracted
+    keep_archive: bool, optional, default True
+        flag to also store the downloaded tar file. If False, only the extracted members are written
+        to disk. Files that can't be extracted while they are downloaded (zip files and files that
+        are not archives) are always stored, and zip files are extracted once downloaded
+    verbose: boolean, optional, default False
+        Write the outputs in console
+
+    Returns
+    -------
+    List of paths to the extracted files, or the path of the downloaded file in a list if it is not an
+    archive. The tar members are extracted to the same directory ``extract_file`` would use
+    """
+    if params is None or len(params) == 0:
+        params = {}
+    if 'TAPCLIENT' not in params:
+        params['TAPCLIENT'] = 'ASTROQUERY'
+    with session.get(url, stream=True, params=params) as response:
+        response.raise_for_status()
+
+        file_path = get_download_filepath(response, url, path=path, filename=filename,
+                                          cache=cache, cache_folder=cache_folder)
+        if verbose:
+            log.info('Downloading: ' + file_path)
+        stream = _DownloadStream(response.iter_content(chunk_size=get_download_chunk_size(response)))
+        tar_mode = stream.get_tar_mode()
+
+        if tar_mode is None:
+            # zip files are indexed at the end and need the whole file
+            with open(file_path, 'wb') as file:
+                stream.copy_to(file)
+            if verbose:
+                log.info(f"File {file_path} has been downloaded successfully")
+            if esatar.is_tarfile(file_path) or zipfile.is_zipfile(file_path):
+                return extract_file(file_path)
+            return [file_path]
+
+        output_dir = prepare_output_dir(file_path)
+        extracted_files = []
+        archive = open(file_path, 'wb') if keep_archive else None
+        try:
+            stream.output = archive
+            with esatar.open(fileobj=stream, mode=tar_mode) as tar:
+                # In stream mode, each member has to be extracted before reading the next one
+                for member in tar:
+                    if member_filter is not None and not member_filter(member.name):
+                        continue
+                    tar.extract(member, output_dir)
+                    extracted_files.append(os.path.join(output_dir, member.name))
+            # Store the end of the file, after the end of the tar contents
+            stream.copy_to(archive)
+        finally:
+            if archive is not None:
+                archive.close()
+        if verbose:
+            log.info(f"File {file_path} has been downloaded and extracted successfully to {output_dir}")
+        return extracted_files
+
+
+def get_download_filepath(response, url, *, path='', filename=None, cache=False, cache_folder=None):
+    """
+    Get the path of a downloaded file, from the ``Content-Disposition`` header of the response or
+    from the URL if ``filename`` is not given
+    """
+    if filename is None:
+        content_disposition = response.headers.get('Content-Disposition')
+        if content_disposition:
+            filename = content_disposition.split('filename=')[-1].strip('"')
+        else:
+            filename = os.path.basename(url.split('?')[0])
+    if cache:
+        filename = get_cache_filepath(filename, cache_folder)
+        path = ''
+    return os.path.join(path, filename)
+
+
+def get_download_chunk_size(response):
+    """
+    Size of the chunks to read from a streamed response, about 1% of its ``Content-Length``, so that
+    large files are read in large chunks
+    """
+    try:
+        content_length = int(response.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return MIN_DOWNLOAD_CHUNK_SIZE
+    return min(max(content_length // 100, MIN_DOWNLOAD_CHUNK_SIZE), MAX_DOWNLOAD_CHUNK_SIZE)
+
+
+class _DownloadStream(io.RawIOBase):
+    """
+    Read-only file object over the chunks of a streamed response, optionally writing the bytes read
+    to ``output``
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self.output = None
+
+    def readable(self):
+        return True
+
+    def _peek(self, size):
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        return self._buffer[:size]
+
+    def readinto(self, buffer):
+        if not self._buffer:
+            self._buffer = next(self._chunks, b'')
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        if self.output is not None:
+            self.output.write(self._buffer[:size])
+        self._buffer = self._buffer[size:]
+        return size
+
+    def copy_to(self, output):
+        """
+        Write the bytes not read yet to ``output`` (if given)
+        """
+        if output is None:
+            return
+        output.write(self._buffer)
+        self._buffer = b''
+        for chunk in self._chunks:
+            output.write(chunk)
+
+    def get_tar_mode(self):
+        """
+        The `tarfile` stream mode to read the content, or None if it is not a tar file (compressed with
+        gzip or not)
+        """
+        header = self._peek(512)
+        if len(header) == 512 and header[257:262] == b'ustar':
+            return 'r|'
+        if header[:2] == b'\x1f\x8b':
+            # Look for the tar header in the first decompressed bytes
+            size = 1024
+            while True:
+                compressed = self._peek(size)
+                try:
+                    decompressed = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(compressed, 512)
+                except zlib.error:
+                    return None
+                if len(decompressed) >= 512 or len(compressed) < size:
+                    break
+                size *= 4
+            if decompressed[257:262] == b'ustar':
+                return 'r|gz'
+        return None
+
+
 def get_cache_filepath(filename=None, cache_path=None):
     """
     Stores the content from a response as an Astroquery cache object.
@@ -793,39 +1103,127 @@ def get_cache_filepath(filename=None, cache_path=None):
     return cache_file_path
 
 
-def read_downloaded_fits(files):
-    extracted_files = []
-    for file in files:
-        extracted_files.extend(extract_file(file))
+def read_downloaded_fits(files, *, extract=True, max_open=None):
+    """
+    Extract the downloaded files if needed and index the FITS files among them, without keeping them open
 
-    fits_files = []
+    Parameters
+    ----------
+    files: list of str, mandatory
+        Paths of the downloaded files
+    extract: bool, optional, default True
+        Extract the archives in ``files``. If False, ``files`` are the already extracted files
+    max_open: int, optional, default None
+        Maximum number of FITS files kept open at the same time. If set, the least recently accessed
+        file is closed when another one is opened, so the `~astropy.io.fits.HDUList` objects previously
+        returned must not be used any more. If None, the opened files stay open until the list is closed
+
+    Returns
+    -------
+    A `FitsProductList` with, for each FITS file, an object containing filename, path, primary header
+    and the FITS file (opened with memmap when it is first accessed)
+    """
+    if extract:
+        extracted_files = []
+        for file in files:
+            extracted_files.extend(extract_file(file))
+    else:
+        # already extracted, e.g. by download_and_extract_file
+        extracted_files = [file for file in files if os.path.isfile(file)]
+
+    fits_files = FitsProductList(max_open=max_open)
     for file in extracted_files:
-        fits_file = safe_open_fits(file)
-        if fits_file:
-            fits_files.append({
-                'filename': os.path.basename(file),
-                'path': file,
-                'fits': fits_file
-            })
+        header = safe_read_fits_header(file)
+        if header is not None:
+            fits_files.append(FitsProduct(fits_files, file, header))
 
     return fits_files
 
 
-def safe_open_fits(file_path):
+class FitsProduct(collections.abc.Mapping):
+    """
+    FITS file of a `FitsProductList`, with the keys ``filename``, ``path``, ``header`` (primary header)
+    and ``fits``. The ``fits`` `~astropy.io.fits.HDUList` is opened with memmap when it is first accessed
+    """
+
+    def __init__(self, product_list, path, header):
+        self._product_list = product_list
+        self._items = {'filename': os.path.basename(path), 'path': path, 'header': header}
+
+    def __getitem__(self, key):
+        if key == 'fits':
+            return self._product_list.open_fits(self._items['path'])
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(['filename', 'path', 'header', 'fits'])
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return f"<FitsProduct {self._items['path']}>"
+
+
+class FitsProductList(list):
+    """
+    List of `FitsProduct` returned by `read_downloaded_fits`. The FITS files stay open until the list is
+    closed, unless ``max_open`` is set: the least recently accessed file is then closed when more than
+    ``max_open`` files are open
+    """
+
+    def __init__(self, products=(), *, max_open=None):
+        super().__init__(products)
+        self.max_open = max_open
+        self._open_files = collections.OrderedDict()
+
+    def open_fits(self, path):
+        """
+        Return the opened FITS file ``path``, opening it if needed
+        """
+        hdu_list = self._open_files.get(path)
+        if hdu_list is not None and getattr(hdu_list._file, 'closed', False):
+            # closed by the user
+            hdu_list = None
+        if hdu_list is None:
+            hdu_list = fits.open(path, memmap=True)
+            self._open_files[path] = hdu_list
+        self._open_files.move_to_end(path)
+        while self.max_open is not None and len(self._open_files) > max(1, self.max_open):
+            _, evicted = self._open_files.popitem(last=False)
+            evicted.close()
+        return hdu_list
+
+    def close(self):
+        """
+        Close all the opened FITS files
+        """
+        while self._open_files:
+            _, hdu_list = self._open_files.popitem()
+            hdu_list.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def safe_read_fits_header(file_path):
     """
-    Safely open a FITS file using astropy.io.fits.
+    Safely read the primary header of a FITS file using astropy.io.fits, reading only the first blocks
+    of the file.
 
     Parameters:
     file_path: string
-        The path to the file to be opened.
+        The path to the file to be read.
 
     Returns:
-    fits.HDUList or None
-    Returns the HDUList object if the file is a valid FITS file, otherwise None.
+    fits.Header or None
+    Returns the primary header if the file is a valid FITS file, otherwise None.
     """
     try:
-        hdu_list = fits.open(file_path)
-        return hdu_list
+        return fits.getheader(file_path)
     except (OSError, fits.VerifyError) as e:
         print(f"Skipping file {file_path}: {e}")
         return None
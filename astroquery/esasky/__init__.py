@@ -18,6 +18,18 @@ class Conf(_config.ConfigNamespace):
         10000,
         'Maximum number of rows returned (set to -1 for unlimited).')
 
+    query_workers = _config.ConfigItem(
+        4,
+        'Maximum number of missions or catalogs queried concurrently.')
+
+    mission_timeout = _config.ConfigItem(
+        600,
+        'Time limit in seconds for the query of a single mission or catalog.')
+
+    download_workers = _config.ConfigItem(
+        4,
+        'Maximum number of maps or spectra downloaded concurrently.')
+
 
 conf = Conf()
 
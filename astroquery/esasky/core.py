@@ -3,9 +3,12 @@
 import json
 import os
 import tarfile as esatar
-import sys
 import re
+import shutil
+import tempfile
+import time
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from io import BytesIO
 from zipfile import ZipFile
 from pathlib import Path
@@ -22,6 +25,7 @@ from ..query import BaseQuery
 from ..utils.tap.core import TapPlus
 from ..utils import commons
 from ..utils import async_to_sync
+from ..exceptions import NoResultsWarning
 from . import conf
 from .. import version
 from astropy.coordinates.name_resolve import sesame_database
@@ -39,6 +43,9 @@ class ESASkyClass(BaseQuery):
     URLbase = conf.urlBase
     TIMEOUT = conf.timeout
     DEFAULT_ROW_LIMIT = conf.row_limit
+    QUERY_WORKERS = conf.query_workers
+    MISSION_TIMEOUT = conf.mission_timeout
+    DOWNLOAD_WORKERS = conf.download_workers
 
     __FITS_STRING = ".fits"
     __FTZ_STRING = ".FTZ"
@@ -109,13 +116,18 @@ class ESASkyClass(BaseQuery):
         """
         if not verbose:
             with warnings.catch_warnings():
-                commons.suppress_vo_warnings()
-                warnings.filterwarnings("ignore", category=u.UnitsWarning)
-                job = self._tap.launch_job(query=query, output_file=output_file, output_format=output_format,
-                                           verbose=False, dump_to_file=output_file is not None)
-        else:
-            job = self._tap.launch_job(query=query, output_file=output_file, output_format=output_format,
-                                       verbose=True, dump_to_file=output_file is not None)
+                self._suppress_query_warnings()
+                return self._launch_query(query, output_file=output_file, output_format=output_format)
+        return self._launch_query(query, output_file=output_file, output_format=output_format, verbose=True)
+
+    def _suppress_query_warnings(self):
+        commons.suppress_vo_warnings()
+        warnings.filterwarnings("ignore", category=u.UnitsWarning)
+
+    def _launch_query(self, query, *, output_file=None, output_format="votable", verbose=False):
+        # Unlike query, the warning filters are left as they are, so that it can run in several threads at once
+        job = self._tap.launch_job(query=query, output_file=output_file, output_format=output_format,
+                                   verbose=verbose, dump_to_file=output_file is not None)
         return job.get_results()
 
     def get_tables(self, *, only_names=True, verbose=False, cache=True):
@@ -1471,89 +1483,66 @@ class ESASkyClass(BaseQuery):
             mission_directory = self._create_mission_directory(mission,
                                                                download_dir)
             log.info("Starting download of {} data. ({} files)".format(mission, len(maps_table[url_key])))
-            progress_bar = ProgressBar(len(maps_table[url_key]))
-
-            for index in range(len(maps_table)):
-                product_url = maps_table[url_key][index]
-                if isinstance(product_url, bytes):
-                    product_url = product_url.decode('utf-8')
-                if mission.lower() == self.__HERSCHEL_STRING:
-                    observation_id = maps_table["observation_id"][index]
-                    if isinstance(observation_id, bytes):
-                        observation_id = observation_id.decode('utf-8')
-                else:
-                    identifier = self._get_unique_identifier(table)
-                    observation_id = maps_table[identifier][index]
-                    if isinstance(observation_id, bytes):
-                        observation_id = observation_id.decode('utf-8')
+            is_herschel = mission.lower() == self.__HERSCHEL_STRING
+            identifier = "observation_id" if is_herschel else self._get_unique_identifier(table)
+
+            def decode(value):
+                return value.decode('utf-8') if isinstance(value, bytes) else value
+
+            def download(index):
+                product_url = decode(maps_table[url_key][index])
+                observation_id = decode(maps_table[identifier][index])
                 log.debug("Downloading Observation ID: {} from {}".format(observation_id, product_url))
-                sys.stdout.flush()
-                directory_path = mission_directory
-                if mission.lower() == self.__HERSCHEL_STRING:
+                # The FITS files are opened without changing the warning filters, set below
+                if is_herschel:
                     try:
                         if is_spectra:
-                            key = maps_table['observation_id'][index]
-                            if isinstance(key, bytes):
-                                key = key.decode('utf-8')
-                            maps[key] = self._get_herschel_spectra(product_url, directory_path, cache, verbose=verbose)
-                        else:
-                            maps.append(self._get_herschel_map(product_url, directory_path, cache, verbose=verbose))
+                            return self._get_herschel_spectra(product_url, mission_directory, cache,
+                                                              verbose=verbose, filter_warnings=False)
+                        return self._get_herschel_map(product_url, mission_directory, cache,
+                                                      verbose=verbose, filter_warnings=False)
                     except HTTPError as err:
                         log.error("Download failed with {}.".format(err))
-                        if is_spectra:
-                            key = maps_table['observation_id'][index]
-                            if isinstance(key, bytes):
-                                key = key.decode('utf-8')
-                            maps[key] = None
-                        else:
-                            maps.append(None)
-
+                        return None
+                try:
+                    return self._get_product(product_url, mission_directory, cache, verbose=verbose,
+                                             filter_warnings=False)
+                except (HTTPError, ConnectionError) as err:
+                    log.error("Download failed with {}.".format(err))
+                    return [None]
+
+            # Rows with the same file are downloaded once: concurrent downloads would write the same file
+            first_rows = {}
+            source_rows = [first_rows.setdefault(self._extract_file_name_from_url(decode(url)), index)
+                           for index, url in enumerate(maps_table[url_key])]
+
+            # The products are downloaded and extracted concurrently, and gathered in the order of the table.
+            # The warning filters are process-wide and can't be changed safely by each thread: they are set
+            # once for all the downloads.
+            downloads = {}
+            with warnings.catch_warnings(), \
+                    ThreadPoolExecutor(max_workers=max(1, min(self.DOWNLOAD_WORKERS, len(first_rows)))) as executor:
+                if not verbose:
+                    warnings.filterwarnings("ignore", category=fits.verify.VerifyWarning)
+                progress_bar = ProgressBar(len(first_rows))
+                futures = {executor.submit(download, index): index for index in first_rows.values()}
+                try:
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        downloads[futures[future]] = future.result()
+                        progress_bar.update(done)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            results = [downloads[source_row] for source_row in source_rows]
+
+            for index, result in enumerate(results):
+                if is_herschel and is_spectra:
+                    maps[decode(maps_table['observation_id'][index])] = result
+                elif is_herschel:
+                    maps.append(result)
                 else:
-                    try:
-                        response = self._request(
-                            'GET',
-                            product_url,
-                            cache=cache,
-                            stream=True,
-                            headers=self._get_header())
-
-                        response.raise_for_status()
-
-                        if response.headers.get('Content-Type') == 'application/zip':
-                            with ZipFile(file=BytesIO(response.content)) as zip:
-                                for info in zip.infolist():
-                                    if self._ends_with_fits_like_extentsion(info.filename):
-                                        maps.append(self._open_fits(
-                                            zip.extract(info.filename, path=mission_directory), verbose=verbose))
-                        elif response.headers.get('Content-Type') == 'application/x-gzip':
-                            with esatar.open(name='dummy', mode='r', fileobj=BytesIO(response.content)) as tar:
-                                for file in tar.getmembers():
-                                    if self._ends_with_fits_like_extentsion(file.name):
-                                        file.name = os.path.basename(file.name)
-                                        tar.extract(file, path=mission_directory)
-                                        maps.append(self._open_fits(
-                                            Path(mission_directory, file.name), verbose=verbose))
-                        else:
-                            file_name = self._extract_file_name_from_response_header(response.headers)
-                            if file_name == "":
-                                file_name = self._extract_file_name_from_url(product_url)
-                            if file_name.lower().endswith(self.__TAR_STRING):
-                                with esatar.open(fileobj=BytesIO(response.content)) as tar:
-                                    for member in tar.getmembers():
-                                        tar.extract(member, directory_path)
-                                        maps.append(self._open_fits(Path(directory_path, member.name), verbose=verbose))
-                            else:
-                                fits_data = response.content
-                                with open(os.path.join(directory_path, file_name), 'wb') as fits_file:
-                                    fits_file.write(fits_data)
-                                    fits_file.flush()
-                                    maps.append(
-                                        self._open_fits(os.path.join(directory_path, file_name), verbose=verbose))
-                    except (HTTPError, ConnectionError) as err:
-                        log.error("Download failed with {}.".format(err))
-                        maps.append(None)
-
-                    progress_bar.update(index + 1)
+                    maps.extend(result)
 
             if None in maps:
                 log.error("Some downloads were unsuccessful, please check "
@@ -1561,8 +1550,86 @@ class ESASkyClass(BaseQuery):
 
         return maps
 
-    def _open_fits(self, path, verbose=False):
-        if verbose:
+    def _get_product(self, product_url, directory_path, cache, verbose=False, *, filter_warnings=True):
+        """
+        Downloads a (non-Herschel) product to ``directory_path``, extracting the FITS files of archives,
+        and returns the list of the opened FITS files.
+
+        If ``cache`` is True and a FITS file named after the URL was already downloaded, it is opened
+        without downloading it again. ``verbose`` and ``filter_warnings`` are passed to ``_open_fits``.
+        """
+        url_file_name = self._extract_file_name_from_url(product_url)
+        url_file_path = os.path.join(directory_path, url_file_name)
+        if cache and self._ends_with_fits_like_extentsion(url_file_name) and os.path.isfile(url_file_path):
+            log.debug("Using previously downloaded {}".format(url_file_path))
+            return [self._open_fits(url_file_path, verbose=verbose, filter_warnings=filter_warnings)]
+
+        response = self._request(
+            'GET',
+            product_url,
+            cache=cache,
+            stream=True,
+            headers=self._get_header())
+
+        response.raise_for_status()
+
+        products = []
+        if response.headers.get('Content-Type') == 'application/zip':
+            with ZipFile(file=BytesIO(response.content)) as zip:
+                for info in zip.infolist():
+                    if self._ends_with_fits_like_extentsion(info.filename):
+                        with zip.open(info) as source:
+                            file_path = self._save_file(source, os.path.join(directory_path, info.filename))
+                        products.append(self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings))
+        elif response.headers.get('Content-Type') == 'application/x-gzip':
+            with esatar.open(name='dummy', mode='r', fileobj=BytesIO(response.content)) as tar:
+                for file in tar.getmembers():
+                    if self._ends_with_fits_like_extentsion(file.name):
+                        file_path = self._save_file(tar.extractfile(file),
+                                                    os.path.join(directory_path, os.path.basename(file.name)))
+                        products.append(self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings))
+        else:
+            file_name = self._extract_file_name_from_response_header(response.headers)
+            if file_name == "":
+                file_name = url_file_name
+            if file_name.lower().endswith(self.__TAR_STRING):
+                with esatar.open(fileobj=BytesIO(response.content)) as tar:
+                    for member in tar.getmembers():
+                        if not member.isfile():
+                            continue
+                        file_path = self._save_file(tar.extractfile(member),
+                                                    os.path.join(directory_path, member.name))
+                        products.append(self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings))
+            else:
+                file_path = self._save_file(BytesIO(response.content), os.path.join(directory_path, file_name))
+                products.append(self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings))
+        return products
+
+    def _save_file(self, source, file_path):
+        """
+        Writes the contents of the file object ``source`` to ``file_path``. The contents are written to a
+        temporary file first, which then replaces ``file_path``, so that an interrupted download never leaves
+        a partial file that would be reused from the cache.
+        """
+        directory = os.path.dirname(file_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".", suffix=".part", delete=False) as temp_file:
+            try:
+                shutil.copyfileobj(source, temp_file)
+            except BaseException:
+                temp_file.close()
+                os.remove(temp_file.name)
+                raise
+        os.replace(temp_file.name, file_path)
+        return file_path
+
+    def _open_fits(self, path, verbose=False, *, filter_warnings=True):
+        """
+        Opens the FITS file ``path``. Unless ``verbose`` is True, the FITS verification warnings are
+        ignored. The warning filters are process-wide: with ``filter_warnings=False``, they are left as
+        they are, for callers running in several threads that set them once for all of them.
+        """
+        if verbose or not filter_warnings:
             return fits.open(path)
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=fits.verify.VerifyWarning)
@@ -1580,7 +1647,7 @@ class ESASkyClass(BaseQuery):
                 or lower_case_name.endswith("fts.gz")
                 )
 
-    def _get_herschel_map(self, product_url, directory_path, cache, verbose=False):
+    def _get_herschel_map(self, product_url, directory_path, cache, verbose=False, *, filter_warnings=True):
         observation = dict()
         response = self._request('GET', product_url, cache=cache,
                                  stream=True, headers=self._get_header())
@@ -1589,15 +1656,14 @@ class ESASkyClass(BaseQuery):
         with esatar.open(fileobj=BytesIO(response.content)) as tar:
             for member in tar.getmembers():
                 member_name = member.name.lower()
-                if 'hspire' in member_name or 'hpacs' in member_name:
+                if member.isfile() and ('hspire' in member_name or 'hpacs' in member_name):
                     herschel_filter = self._get_herschel_filter_name(member_name)
-                    tar.extract(member, directory_path)
-                    observation[herschel_filter] = self._open_fits(
-                        os.path.join(directory_path, member.name), verbose=verbose
-                    )
+                    file_path = self._save_file(tar.extractfile(member), os.path.join(directory_path, member.name))
+                    observation[herschel_filter] = self._open_fits(file_path, verbose=verbose,
+                                                                   filter_warnings=filter_warnings)
         return observation
 
-    def _get_herschel_spectra(self, product_url, directory_path, cache, verbose=False):
+    def _get_herschel_spectra(self, product_url, directory_path, cache, verbose=False, *, filter_warnings=True):
         spectra = dict()
         response = self._request('GET', product_url, cache=cache,
                                  stream=True, headers=self._get_header())
@@ -1607,16 +1673,16 @@ class ESASkyClass(BaseQuery):
         with esatar.open(fileobj=BytesIO(response.content)) as tar:
             for member in tar.getmembers():
                 member_name = member.name.lower()
-                if ('hspire' in member_name or 'hpacs' in member_name
-                        or 'hhifi' in member_name):
+                if member.isfile() and ('hspire' in member_name or 'hpacs' in member_name
+                                        or 'hhifi' in member_name):
                     herschel_filter = self._get_herschel_filter_name(member_name)
-                    tar.extract(member, directory_path)
+                    file_path = self._save_file(tar.extractfile(member), os.path.join(directory_path, member.name))
                     herschel_fits = []
                     if herschel_filter in spectra:
-                        hdul = self._open_fits(os.path.join(directory_path, member.name), verbose=verbose)
+                        hdul = self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings)
                         herschel_fits.append(hdul)
                     else:
-                        herschel_fits = self._open_fits(os.path.join(directory_path, member.name), verbose=verbose)
+                        herschel_fits = self._open_fits(file_path, verbose=verbose, filter_warnings=filter_warnings)
                         if isinstance(herschel_fits, list):
                             herschel_fits = [herschel_fits]
 
@@ -1714,7 +1780,7 @@ class ESASkyClass(BaseQuery):
             # is a number and "2CXO J090341.1-322609" cannot be converted to a number.
             return query
 
-        return self.query(query, output_format="votable", verbose=verbose)
+        return self._launch_query(query, output_format="votable", verbose=verbose)
 
     def _build_region_query(self, coordinates, radius, row_limit, descriptor):
         ra = coordinates.transform_to('icrs').ra.deg
@@ -1795,9 +1861,59 @@ class ESASkyClass(BaseQuery):
         return query
 
     def _store_query_result(self, query_result, names, descriptors, verbose=False, **kwargs):
+        """
+        Queries each of the missions or catalogs in ``names`` and stores the non-empty results in
+        ``query_result``, in the order of ``names``.
+
+        The queries run concurrently, by at most ``QUERY_WORKERS`` threads. A query that fails, or
+        that takes longer than ``MISSION_TIMEOUT`` seconds, is left out of the results with a
+        warning, unless all of them fail. The queries not started yet are then cancelled, and the
+        ones that timed out are not waited for: they are left to end in the background and their
+        results are discarded. They run with the warning filters left as they are (see
+        ``_launch_query``), so the filters set for this call are restored once, when it returns.
+        """
+        names = list(names)
+        results = {}
+        errors = {}
+        started = {}
+
+        def run_query(name):
+            started[name] = time.monotonic()
+            return self._query(name=name, descriptors=descriptors, verbose=verbose, **kwargs)
+
+        # The warning filters are process-wide and can't be changed safely by each thread:
+        # they are set once for all the queries
+        with warnings.catch_warnings():
+            if not verbose:
+                self._suppress_query_warnings()
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.QUERY_WORKERS, len(names))))
+            try:
+                pending = {executor.submit(run_query, name): name for name in names}
+                while pending:
+                    done, _ = wait(pending, timeout=min(1, self.MISSION_TIMEOUT), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = pending.pop(future)
+                        try:
+                            results[name] = future.result()
+                        except Exception as ex:
+                            errors[name] = ex
+                    now = time.monotonic()
+                    for future, name in list(pending.items()):
+                        if name in started and now - started[name] > self.MISSION_TIMEOUT:
+                            del pending[future]
+                            errors[name] = TimeoutError(f"Timeout limit of {self.MISSION_TIMEOUT} s exceeded")
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        if errors and not results:
+            raise next(iter(errors.values()))
+        for name, error in errors.items():
+            warnings.warn(f"The query for {name} failed and is left out of the results: {error}",
+                          NoResultsWarning)
+
         for name in names:
-            table = self._query(name=name, descriptors=descriptors, verbose=verbose, **kwargs)
-            if len(table) > 0:
+            table = results.get(name)
+            if table is not None and len(table) > 0:
                 query_result[name] = table
 
     def _get_observation_info(self):
@@ -0,0 +1,210 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+
+import io
+import tarfile
+import threading
+import time
+import warnings
+
+import pytest
+from astropy.io import fits
+from astropy.table import Table
+from requests import HTTPError
+
+from astroquery.esasky import ESASkyClass
+from astroquery.exceptions import NoResultsWarning
+from astroquery.utils.mocks import MockResponse
+
+
+@pytest.fixture
+def esasky(monkeypatch):
+    esasky = ESASkyClass(tap_handler=object())
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def query(name, descriptors, verbose=False, **kwargs):
+        with lock:
+            running.append(name)
+            peak[0] = max(peak[0], len(running))
+        try:
+            time.sleep(descriptors[name])
+            if name == 'FAILING':
+                raise ValueError(f"Could not construct query for mission {name}")
+            return Table({'mission': [name] * (name != 'EMPTY')}, dtype=[str])
+        finally:
+            with lock:
+                running.remove(name)
+
+    monkeypatch.setattr(esasky, '_query', query)
+    esasky.peak = peak
+    esasky.running = running
+    return esasky
+
+
+def test_store_query_result(esasky):
+    # Missions finishing in reverse order
+    descriptors = {'XMM': 0.1, 'HST': 0.05, 'EMPTY': 0.02, 'ISO': 0}
+    query_result = {}
+    esasky._store_query_result(query_result, names=list(descriptors), descriptors=descriptors)
+
+    assert list(query_result) == ['XMM', 'HST', 'ISO']
+    assert query_result['HST']['mission'][0] == 'HST'
+    assert esasky.peak[0] == 4
+
+    esasky.QUERY_WORKERS = 1
+    esasky.peak[0] = 0
+    query_result = {}
+    esasky._store_query_result(query_result, names=list(descriptors), descriptors=descriptors)
+    assert list(query_result) == ['XMM', 'HST', 'ISO']
+    assert esasky.peak[0] == 1
+
+
+def test_store_query_result_failures(esasky):
+    descriptors = {'XMM': 0, 'FAILING': 0, 'SLOW': 1}
+    esasky.MISSION_TIMEOUT = 0.2
+    query_result = {}
+    filters = list(warnings.filters)
+    start = time.monotonic()
+    with pytest.warns(NoResultsWarning) as warned:
+        esasky._store_query_result(query_result, names=list(descriptors), descriptors=descriptors)
+
+    assert list(query_result) == ['XMM']
+    # The query that timed out is not waited for, and the warning filters are restored
+    assert time.monotonic() - start < 0.8
+    assert esasky.running == ['SLOW']
+    assert warnings.filters == filters
+    while esasky.running:
+        time.sleep(0.05)
+    assert warnings.filters == filters
+    messages = sorted(str(warning.message) for warning in warned)
+    assert messages[0].startswith("The query for FAILING failed and is left out of the results: "
+                                  "Could not construct query")
+    assert messages[1].startswith("The query for SLOW failed and is left out of the results: Timeout limit")
+
+    # Without any result, the error is raised
+    with pytest.raises(ValueError, match="Could not construct query for mission FAILING"):
+        esasky._store_query_result({}, names=['FAILING'], descriptors=descriptors)
+
+
+def test_get_maps_for_mission(tmp_path, monkeypatch):
+    esasky = ESASkyClass(tap_handler=object())
+    requested = []
+
+    def request(method, url, **kwargs):
+        requested.append(url)
+        name = url.rsplit('/', 1)[1]
+        # later products come back first
+        time.sleep(0.05 / (1 + int(name[4])))
+        if name == 'obs_2.fits':
+            raise HTTPError("404 Not Found")
+        buffer = io.BytesIO()
+        fits.PrimaryHDU(header=fits.Header({'OBS': name})).writeto(buffer)
+        return MockResponse(buffer.getvalue())
+
+    monkeypatch.setattr(esasky, '_request', request)
+    monkeypatch.setattr(esasky, '_get_unique_identifier', lambda table: 'observation_id')
+    maps_table = Table({'observation_id': [f'obs_{i}' for i in range(4)],
+                        'product_url': [f'https://esasky/data/obs_{i}.fits' for i in range(4)]})
+
+    maps = esasky._get_maps_for_mission(maps_table, 'XMM', str(tmp_path), cache=True, table='xmm')
+
+    assert [hdul[0].header['OBS'] if hdul else None for hdul in maps] == [
+        'obs_0.fits', 'obs_1.fits', None, 'obs_3.fits']
+    assert sorted(requested) == list(maps_table['product_url'])
+    for hdul in maps:
+        if hdul:
+            hdul.close()
+
+    # Products already downloaded are not requested again
+    requested.clear()
+    maps = esasky._get_maps_for_mission(maps_table, 'XMM', str(tmp_path), cache=True, table='xmm')
+    assert requested == ['https://esasky/data/obs_2.fits']
+    assert maps[3][0].header['OBS'] == 'obs_3.fits'
+    for hdul in maps:
+        if hdul:
+            hdul.close()
+
+
+def test_get_maps_for_mission_duplicates(tmp_path, monkeypatch):
+    esasky = ESASkyClass(tap_handler=object())
+    requested = []
+
+    def request(method, url, **kwargs):
+        requested.append(url)
+        buffer = io.BytesIO()
+        fits.PrimaryHDU(header=fits.Header({'OBS': url.rsplit('/', 1)[1]})).writeto(buffer)
+        return MockResponse(buffer.getvalue())
+
+    monkeypatch.setattr(esasky, '_request', request)
+    monkeypatch.setattr(esasky, '_get_unique_identifier', lambda table: 'observation_id')
+    maps_table = Table({'observation_id': ['obs_0', 'obs_1', 'obs_0'],
+                        'product_url': [f'https://esasky/data/obs_{i}.fits' for i in (0, 1, 0)]})
+
+    maps = esasky._get_maps_for_mission(maps_table, 'XMM', str(tmp_path), cache=False, table='xmm')
+
+    # The file of both obs_0 rows is downloaded (and written) once
+    assert sorted(requested) == ['https://esasky/data/obs_0.fits', 'https://esasky/data/obs_1.fits']
+    assert [hdul[0].header['OBS'] for hdul in maps] == ['obs_0.fits', 'obs_1.fits', 'obs_0.fits']
+    maps[0].close()
+    maps[1].close()
+
+
+def test_get_maps_for_mission_herschel(tmp_path, monkeypatch):
+    esasky = ESASkyClass(tap_handler=object())
+
+    def request(method, url, **kwargs):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w') as tar:
+            directory = tarfile.TarInfo('1342183910/hspire')
+            directory.type = tarfile.DIRTYPE
+            tar.addfile(directory)
+            for name in ('hspire_psw.fits', 'hspire_plw.fits'):
+                hdu = io.BytesIO()
+                fits.PrimaryHDU(header=fits.Header({'OBS': name})).writeto(hdu)
+                info = tarfile.TarInfo(f'1342183910/hspire/{name}')
+                info.size = len(hdu.getvalue())
+                hdu.seek(0)
+                tar.addfile(info, hdu)
+        return MockResponse(buffer.getvalue())
+
+    saved = []
+
+    def save_file(source, file_path):
+        saved.append(file_path)
+        return ESASkyClass._save_file(esasky, source, file_path)
+
+    monkeypatch.setattr(esasky, '_request', request)
+    monkeypatch.setattr(esasky, '_save_file', save_file)
+    maps_table = Table({'observation_id': ['1342183910'],
+                        'product_url': ['https://esasky/data/1342183910.tar']})
+    filters = list(warnings.filters)
+
+    maps = esasky._get_maps_for_mission(maps_table, 'HERSCHEL', str(tmp_path), cache=False, table='herschel')
+
+    # The members are written to a temporary file first, like the other products
+    directory = tmp_path / 'HERSCHEL' / '1342183910' / 'hspire'
+    assert sorted(saved) == [str(directory / 'hspire_plw.fits'), str(directory / 'hspire_psw.fits')]
+    assert sorted(path.name for path in directory.iterdir()) == ['hspire_plw.fits', 'hspire_psw.fits']
+    assert maps[0]['250'][0].header['OBS'] == 'hspire_psw.fits'
+    assert maps[0]['500'][0].header['OBS'] == 'hspire_plw.fits'
+    assert warnings.filters == filters
+    for hdul in maps[0].values():
+        hdul.close()
+
+
+def test_save_file(tmp_path):
+    esasky = ESASkyClass(tap_handler=object())
+    file_path = str(tmp_path / 'product.fits')
+    assert esasky._save_file(io.BytesIO(b'complete'), file_path) == file_path
+
+    class InterruptedStream(io.RawIOBase):
+        def readinto(self, buffer):
+            raise ConnectionError("Connection reset")
+
+    # An interrupted download leaves the previous file untouched, and no partial file
+    with pytest.raises(ConnectionError):
+        esasky._save_file(InterruptedStream(), file_path)
+    assert [path.name for path in tmp_path.iterdir()] == ['product.fits']
+    with open(file_path, 'rb') as file:
+        assert file.read() == b'complete'
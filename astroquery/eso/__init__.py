@@ -19,6 +19,18 @@ class Conf(_config.ConfigNamespace):
     tap_url = _config.ConfigItem(
         "https://archive.eso.org/tap_obs",
         'URL for TAP queries.')
+    download_workers = _config.ConfigItem(
+        4,
+        'Maximum number of files downloaded concurrently by retrieve_data.')
+    download_retries = _config.ConfigItem(
+        3,
+        'Number of times a download failing with a transient error is retried.')
+    header_workers = _config.ConfigItem(
+        8,
+        'Maximum number of headers retrieved concurrently by get_headers.')
+    header_cache_size = _config.ConfigItem(
+        10000,
+        'Maximum number of parsed headers kept in memory by get_headers.')
 
 
 conf = Conf()
@@ -9,6 +9,7 @@ European Southern Observatory (ESO)
 import base64
 import email
 import functools
+import heapq
 import json
 import os
 import os.path
@@ -16,9 +17,12 @@ import sys
 import re
 import shutil
 import subprocess
+import threading
 import time
 import warnings
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from typing import List, Optional, Tuple, Dict, Set, Union
 
 import astropy.utils.data
@@ -26,7 +30,7 @@ import keyring
 import requests
 from astropy.table import Table, Column
 from astropy.utils.decorators import deprecated_renamed_argument
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pyvo.dal import TAPService
 from pyvo.dal.exceptions import DALQueryError, DALFormatError
 
@@ -37,7 +41,7 @@ from ..exceptions import RemoteServiceError, LoginError, \
 from ..query import QueryWithLogin
 from ..utils import schema
 from .utils import _UserParams, raise_if_coords_not_valid, _reorder_columns, \
-    _raise_if_has_deprecated_keys, _build_adql_string, \
+    _raise_if_has_deprecated_keys, _build_adql_string, _parse_header_cards, _headers_to_table, \
     DEFAULT_LEAD_COLS_PHASE3, DEFAULT_LEAD_COLS_RAW
 
 
@@ -111,11 +115,17 @@ class EsoClass(QueryWithLogin):
     DOWNLOAD_URL = "https://dataportal.eso.org/dataPortal/file/"
     AUTH_URL = "https://www.eso.org/sso/oidc/token"
     GUNZIP = "gunzip"
+    DOWNLOAD_WORKERS = conf.download_workers
+    DOWNLOAD_RETRIES = conf.download_retries
+    HEADER_WORKERS = conf.header_workers
+    HEADER_CACHE_SIZE = conf.header_cache_size
 
     def __init__(self):
         super().__init__()
         self._auth_info: Optional[_AuthInfo] = None
         self._hash = None
+        self._headers_cache: OrderedDict[str, Dict[str, object]] = OrderedDict()
+        self._headers_cache_lock = threading.Lock()
         self._ROW_LIMIT = None
         self.ROW_LIMIT = conf.ROW_LIMIT
 
@@ -701,55 +711,61 @@ class EsoClass(QueryWithLogin):
         result : `~astropy.table.Table`
             A table where: columns are header keywords, rows are product_ids.
 
+        Notes
+        -----
+        The headers are retrieved concurrently, by ``conf.header_workers``
+        threads. With ``cache=True``, the ``conf.header_cache_size`` most
+        recently used parsed headers are also kept in memory, so that they are
+        not retrieved again by later calls.
+
         """
         _schema_product_ids = schema.Schema(
             schema.Or(Column, [schema.Schema(str)]))
         _schema_product_ids.validate(product_ids)
-        # Get all headers
-        result = []
-        for dp_id in product_ids:
+        product_ids = list(product_ids)
+        unique_ids = list(dict.fromkeys(product_ids))
+        headers = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.HEADER_WORKERS, len(unique_ids)))) as executor:
+            futures = {executor.submit(self._get_header, dp_id, cache=cache): dp_id for dp_id in unique_ids}
+            try:
+                for future in as_completed(futures):
+                    headers[futures[future]] = future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return _headers_to_table([headers[dp_id] for dp_id in product_ids], 'DP.ID', product_ids)
+
+    def _get_header(self, dp_id: str, *, cache: bool = True) -> Dict[str, object]:
+        """
+        Retrieve and parse the header of the data product ``dp_id``. When
+        ``cache`` is True, the ``HEADER_CACHE_SIZE`` most recently used parsed
+        headers are kept in memory, keyed by product ID.
+        """
+        header = None
+        if cache:
+            with self._headers_cache_lock:
+                header = self._headers_cache.get(dp_id)
+                if header is not None:
+                    self._headers_cache.move_to_end(dp_id)
+        if header is None:
             response = self._request(
                 "GET", f"https://archive.eso.org/hdr?DpId={dp_id}",
                 cache=cache)
-            root = BeautifulSoup(response.content, 'html5lib')
-            hdr = root.select('pre')[0].text
-            header = {'DP.ID': dp_id}
-            for key_value in hdr.split('\n'):
-                if "=" in key_value:
-                    key, value = key_value.split('=', 1)
-                    key = key.strip()
-                    value = value.split('/', 1)[0].strip()
-                    if key[0:7] != "COMMENT":  # drop comments
-                        if value == "T":  # Convert boolean T to True
-                            value = True
-                        elif value == "F":  # Convert boolean F to False
-                            value = False
-                        # Convert to string, removing quotation marks
-                        elif value[0] == "'":
-                            value = value[1:-1]
-                        elif "." in value or "E" in value:  # Convert to float
-                            value = float(value)
-                        else:  # Convert to integer
-                            value = int(value)
-                        header[key] = value
-                elif key_value.startswith("END"):
-                    break
-            result.append(header)
-        # Identify all columns
-        columns = []
-        column_types = []
-        for header in result:
-            for key in header:
-                if key not in columns:
-                    columns.append(key)
-                    column_types.append(type(header[key]))
-        # Add all missing elements
-        for item in result:
-            for (column, column_type) in zip(columns, column_types):
-                if column not in item:
-                    item[column] = column_type()
-        # Return as Table
-        return Table(result)
+            root = BeautifulSoup(response.content, 'html.parser', parse_only=SoupStrainer('pre'))
+            header = _parse_header_cards(root.find('pre').text)
+            if cache:
+                with self._headers_cache_lock:
+                    self._headers_cache[dp_id] = header
+                    while len(self._headers_cache) > max(0, self.HEADER_CACHE_SIZE):
+                        self._headers_cache.popitem(last=False)
+        return header
+
+    def clear_cache(self):
+        """Removes all cache files and the headers kept in memory."""
+        super().clear_cache()
+        with self._headers_cache_lock:
+            self._headers_cache.clear()
 
     @staticmethod
     def _get_filename_from_response(response: requests.Response) -> str:
@@ -771,9 +787,10 @@ class EsoClass(QueryWithLogin):
         return False
 
     def _download_eso_file(self, file_link: str, destination: str,
-                           overwrite: bool) -> Tuple[str, bool]:
+                           overwrite: bool, *, headers: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
         block_size = astropy.utils.data.conf.download_block_size
-        headers = self._get_auth_header()
+        if headers is None:
+            headers = self._get_auth_header()
         with self._session.get(file_link, stream=True, headers=headers) as response:
             response.raise_for_status()
             filename = self._get_filename_from_response(response)
@@ -790,30 +807,110 @@ class EsoClass(QueryWithLogin):
                 os.rename(part_filename, filename)
         return filename, download_required
 
+    @staticmethod
+    def _is_transient_error(ex: Exception) -> bool:
+        """
+        Whether a failed download is worth retrying: connection errors, timeouts
+        and server-side HTTP errors.
+        """
+        if isinstance(ex, requests.HTTPError):
+            status_code = getattr(ex.response, 'status_code', None)
+            return status_code is not None and (status_code == 429 or status_code >= 500)
+        return isinstance(ex, (requests.ConnectionError, requests.Timeout,
+                               requests.exceptions.ChunkedEncodingError))
+
     def _download_eso_files(self, file_ids: List[str], destination: Optional[str],
-                            overwrite: bool) -> List[str]:
+                            overwrite: bool, *, unzip: bool = False) -> Table:
+        """
+        Download the files ``file_ids`` concurrently, retrying transient failures.
+
+        At most ``DOWNLOAD_WORKERS`` files are downloaded at once, through the
+        (authenticated) session of this instance. Files are uncompressed as soon
+        as they are downloaded if ``unzip`` is True, while the other downloads go on.
+        Transient failures are queued for a retry after a backoff, up to
+        ``DOWNLOAD_RETRIES`` times.
+
+        Returns
+        -------
+        report : `~astropy.table.Table`
+            One row per distinct file, in the order of ``file_ids``, with the local file,
+            the download status ('DOWNLOADED', 'CACHED' or 'ERROR'), the number of
+            bytes downloaded, the elapsed time and the number of attempts.
+        """
         destination = destination or self.cache_location
         destination = os.path.abspath(destination)
         os.makedirs(destination, exist_ok=True)
+        # A file requested twice would be written by two downloads at once
+        file_ids = list(dict.fromkeys(file_ids))
         nfiles = len(file_ids)
         log.info(f"Downloading {nfiles} files ...")
-        downloaded_files = []
-        for i, file_id in enumerate(file_ids, 1):
+        headers = self._get_auth_header()
+
+        if unzip and not shutil.which(self.GUNZIP):
+            warnings.warn("Unable to unzip files "
+                          "(gunzip is not available on this system)")
+            unzip = False
+
+        def download(file_id):
             file_link = self.DOWNLOAD_URL + file_id
-            log.info(f"Downloading file {i}/{nfiles} {file_link} to {destination}")
-            try:
-                filename, downloaded = self._download_eso_file(file_link, destination, overwrite)
-                downloaded_files.append(filename)
-                if downloaded:
-                    log.info(f"Successfully downloaded dataset {file_id} to {filename}")
-            except requests.HTTPError as http_error:
-                if http_error.response.status_code == 401:
-                    log.error(f"Access denied to {file_link}")
-                else:
-                    log.error(f"Failed to download {file_link}. {http_error}")
-            except RuntimeError as ex:
-                log.error(f"Failed to download {file_link}. {ex}")
-        return downloaded_files
+            log.info(f"Downloading file {file_link} to {destination}")
+            start = time.monotonic()
+            filename, downloaded = self._download_eso_file(file_link, destination, overwrite, headers=headers)
+            nbytes = os.path.getsize(filename) if downloaded else 0
+            if downloaded:
+                log.info(f"Successfully downloaded dataset {file_id} to {filename}")
+            if unzip:
+                filename = self._unzip_file(filename)
+            return filename, 'DOWNLOADED' if downloaded else 'CACHED', nbytes, time.monotonic() - start
+
+        rows = {}
+        attempts = dict.fromkeys(file_ids, 0)
+        retry_queue = []  # (time of the retry, file_id)
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.DOWNLOAD_WORKERS, nfiles))) as executor:
+            pending = {}
+
+            def submit(file_id):
+                attempts[file_id] += 1
+                pending[executor.submit(download, file_id)] = file_id
+
+            for file_id in file_ids:
+                submit(file_id)
+            while pending or retry_queue:
+                now = time.monotonic()
+                while retry_queue and retry_queue[0][0] <= now:
+                    submit(heapq.heappop(retry_queue)[1])
+                timeout = max(0, retry_queue[0][0] - now) if retry_queue else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_id = pending.pop(future)
+                    file_link = self.DOWNLOAD_URL + file_id
+                    try:
+                        filename, status, nbytes, elapsed = future.result()
+                        rows[file_id] = (file_id, filename, status, nbytes, elapsed, attempts[file_id], '')
+                        log.info(f"Retrieved {len(rows)}/{nfiles} files")
+                        continue
+                    except (requests.RequestException, RuntimeError) as ex:
+                        error = ex
+                    if self._is_transient_error(error) and attempts[file_id] <= self.DOWNLOAD_RETRIES:
+                        delay = 2 ** (attempts[file_id] - 1)
+                        log.warning(f"Failed to download {file_link} ({error}), retrying in {delay} s")
+                        heapq.heappush(retry_queue, (time.monotonic() + delay, file_id))
+                    else:
+                        if (isinstance(error, requests.HTTPError)
+                                and getattr(error.response, 'status_code', None) == 401):
+                            log.error(f"Access denied to {file_link}")
+                        else:
+                            log.error(f"Failed to download {file_link}. {error}")
+                        rows[file_id] = (file_id, '', 'ERROR', 0, 0., attempts[file_id], str(error))
+
+        report = Table(rows=[rows[file_id] for file_id in file_ids] or None,
+                       names=('Dataset', 'File', 'Status', 'Bytes', 'Elapsed', 'Attempts', 'Message'),
+                       dtype=(str, str, str, int, float, int, str))
+        report['Elapsed'].unit = 's'
+        total_time = time.monotonic() - start_time
+        log.info(f"Downloaded {report['Bytes'].sum()} bytes in {total_time:.1f} s")
+        return report
 
     def _unzip_file(self, filename: str) -> str:
         """
@@ -833,14 +930,6 @@ class EsoClass(QueryWithLogin):
                     log.error(f"Failed to unzip {filename}: {ex}")
         return uncompressed_filename or filename
 
-    def _unzip_files(self, files: List[str]) -> List[str]:
-        if shutil.which(self.GUNZIP):
-            files = [self._unzip_file(file) for file in files]
-        else:
-            warnings.warn("Unable to unzip files "
-                          "(gunzip is not available on this system)")
-        return files
-
     @staticmethod
     def _get_unique_files_from_association_tree(xml: str) -> Set[str]:
         tree = ET.fromstring(xml)
@@ -908,7 +997,7 @@ class EsoClass(QueryWithLogin):
         return list(associated_files.difference(set(datasets)))
 
     def retrieve_data(self, datasets, *, continuation=False, destination=None,
-                      with_calib=None, unzip=True):
+                      with_calib=None, unzip=True, report=False):
         """
         Retrieve a list of datasets form the ESO archive.
 
@@ -930,11 +1019,25 @@ class EsoClass(QueryWithLogin):
         unzip : bool
             Unzip compressed files from the archive after download. `True` by
             default.
+        report : bool
+            If `True`, return a table reporting the retrieval of each dataset
+            instead of the list of files. `False` by default.
 
         Returns
         -------
         files : list of strings or string
             List of files that have been locally downloaded from the archive.
+        report : `~astropy.table.Table`
+            If ``report`` is `True`, table with one row per dataset: its local
+            ``File``, ``Status`` ('DOWNLOADED', 'CACHED' or 'ERROR'), the number of
+            ``Bytes`` downloaded, the ``Elapsed`` time, the number of ``Attempts``
+            and the error ``Message``, if any.
+
+        Notes
+        -----
+        The datasets are downloaded concurrently, by ``conf.download_workers``
+        threads, and transient failures are retried up to ``conf.download_retries``
+        times.
 
         Examples
         --------
@@ -971,10 +1074,11 @@ class EsoClass(QueryWithLogin):
 
         all_datasets = datasets + associated_files
         log.info("Downloading datasets ...")
-        files = self._download_eso_files(all_datasets, destination, continuation)
-        if unzip:
-            files = self._unzip_files(files)
+        download_report = self._download_eso_files(all_datasets, destination, continuation, unzip=unzip)
         log.info("Done!")
+        if report:
+            return download_report
+        files = list(download_report['File'][download_report['Status'] != 'ERROR'])
         return files[0] if files and len(files) == 1 and return_string else files
 
     @deprecated_renamed_argument(('open_form', 'cache'), (None, None),
@@ -7,19 +7,23 @@ ESO Astroquery Module tests
 European Southern Observatory (ESO)
 
 """
+import io
 import os
 import shutil
 import sys
+import threading
+import time
 
 import pytest
 import pyvo
-from astropy.table import Table
+import requests
+from astropy.table import Column, Table
 import astropy.io.ascii
 
 from astroquery.utils.mocks import MockResponse
 from ...eso import Eso
 from ...eso.utils import _UserParams, \
-    _build_adql_string, _adql_sanitize_op_val, _reorder_columns, \
+    _build_adql_string, _adql_sanitize_op_val, _reorder_columns, _parse_header_cards, \
     DEFAULT_LEAD_COLS_RAW
 from ...exceptions import NoResultsWarning, MaxResultsWarning
 
@@ -214,6 +218,57 @@ def test_download(monkeypatch, tmp_path):
     assert downloaded_files[0] == filename
 
 
+def test_download_concurrently(monkeypatch, tmp_path):
+    eso = Eso()
+    eso.cache_location = tmp_path
+    monkeypatch.setattr(eso, 'DOWNLOAD_WORKERS', 3)
+    active, max_active = [0], [0]
+    lock = threading.Lock()
+    failures = {'file2': 1}
+
+    def get(url, **kwargs):
+        fileid = url.rsplit('/', 1)[-1]
+        with lock:
+            active[0] += 1
+            max_active[0] = max(max_active[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        if failures.get(fileid, 0):
+            failures[fileid] -= 1
+            raise requests.ConnectionError("connection reset")
+        if fileid == 'file3':
+            response = requests.Response()
+            response.status_code = 401
+            response.url = url
+            response.raw = io.BytesIO(b'')
+            return response
+        header = {'Content-Disposition': f'filename={fileid}.fits'}
+        return MockResponse(content=fileid.encode(), url=url, headers=header)
+
+    monkeypatch.setattr(eso._session, 'get', get)
+    fileids = ['file0', 'file1', 'file2', 'file3', 'file4']
+    report = eso.retrieve_data(fileids, unzip=False, report=True)
+
+    assert max_active[0] == 3
+    assert list(report['Dataset']) == fileids
+    assert list(report['Status']) == ['DOWNLOADED'] * 3 + ['ERROR', 'DOWNLOADED']
+    assert list(report['Attempts']) == [1, 1, 2, 1, 1]
+    assert list(report['Bytes']) == [5, 5, 5, 0, 5]
+    assert report['File'][0] == os.path.join(tmp_path, 'file0.fits')
+
+    # Files already downloaded are not downloaded again, failures are left out
+    files = eso.retrieve_data(fileids, unzip=False)
+    assert files == [os.path.join(tmp_path, f'file{i}.fits') for i in (0, 1, 2, 4)]
+    report = eso.retrieve_data(fileids[:2], unzip=False, report=True)
+    assert list(report['Status']) == ['CACHED', 'CACHED']
+    assert list(report['Bytes']) == [0, 0]
+
+    # A dataset given twice is downloaded once
+    report = eso.retrieve_data(['file0', 'file1', 'file0'], unzip=False, report=True)
+    assert list(report['Dataset']) == ['file0', 'file1']
+
+
 @pytest.mark.skipif(sys.platform.startswith("win"), reason="gunzip not available on Windows")
 def test_unzip(tmp_path):
     eso = Eso()
@@ -221,9 +276,61 @@ def test_unzip(tmp_path):
     tmp_filename = tmp_path / 'testfile.fits.Z'
     uncompressed_filename = tmp_path / 'testfile.fits'
     shutil.copy(filename, tmp_filename)
-    uncompressed_files = eso._unzip_files([str(tmp_filename)])
-    assert len(uncompressed_files) == 1
-    assert uncompressed_files[0] == str(uncompressed_filename)
+    uncompressed_file = eso._unzip_file(str(tmp_filename))
+    assert uncompressed_file == str(uncompressed_filename)
+
+
+HEADER_PAGE = """<html><body><pre>SIMPLE  =                    T / Standard FITS
+BITPIX  =                   16 / # of bits per pix value
+EXPTIME =               {exptime} / Integration time
+INSTRUME= 'FORS2   '           / Instrument used
+OBJECT  = 'NGC 1/2 ''A'''      / Original target
+COMMENT FITS (Flexible Image Transport System) format
+{extra}END
+</pre></body></html>"""
+
+
+def test_parse_header_cards():
+    text = HEADER_PAGE.split('<pre>')[1].split('</pre>')[0]
+    header = _parse_header_cards(text.format(exptime='30.', extra="BLANK   =                  / undefined\n"))
+    assert header == {'SIMPLE': True, 'BITPIX': 16, 'EXPTIME': 30.,
+                      'INSTRUME': 'FORS2   ', 'OBJECT': "NGC 1/2 'A'"}
+
+
+def test_get_headers(monkeypatch):
+    eso = Eso()
+    requested = []
+
+    def request(method, url, **kwargs):
+        dp_id = url.split('=')[1]
+        requested.append(dp_id)
+        extra = 'HIERARCH ESO DET CHIP = 2\n' if dp_id == 'dp2' else ''
+        content = HEADER_PAGE.format(exptime=dp_id[-1] + '.5', extra=extra)
+        return MockResponse(content=content.encode(), url=url)
+
+    monkeypatch.setattr(eso, '_request', request)
+    result = eso.get_headers(['dp1', 'dp2', 'dp1'])
+    assert sorted(requested) == ['dp1', 'dp2']
+    assert list(result['DP.ID']) == ['dp1', 'dp2', 'dp1']
+    assert list(result['EXPTIME']) == [1.5, 2.5, 1.5]
+    assert list(result['HIERARCH ESO DET CHIP']) == [0, 2, 0]
+    assert result.colnames[:3] == ['DP.ID', 'SIMPLE', 'BITPIX']
+
+    # Parsed headers are kept in memory
+    eso.get_headers(Column(['dp2', 'dp3']))
+    assert sorted(requested) == ['dp1', 'dp2', 'dp3']
+    eso.get_headers(['dp2'], cache=False)
+    assert sorted(requested) == ['dp1', 'dp2', 'dp2', 'dp3']
+
+    # Only the most recently used headers are kept
+    monkeypatch.setattr(eso, 'HEADER_CACHE_SIZE', 2)
+    requested.clear()
+    eso.get_headers(['dp1'])
+    eso.get_headers(['dp4'])
+    assert requested == ['dp4']
+    assert list(eso._headers_cache) == ['dp1', 'dp4']
+    eso.clear_cache()
+    assert len(eso._headers_cache) == 0
 
 
 def test_cached_file():
@@ -1,8 +1,9 @@
 """
 utils.py: helper functions for the astropy.eso module
 """
+import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from astropy.table import Table
 
 DEFAULT_LEAD_COLS_RAW = ['object', 'ra', 'dec', 'dp_id', 'date_obs', 'prog_id']
@@ -31,6 +32,67 @@ class _UserParams:
     authenticated: bool = False
 
 
+# Quoted FITS string value, where quotes are escaped by doubling them
+_FITS_STRING = re.compile(r"'((?:[^']|'')*)'")
+
+
+def _parse_header_cards(text: str) -> Dict[str, Any]:
+    """
+    Parse the ``KEY = VALUE / comment`` cards of a FITS header given as text,
+    up to the ``END`` card. Values are converted to bool, int, float or str
+    and ``COMMENT`` cards are dropped.
+    """
+    header = {}
+    for card in text.splitlines():
+        key, sep, value = card.partition('=')
+        if not sep:
+            if card.startswith('END'):
+                break
+            continue
+        key = key.strip()
+        if key.startswith('COMMENT'):
+            continue
+        value = value.lstrip()
+        if value.startswith("'"):
+            match = _FITS_STRING.match(value)
+            value = match.group(1).replace("''", "'") if match else value[1:]
+        else:
+            value = value.split('/', 1)[0].strip()
+            if not value:  # undefined value
+                continue
+            if value == 'T':
+                value = True
+            elif value == 'F':
+                value = False
+            else:
+                try:
+                    value = int(value)
+                except ValueError:
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        pass
+        header[key] = value
+    return header
+
+
+def _headers_to_table(headers: List[Dict[str, Any]], key_column: str, keys: List[str]) -> Table:
+    """
+    Build a table with one row per header and one column per keyword, built in
+    a single pass over the headers. Missing keywords are filled with the
+    default value of the type of the column.
+    """
+    nrows = len(headers)
+    columns = {key_column: list(keys)}
+    for row, header in enumerate(headers):
+        for key, value in header.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [type(value)()] * nrows
+            column[row] = value
+    return Table(columns)
+
+
 def _split_str_as_list_of_str(column_str: str):
     if column_str == '':
         column_list = []
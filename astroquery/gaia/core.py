@@ -175,7 +175,9 @@ class GaiaClass(TapPlus):
         Parameters
         ----------
         ids :  str, int, str list or int list, mandatory
-            List of identifiers
+            List of identifiers. With the 'INDIVIDUAL' data structure, lists of more than ``DATALINK_BATCH_SIZE``
+            identifiers are split into batches, which are retrieved concurrently and merged into a single set of
+            products
         data_release: str, optional, default None
             Data release from which data should be taken. E.g. 'Gaia DR3'. By default, it takes the current default one.
         data_structure: str, optional, default 'INDIVIDUAL'
@@ -298,9 +300,15 @@ class GaiaClass(TapPlus):
             if linking_parameter != 'SOURCE_ID':
                 params_dict['LINKING_PARAMETER'] = linking_parameter
 
+        batches = taputils.split_ids(ids, self.DATALINK_BATCH_SIZE)
+
         files = dict()
         try:
-            self.__gaiadata.load_data(params_dict=params_dict, output_file=output_file, verbose=verbose)
+            # Only individual products can be merged: the other structures put all the sources in the same files
+            if len(batches) <= 1 or str(data_structure).upper() != 'INDIVIDUAL':
+                self.__gaiadata.load_data(params_dict=params_dict, output_file=output_file, verbose=verbose)
+            else:
+                self.__load_data_batches(batches, params_dict=params_dict, output_file=output_file, verbose=verbose)
             files = Gaia.__get_data_files(output_file=output_file, path=path)
         except Exception as err:
             raise err
@@ -324,6 +332,38 @@ class GaiaClass(TapPlus):
 
         return files
 
+    def __load_data_batches(self, batches, *, params_dict, output_file, verbose=False):
+        """Retrieves the individual products of each batch of identifiers
+        concurrently, each one into its own zip file, and merges them into
+        output_file.
+        """
+        if verbose:
+            print(f"Retrieving data in {len(batches)} batches of up to {self.DATALINK_BATCH_SIZE} identifiers.")
+        part_files = [f"{output_file}.part{index + 1}" for index in range(len(batches))]
+
+        def load_batch(index):
+            batch_params_dict = dict(params_dict, ID=batches[index])
+            self.__gaiadata.load_data(params_dict=batch_params_dict, output_file=part_files[index], verbose=verbose)
+
+        try:
+            taputils.run_batches(load_batch, list(range(len(batches))), max_workers=self.DATALINK_MAX_WORKERS,
+                                 max_retries=self.DATALINK_MAX_RETRIES, description="DataLink batch")
+            names = set()
+            with zipfile.ZipFile(output_file, "w", compression=zipfile.ZIP_DEFLATED) as merged_zip:
+                for part_file in part_files:
+                    with zipfile.ZipFile(part_file, "r") as part_zip:
+                        for item in part_zip.infolist():
+                            # e.g. the products of an identifier given twice
+                            if item.filename in names:
+                                continue
+                            names.add(item.filename)
+                            with part_zip.open(item) as source, merged_zip.open(item.filename, "w") as target:
+                                shutil.copyfileobj(source, target)
+        finally:
+            for part_file in part_files:
+                if os.path.exists(part_file):
+                    os.remove(part_file)
+
     @staticmethod
     def __get_data_files(output_file, path):
         files = {}
@@ -15,6 +15,7 @@ Created on 30 jun. 2016
 
 """
 import datetime
+import io
 import os
 import zipfile
 from pathlib import Path
@@ -1281,6 +1282,43 @@ def test_load_data_linking_parameter(monkeypatch, tmp_path, patch_datetime_now):
     path.unlink()
 
 
+def test_load_data_batches(monkeypatch):
+    requested_ids = []
+
+    def load_data_monkeypatched(self, params_dict, output_file, verbose):
+        assert params_dict["RETRIEVAL_TYPE"] == "EPOCH_PHOTOMETRY"
+        requested_ids.append(params_dict["ID"])
+        with zipfile.ZipFile(output_file, "w") as zip_file:
+            if params_dict["DATA_STRUCTURE"] == "INDIVIDUAL":
+                for source_id in params_dict["ID"].split(","):
+                    product = io.StringIO()
+                    Table({'source_id': [int(source_id)]}).write(product, format='ascii.ecsv')
+                    zip_file.writestr(f"EPOCH_PHOTOMETRY-Gaia DR3 {source_id}.ecsv", product.getvalue())
+            else:
+                product = io.StringIO()
+                Table({'source_id': [int(source_id) for source_id in params_dict["ID"].split(",")]}).write(
+                    product, format='ascii.ecsv')
+                zip_file.writestr("EPOCH_PHOTOMETRY_RAW.ecsv", product.getvalue())
+
+    monkeypatch.setattr(TapPlus, "load_data", load_data_monkeypatched)
+    monkeypatch.setattr(GAIA_QUERIER, "DATALINK_BATCH_SIZE", 2)
+
+    result = GAIA_QUERIER.load_data(ids=[1, 2, 3, 4, 5], retrieval_type="EPOCH_PHOTOMETRY")
+
+    assert sorted(requested_ids) == ["1,2", "3,4", "5"]
+    assert len(result) == 5
+    for source_id in range(1, 6):
+        assert result[f"EPOCH_PHOTOMETRY-Gaia DR3 {source_id}.ecsv"][0]['source_id'][0] == source_id
+
+    # The products of the other data structures hold all the sources: they are retrieved in a single request
+    requested_ids.clear()
+    result = GAIA_QUERIER.load_data(ids=[1, 2, 3, 4, 5], retrieval_type="EPOCH_PHOTOMETRY", data_structure="RAW")
+
+    assert requested_ids == ["1,2,3,4,5"]
+    assert list(result) == ["EPOCH_PHOTOMETRY_RAW.ecsv"]
+    assert len(result["EPOCH_PHOTOMETRY_RAW.ecsv"][0]) == 5
+
+
 @pytest.mark.parametrize("linking_param", ['TRANSIT_ID', 'IMAGE_ID'])
 def test_load_data_linking_parameter_with_values(monkeypatch, tmp_path, linking_param, patch_datetime_now):
     assert datetime.datetime.now(datetime.timezone.utc) == FAKE_TIME
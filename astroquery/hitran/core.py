@@ -1,3 +1,4 @@
+import numpy as np
 from astropy.table import Table
 from astropy import units as u
 
@@ -226,25 +227,41 @@ class HitranClass(BaseQuery):
     def _parse_result(self, response, *, verbose=False):
         """
         Parse a response into an `~astropy.table.Table`
+
+        The fixed-width records are read in a single pass into a NumPy
+        structured array of byte strings, whose numeric fields are then
+        converted column by column.
         """
         formats = parse_readme(self.FORMATFILE)
-
-        dtypes = [entry['dtype'] for entry in formats.values()]
-
-        rows = []
-        for line in response.text.split('\n'):
-            if line.strip():
-                row = []
-                start = 0
-                for key, entry in formats.items():
-                    formatter = entry['formatter']
-                    length = entry['length']
-                    value = formatter(line[start:start+length])
-                    row.append(value)
-                    start = start + length
-                rows.append(row)
-
-        result = Table(rows=rows, names=formats.keys(), dtype=dtypes)
+        record_length = sum(entry['length'] for entry in formats.values())
+        record_dtype = [(name, f"S{entry['length']}") for name, entry in formats.items()]
+        record_dtype.append(('newline', 'S1'))
+
+        text = response.text
+        data = text.encode('ascii', 'replace')
+        if not data.endswith(b'\n'):
+            data += b'\n'
+        records = None
+        if len(data) % (record_length + 1) == 0:
+            records = np.frombuffer(data, dtype=record_dtype)
+            if not np.all(records['newline'] == b'\n'):
+                records = None
+        if records is None:
+            # Irregular response (blank or short lines, other line endings):
+            # normalize the records before reading them
+            lines = [line.ljust(record_length)[:record_length]
+                     for line in text.splitlines() if line.strip()]
+            data = ''.join(line + '\n' for line in lines).encode('ascii', 'replace')
+            records = np.frombuffer(data, dtype=record_dtype)
+
+        columns = []
+        for name, entry in formats.items():
+            column = records[name]
+            if entry['formatter'] is not str:
+                column = column.astype(entry['formatter']).astype(entry['dtype'])
+            columns.append(column)
+
+        result = Table(columns, names=list(formats.keys()))
 
         return result
 
@@ -6,6 +6,7 @@ from astropy import units as u
 from astropy.table import Table
 
 from ...hitran import Hitran
+from ...utils.mocks import MockResponse
 
 HITRAN_DATA = 'H2O.data'
 
@@ -52,3 +53,20 @@ def test_query():
                                    'line_mixing_flag', 'gp', 'gpp'])
     assert tbl['molec_id'][0] == 1
     np.testing.assert_almost_equal(tbl['nu'][0], 0.072059)
+
+
+def test_parse_result_dtypes():
+    hitran = Hitran()
+    response = MockResponseHitran()
+    tbl = hitran._parse_result(response)
+    assert tbl['molec_id'].dtype == np.int32
+    assert tbl['nu'].dtype == np.float32
+    assert tbl['global_upper_quanta'].dtype == np.dtype('S15')
+    assert tbl['global_upper_quanta'][0] == '          0 1 0'
+    np.testing.assert_almost_equal(tbl['gpp'][0], 11.0)
+
+    # Other line endings and blank lines are parsed the same way
+    irregular = MockResponse(content=('\n' + response.text.replace('\n', '\r\n') + '\n').encode())
+    irregular_tbl = hitran._parse_result(irregular)
+    assert irregular_tbl.dtype == tbl.dtype
+    assert np.all(irregular_tbl == tbl)
@@ -2,16 +2,20 @@
 import numpy as np
 import requests
 import os
+import shutil
 
 from bs4 import BeautifulSoup
 import astropy.units as u
 from astropy import table
 from astropy.io import ascii
+from astroquery import cache_conf
 from astroquery.query import BaseQuery
 # import configurable items declared in __init__.py
 from astroquery.linelists.cdms import conf
 from astroquery.exceptions import InvalidQueryError, EmptyResponseError
-from astroquery.linelists.core import parse_letternumber, parse_molid
+from astroquery.linelists.core import parse_letternumber, parse_molid  # noqa: F401
+from astroquery.linelists.core import (parse_letternumber_array, read_card_images,
+                                       read_table_cache, write_table_cache)
 from astroquery.utils import process_asyncs
 from astroquery import log
 
@@ -47,6 +51,11 @@ class CDMSClass(BaseQuery):
         """
         super().__init__()
 
+    def clear_cache(self):
+        """Removes all cache files, including the parsed catalogs."""
+        super().clear_cache()
+        shutil.rmtree(os.path.join(self.cache_location, 'parsed'), ignore_errors=True)
+
     def _mol_to_payload(self, molecule, *, parse_name_locally=False, flags=0):
         if parse_name_locally:
             self.lookup_ids = build_lookup()
@@ -368,9 +377,7 @@ class CDMSClass(BaseQuery):
                     fix_keys.append(qnind)
             for key in fix_keys:
                 if not np.issubdtype(result[key].dtype, np.integer):
-                    intcol = np.array(list(map(parse_letternumber, result[key])),
-                                      dtype=int)
-                    result[key] = intcol
+                    result[key] = parse_letternumber_array(result[key])
 
             # if there is a crash at this step, something went wrong with the query
             # and the _last_query_temperature was not set.  This shouldn't ever
@@ -485,7 +492,7 @@ class CDMSClass(BaseQuery):
 
         return result
 
-    def get_molecule(self, molecule_id, *, cache=True, return_response=False):
+    def get_molecule(self, molecule_id, *, cache=True, return_response=False, cache_parsed=False):
         """
         Retrieve the whole molecule table for a given molecule id
 
@@ -501,22 +508,37 @@ class CDMSClass(BaseQuery):
             If True, return the raw `requests.Response` object instead of parsing
             the response.  If this is set, the response will be returned whether
             or not it was successful.  Default is False.
+        cache_parsed : bool, optional
+            If True, the parsed catalog is also saved in a binary file in the
+            cache directory, and later calls for the same molecule load this
+            file instead of parsing the catalog again.  With ``cache=False``,
+            the catalog is retrieved and parsed again and the file is replaced.
+            The file expires after the astroquery cache timeout and is removed
+            by ``clear_cache``.  Default is False.
         """
         molecule_id = parse_molid(molecule_id)
 
-        url = f'{self.CLASSIC_URL}/entries/c{molecule_id}.cat'
-        response = self._request(method='GET', url=url,
-                                 timeout=self.TIMEOUT, cache=cache)
+        parsed_cache_file = os.path.join(self.cache_location, 'parsed', f'c{molecule_id}.npz')
+        result = None
+        if cache_parsed and cache and not return_response:
+            result = read_table_cache(parsed_cache_file, timeout=cache_conf.cache_timeout)
 
-        if return_response:
-            return response
+        if result is None:
+            url = f'{self.CLASSIC_URL}/entries/c{molecule_id}.cat'
+            response = self._request(method='GET', url=url,
+                                     timeout=self.TIMEOUT, cache=cache)
 
-        response.raise_for_status()
+            if return_response:
+                return response
 
-        if 'Zero lines were found' in response.text:
-            raise EmptyResponseError(f"Response was empty; message was '{response.text}'.")
+            response.raise_for_status()
+
+            if 'Zero lines were found' in response.text:
+                raise EmptyResponseError(f"Response was empty; message was '{response.text}'.")
 
-        result = self._parse_cat(response.text)
+            result = self._parse_cat(response.text)
+            if cache_parsed:
+                write_table_cache(result, parsed_cache_file)
 
         species_table = self.get_species_table()
         result.meta = dict(species_table.loc[int(molecule_id)])
@@ -568,16 +590,14 @@ class CDMSClass(BaseQuery):
                   'Q14': 81,
                   }
 
-        result = ascii.read(text, header_start=None, data_start=0,
-                            comment=r'THIS|^\s{12,14}\d{4,6}.*',
-                            names=list(starts.keys()),
-                            col_starts=list(starts.values()),
-                            format='fixed_width', fast_reader=False)
+        result = read_card_images(text, names=list(starts.keys()),
+                                  col_starts=list(starts.values()),
+                                  comment=r'THIS|^\s{12,14}\d{4,6}.*')
 
         # Ensure TAG is integer type for computation
         # int truncates - which is what we want
         result['TAG'] = result['TAG'].astype(int)
-        result['MOLWT'] = [int(x/1e3) for x in result['TAG']]
+        result['MOLWT'] = (result['TAG'] / 1e3).astype(int)
 
         result['FREQ'].unit = u.MHz
         result['ERR'].unit = u.MHz
@@ -592,9 +612,8 @@ class CDMSClass(BaseQuery):
         log.debug(f"fix_keys: {fix_keys} should include Q1, Q2, ..., Q14 and GUP")
         for key in fix_keys:
             if not np.issubdtype(result[key].dtype, np.integer):
-                intcol = np.array(list(map(parse_letternumber, result[key])),
-                                  dtype=int)
-                if any(intcol == -999999):
+                intcol = parse_letternumber_array(result[key])
+                if np.any(intcol == -999999):
                     intcol = np.ma.masked_where(intcol == -999999, intcol)
                 result[key] = intcol
                 if not np.issubdtype(result[key].dtype, np.integer):
@@ -5,7 +5,8 @@ import os
 
 from astropy import units as u
 from astropy.table import Table
-from astroquery.linelists.cdms.core import CDMS, parse_letternumber, build_lookup
+from astroquery.linelists.cdms.core import CDMS, CDMSClass, parse_letternumber, build_lookup
+from astroquery.linelists.core import LocalLineDatabase, parse_letternumber_array
 from astroquery.utils.mocks import MockResponse
 from astroquery.exceptions import InvalidQueryError
 
@@ -116,6 +117,15 @@ def test_parseletternumber():
     assert parse_letternumber(np.ma.masked) == -999999
 
 
+def test_parseletternumber_array():
+    values = np.ma.MaskedArray(['A0', 'Z9', 'a0', 'b0', '12', '-3', ' 7', ''],
+                               mask=[False] * 7 + [True])
+    expected = [parse_letternumber(st) for st in values]
+    np.testing.assert_array_equal(parse_letternumber_array(values), expected)
+    # letters beyond the leading character fall back to the scalar parser
+    np.testing.assert_array_equal(parse_letternumber_array(['ZZ', '11']), [3535, 11])
+
+
 def test_hc7s(patch_post):
     """
     Test for a very complicated molecule
@@ -331,3 +341,52 @@ def test_malformatted_with_parse_name_locally_and_fallback_error():
                          molecule='NOTREALMOLECULE',
                          parse_name_locally=True,
                          fallback_to_getmolecule=True)
+
+
+def test_get_molecule_cache_parsed(monkeypatch, tmp_path):
+    cdms = CDMSClass()
+    cdms.cache_location = tmp_path
+    monkeypatch.setattr(cdms, '_request', mockreturn)
+    tbl = cdms.get_molecule('058501', cache_parsed=True)
+    assert (tmp_path / 'parsed' / 'c058501.npz').exists()
+
+    # the second call must not need to retrieve the catalog again
+    monkeypatch.setattr(cdms, '_request', None)
+    cached = cdms.get_molecule('058501', cache_parsed=True)
+    assert cached.colnames == tbl.colnames
+    for name in tbl.colnames:
+        assert cached[name].dtype == tbl[name].dtype
+        assert cached[name].unit == tbl[name].unit
+        np.testing.assert_array_equal(cached[name], tbl[name])
+    assert cached.meta['tag'] == tbl.meta['tag']
+
+    cdms.clear_cache()
+    assert not (tmp_path / 'parsed' / 'c058501.npz').exists()
+
+
+def test_local_line_database(monkeypatch, tmp_path):
+    cdms = CDMSClass()
+    monkeypatch.setattr(cdms, '_request', mockreturn)
+    linedb = LocalLineDatabase(cdms, location=tmp_path)
+    assert linedb.species == []
+    linedb.add_species(58501)
+    assert linedb.species == ['058501']
+
+    # a new database in the same directory works offline
+    monkeypatch.setattr(cdms, '_request', None)
+    linedb = LocalLineDatabase(cdms, location=tmp_path)
+    tbl = linedb.query_lines(300 * u.MHz, 0.7 * u.GHz, molecule='058501 H2C2S')
+    assert list(tbl['FREQ']) == [344.8868, 689.7699]
+    assert tbl['FREQ'].unit == u.MHz
+    tbl = linedb.query_lines(None, None)
+    assert len(tbl) == 3
+    tbl = linedb.query_lines(300 * u.MHz, None, min_strength=-9.6)
+    assert list(tbl['FREQ']) == [689.7699]
+
+    with pytest.raises(InvalidQueryError, match="not in the local line database"):
+        linedb.query_lines(100 * u.GHz, 200 * u.GHz, molecule='028503')
+
+    linedb.remove_species('058501')
+    assert linedb.species == []
+    with pytest.raises(InvalidQueryError, match="is empty"):
+        linedb.query_lines(100 * u.GHz, 200 * u.GHz)
@@ -2,8 +2,17 @@
 """
 Base classes and common utilities for linelist queries (JPLSpec, CDMS, etc.)
 """
-import numpy as np
+import json
+import os
+import re
 import string
+import time
+
+import numpy as np
+from astropy import units as u
+from astropy.table import Column, MaskedColumn, Table, vstack
+
+from astroquery.exceptions import InvalidQueryError
 
 
 def parse_letternumber(st):
@@ -31,6 +40,206 @@ def parse_letternumber(st):
     return int(newst)
 
 
+def parse_letternumber_array(values):
+    """
+    Vectorized version of `parse_letternumber` for a column of quantum numbers.
+
+    The letter-coded values (e.g. ``A0`` for 100 or ``a0`` for -10) are
+    decoded with array operations. Masked or blank values are converted to
+    -999999.
+
+    Parameters
+    ----------
+    values : array-like of str or int
+        The quantum numbers, as found in the catalog files.
+
+    Returns
+    -------
+    numbers : `~numpy.ndarray` of int
+    """
+    if np.ma.isMaskedArray(values):
+        mask = np.ma.getmaskarray(values)
+        values = np.ma.getdata(values)
+    else:
+        mask = None
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        numbers = values.astype(int)
+        if mask is not None:
+            numbers[mask] = -999999
+        return numbers
+
+    values = np.char.strip(values.astype(str))
+    blank = values == ''
+    if mask is not None:
+        blank |= mask
+    numbers = np.full(values.shape, -999999, dtype=int)
+    if blank.all():
+        return numbers
+
+    # Only the leading character of a quantum number may be a letter
+    width = max(values.dtype.itemsize // 4, 1)
+    chars = np.ascontiguousarray(values, dtype=f'U{width}').view(np.uint32).reshape(values.shape + (width,))
+    lead = chars[..., 0]
+    upper = (lead >= ord('A')) & (lead <= ord('Z')) & ~blank
+    lower = (lead >= ord('a')) & (lead <= ord('z')) & ~blank
+    letter = upper | lower
+    try:
+        plain = ~blank & ~letter
+        numbers[plain] = values[plain].astype(int)
+        if letter.any():
+            # Replace the letter by a 0 to parse the remaining digits
+            chars = chars.copy()
+            chars[..., 0][letter] = ord('0')
+            remainder = chars.view(f'U{width}').reshape(values.shape)[letter].astype(int)
+            scale = 10 ** (np.char.str_len(values[letter]) - 1)
+            lead_value = np.where(upper[letter], lead[letter] - ord('A') + 10, lead[letter] - ord('a') + 1)
+            numbers[letter] = np.where(upper[letter], 1, -1) * (lead_value * scale + remainder)
+    except ValueError:
+        # Letters elsewhere than in the leading character
+        numbers[~blank] = [parse_letternumber(st) for st in values[~blank]]
+    return numbers
+
+
+def split_quantum_numbers(values, qnlen):
+    """
+    Split a column of concatenated two-character quantum numbers.
+
+    Each value is right-justified to ``qnlen`` characters before being split,
+    so that all the values keep the shape of the original card images.
+
+    Parameters
+    ----------
+    values : array-like of str
+        The quantum numbers of each line, e.g. ``' 6 1 6 0'``.
+    qnlen : int
+        The number of characters used by the quantum numbers.
+
+    Returns
+    -------
+    quantum_numbers : list of `~numpy.ndarray`
+        The ``qnlen // 2`` quantum numbers of each line, as stripped strings.
+    """
+    values = np.char.rjust(np.ma.getdata(values).astype(str), qnlen)
+    width = values.dtype.itemsize // 4
+    chars = np.ascontiguousarray(values).view(np.uint32).reshape(len(values), width)
+    return [np.char.strip(np.ascontiguousarray(chars[:, ii:ii + 2]).view('U2').ravel())
+            for ii in range(0, qnlen - 1, 2)]
+
+
+def read_card_images(text, names, col_starts, *, comment=None):
+    """
+    Read fixed-width card images (e.g. catalog files) into a table.
+
+    This is equivalent to reading ``text`` with `astropy.io.ascii.read` and
+    ``format='fixed_width'``, but all the lines are split into fields at once
+    through a NumPy structured array. Each column is converted to int, float
+    or str, whichever comes first to convert all its values, and blank values
+    are masked.
+
+    Parameters
+    ----------
+    text : str
+        The card images, one per line.
+    names : list of str
+        The names of the columns.
+    col_starts : list of int
+        The position of the first character of each column. The last column
+        extends to the end of the line.
+    comment : str, optional
+        Regular expression matching the comment lines, which are skipped.
+
+    Returns
+    -------
+    table : `~astropy.table.Table`
+    """
+    comment = re.compile(comment) if comment else None
+    lines = [line for line in text.splitlines()
+             if line.strip() and not (comment and comment.match(line))]
+    width = max(max(map(len, lines), default=0), col_starts[-1] + 1)
+    data = ''.join(line.ljust(width) for line in lines)
+    # Plain ASCII catalogs are read as bytes, which are much faster to convert
+    if data.isascii():
+        kind, data = 'S', data.encode('ascii')
+    else:
+        kind, data = 'U', data.encode('utf-32-le')
+    ends = list(col_starts[1:]) + [width]
+    record_dtype = [(name, f'{kind}{end - start}') for name, start, end in zip(names, col_starts, ends)]
+    if col_starts[0] > 0:
+        record_dtype.insert(0, ('', f'{kind}{col_starts[0]}'))
+    records = np.frombuffer(data, dtype=np.dtype(record_dtype).newbyteorder('<'))
+
+    columns = []
+    for name in names:
+        values = np.char.strip(records[name])
+        blank = np.char.str_len(values) == 0
+        has_blanks = blank.any()
+        for converter in (int, float):
+            try:
+                if has_blanks:
+                    column = np.zeros(len(values), dtype=converter)
+                    column[~blank] = values[~blank].astype(converter)
+                else:
+                    column = values.astype(converter)
+            except (ValueError, OverflowError):
+                continue
+            break
+        else:
+            column = values.astype(f'U{max(np.char.str_len(values).max(initial=0), 1)}')
+        if has_blanks:
+            columns.append(MaskedColumn(column, name=name, mask=blank))
+        else:
+            columns.append(Column(column, name=name))
+    return Table(columns)
+
+
+def write_table_cache(table, filename):
+    """
+    Save ``table`` to ``filename`` as a (binary) NumPy ``.npz`` file, which
+    `read_table_cache` loads back much faster than the original catalog can be
+    parsed. The masks and units of the columns are preserved.
+    """
+    arrays = {}
+    units = []
+    for ii, name in enumerate(table.colnames):
+        column = table[name]
+        arrays[f'col{ii}'] = np.asarray(np.ma.getdata(column))
+        if isinstance(column, MaskedColumn):
+            arrays[f'mask{ii}'] = np.ma.getmaskarray(column)
+        units.append(column.unit.to_string() if column.unit is not None else None)
+    arrays['names'] = np.array(table.colnames)
+    arrays['units'] = np.array(json.dumps(units))
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp_filename = f'{filename}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_filename, **arrays)
+    os.replace(tmp_filename, filename)
+
+
+def read_table_cache(filename, *, timeout=-1):
+    """
+    Load a table saved by `write_table_cache`, or return `None` if
+    ``filename`` does not exist, can't be read or was written more than
+    ``timeout`` seconds ago. ``-1`` (default) means the file never expires.
+    """
+    try:
+        if timeout != -1 and time.time() - os.path.getmtime(filename) > timeout:
+            return None
+        with np.load(filename, allow_pickle=False) as arrays:
+            names = list(arrays['names'])
+            units = json.loads(str(arrays['units']))
+            columns = []
+            for ii, (name, unit) in enumerate(zip(names, units)):
+                unit = u.Unit(unit) if unit is not None else None
+                if f'mask{ii}' in arrays:
+                    columns.append(MaskedColumn(arrays[f'col{ii}'], name=name, unit=unit,
+                                                mask=arrays[f'mask{ii}']))
+                else:
+                    columns.append(Column(arrays[f'col{ii}'], name=name, unit=unit))
+    except (OSError, KeyError, ValueError):
+        return None
+    return Table(columns)
+
+
 def parse_molid(mol_id):
     """
     Parse molecule ID to ensure it is a zero-padded 6-character string.
@@ -70,3 +279,154 @@ def parse_molid(mol_id):
         raise ValueError("molecule_id should be an integer or a length-6 string of numbers")
 
     return molecule_str
+
+
+class LocalLineDatabase:
+    """
+    Local copy of the catalogs of selected species, to query lines without
+    connecting to the service.
+
+    The catalog of each species, as returned by ``get_molecule``, is saved
+    sorted by frequency in a binary file, so that the lines in a frequency
+    range are found with a binary search.
+
+    Parameters
+    ----------
+    service : `~astroquery.linelists.cdms.CDMSClass` or `~astroquery.linelists.jplspec.JPLSpecClass`
+        The service the catalogs are retrieved from.
+    location : str, optional
+        The directory of the database. Defaults to a ``linedb`` directory in
+        the cache directory of ``service``.
+
+    Examples
+    --------
+    >>> import astropy.units as u
+    >>> from astroquery.linelists.cdms import CDMS
+    >>> from astroquery.linelists.core import LocalLineDatabase
+    >>> linedb = LocalLineDatabase(CDMS)
+    >>> linedb.add_species(['028503', '044501'])  # doctest: +REMOTE_DATA
+    >>> table = linedb.query_lines(100*u.GHz, 400*u.GHz)  # doctest: +REMOTE_DATA
+    """
+
+    def __init__(self, service, *, location=None):
+        self.service = service
+        if location is None:
+            location = os.path.join(service.cache_location, 'linedb')
+        self.location = location
+        self._tables = {}
+
+    @property
+    def species(self):
+        """
+        The 6-digit identifiers of the species in the database.
+        """
+        if not os.path.isdir(self.location):
+            return []
+        return sorted(name[1:7] for name in os.listdir(self.location)
+                      if re.fullmatch(r'c\d{6}\.npz', name))
+
+    def _filename(self, molecule_id):
+        return os.path.join(self.location, f'c{molecule_id}.npz')
+
+    def _get_table(self, molecule_id):
+        if molecule_id not in self._tables:
+            table = read_table_cache(self._filename(molecule_id))
+            if table is None:
+                raise InvalidQueryError(f"Molecule {molecule_id} is not in the local line database. "
+                                        "Add it with add_species first.")
+            self._tables[molecule_id] = table
+        return self._tables[molecule_id]
+
+    def add_species(self, molecules, *, cache=True):
+        """
+        Retrieve the catalogs of ``molecules`` with ``get_molecule`` and add
+        them to the database, replacing those already present.
+
+        Parameters
+        ----------
+        molecules : int, str or list
+            The molecule identifiers, as accepted by ``get_molecule``.
+        cache : bool
+            Defaults to True. If set overrides global caching behavior.
+        """
+        if isinstance(molecules, (str, int, np.integer)):
+            molecules = [molecules]
+        for molecule in molecules:
+            molecule_id = parse_molid(molecule)
+            table = self.service.get_molecule(molecule_id, cache=cache)
+            table.sort('FREQ')
+            table.meta = {}
+            write_table_cache(table, self._filename(molecule_id))
+            self._tables[molecule_id] = table
+
+    def remove_species(self, molecules):
+        """
+        Remove the catalogs of ``molecules`` from the database.
+
+        Parameters
+        ----------
+        molecules : int, str or list
+            The molecule identifiers.
+        """
+        if isinstance(molecules, (str, int, np.integer)):
+            molecules = [molecules]
+        for molecule in molecules:
+            molecule_id = parse_molid(molecule)
+            self._tables.pop(molecule_id, None)
+            if os.path.exists(self._filename(molecule_id)):
+                os.remove(self._filename(molecule_id))
+
+    def query_lines(self, min_frequency, max_frequency, *, min_strength=-500, molecule='All'):
+        """
+        Query the lines of the species in the database.
+
+        Parameters
+        ----------
+        min_frequency : `astropy.units.Quantity` or None
+            Minimum frequency (or any spectral() equivalent).
+            ``None`` can be interpreted as zero.
+        max_frequency : `astropy.units.Quantity` or None
+            Maximum frequency (or any spectral() equivalent).
+            ``None`` can be interpreted as infinite.
+        min_strength : float, optional
+            Minimum strength (``LGINT``) in catalog units, the default is -500.
+        molecule : int, str or list, optional
+            Identifiers of the molecules to search for, which must have been
+            added with `add_species`. Default is 'All', which searches all the
+            species in the database.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            The lines sorted by frequency, with the columns of the tables
+            returned by ``get_molecule``.
+        """
+        if isinstance(molecule, str) and molecule == 'All':
+            molecule_ids = self.species
+            if not molecule_ids:
+                raise InvalidQueryError("The local line database is empty. Add species with add_species first.")
+        elif isinstance(molecule, (str, int, np.integer)):
+            molecule_ids = [parse_molid(molecule)]
+        else:
+            molecule_ids = [parse_molid(mol) for mol in molecule]
+
+        low = -np.inf if min_frequency is None else min_frequency.to(u.MHz, u.spectral()).value
+        high = np.inf if max_frequency is None else max_frequency.to(u.MHz, u.spectral()).value
+        if low > high:
+            raise InvalidQueryError("min_frequency must be less than max_frequency")
+
+        tables = []
+        for molecule_id in molecule_ids:
+            table = self._get_table(molecule_id)
+            start = np.searchsorted(table['FREQ'], low, side='left')
+            stop = np.searchsorted(table['FREQ'], high, side='right')
+            table = table[start:stop]
+            if min_strength is not None:
+                table = table[table['LGINT'] >= min_strength]
+            tables.append(table)
+
+        if len(tables) == 1:
+            return tables[0]
+        result = vstack(tables, metadata_conflicts='silent')
+        result.sort('FREQ')
+        return result
@@ -1,13 +1,16 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import os
+import shutil
 import warnings
 
 import astropy.units as u
 import numpy as np
 from astropy.io import ascii
 from astropy import table
+from astroquery import cache_conf
 from astroquery.query import BaseQuery
-from astroquery.linelists.core import parse_letternumber, parse_molid
+from astroquery.linelists.core import (parse_letternumber_array, parse_molid, read_card_images,
+                                       read_table_cache, split_quantum_numbers, write_table_cache)
 # import configurable items declared in __init__.py
 from astroquery.linelists.jplspec import conf, lookup_table
 from astroquery.exceptions import EmptyResponseError, InvalidQueryError
@@ -33,6 +36,11 @@ class JPLSpecClass(BaseQuery):
     def __init__(self):
         super().__init__()
 
+    def clear_cache(self):
+        """Removes all cache files, including the parsed catalogs."""
+        super().clear_cache()
+        shutil.rmtree(os.path.join(self.cache_location, 'parsed'), ignore_errors=True)
+
     def query_lines_async(self, min_frequency, max_frequency, *,
                           min_strength=-500,
                           max_lines=2000, molecule='All', flags=0,
@@ -335,7 +343,7 @@ class JPLSpecClass(BaseQuery):
 
         return result
 
-    def get_molecule(self, molecule_id, *, cache=True):
+    def get_molecule(self, molecule_id, *, cache=True, cache_parsed=False):
         """
         Retrieve the whole molecule table for a given molecule id from the JPL catalog.
 
@@ -346,6 +354,13 @@ class JPLSpecClass(BaseQuery):
             or a zero-padded 6-character string (e.g., '018003').
         cache : bool
             Defaults to True. If set overrides global caching behavior.
+        cache_parsed : bool, optional
+            If True, the parsed catalog is also saved in a binary file in the
+            cache directory, and later calls for the same molecule load this
+            file instead of parsing the catalog again.  With ``cache=False``,
+            the catalog is retrieved and parsed again and the file is replaced.
+            The file expires after the astroquery cache timeout and is removed
+            by ``clear_cache``.  Default is False.
 
         Returns
         -------
@@ -359,19 +374,27 @@ class JPLSpecClass(BaseQuery):
         """
         molecule_str = parse_molid(molecule_id)
 
-        # Construct the URL to the catalog file
-        url = f'{self.FTP_CAT_URL}/c{molecule_str}.cat'
+        parsed_cache_file = os.path.join(self.cache_location, 'parsed', f'c{molecule_str}.npz')
+        result = None
+        if cache_parsed and cache:
+            result = read_table_cache(parsed_cache_file, timeout=cache_conf.cache_timeout)
 
-        # Request the catalog file
-        response = self._request(method='GET', url=url,
-                                 timeout=self.TIMEOUT, cache=cache)
-        response.raise_for_status()
+        if result is None:
+            # Construct the URL to the catalog file
+            url = f'{self.FTP_CAT_URL}/c{molecule_str}.cat'
+
+            # Request the catalog file
+            response = self._request(method='GET', url=url,
+                                     timeout=self.TIMEOUT, cache=cache)
+            response.raise_for_status()
 
-        if 'The requested URL was not found on this server.' in response.text:
-            raise EmptyResponseError(f"No data found for molecule ID {molecule_id}.")
+            if 'The requested URL was not found on this server.' in response.text:
+                raise EmptyResponseError(f"No data found for molecule ID {molecule_id}.")
 
-        # Parse the catalog file
-        result = self._parse_cat(response)
+            # Parse the catalog file
+            result = self._parse_cat(response)
+            if cache_parsed:
+                write_table_cache(result, parsed_cache_file)
 
         # Add metadata from species table
         species_table = self.get_species_table()
@@ -413,12 +436,10 @@ class JPLSpecClass(BaseQuery):
 
         # Parse the catalog file with fixed-width format
         # Format: FREQ(13.4), ERR(8.4), LGINT(8.4), DR(2), ELO(10.4), GUP(3), TAG(7), QNFMT(4), QN'(12), QN"(12)
-        result = ascii.read(text, header_start=None, data_start=0,
-                            comment=r'THIS|^\s{12,14}\d{4,6}.*',
-                            names=('FREQ', 'ERR', 'LGINT', 'DR', 'ELO', 'GUP',
-                                   'TAG', 'QNFMT', 'QN\'', 'QN"'),
-                            col_starts=(0, 13, 21, 29, 31, 41, 44, 51, 55, 67),
-                            format='fixed_width', fast_reader=False)
+        result = read_card_images(text, names=('FREQ', 'ERR', 'LGINT', 'DR', 'ELO', 'GUP',
+                                               'TAG', 'QNFMT', 'QN\'', 'QN"'),
+                                  col_starts=(0, 13, 21, 29, 31, 41, 44, 51, 55, 67),
+                                  comment=r'THIS|^\s{12,14}\d{4,6}.*')
 
         # Ensure TAG is integer type
         result['TAG'] = result['TAG'].astype(int)
@@ -437,19 +458,20 @@ class JPLSpecClass(BaseQuery):
         # pm_is_ok should be True when the QN columns contain '+' or '-'.
         # (can't do a str check on np.integer dtype so have to filter that out first)
         pm_is_ok = ((not np.issubdtype(result["QN'"].dtype, np.integer))
-                    and any(('+' in str(line) or '-' in str(line)) for line in result["QN'"]))
-
-        def int_or_pm(st):
-            try:
-                return int(st)
-            except ValueError:
-                try:
-                    return parse_letternumber(st)
-                except ValueError:
-                    if pm_is_ok and (st.strip() == '' or st.strip() == '+' or st.strip() == '-'):
-                        return st.strip()
-                    else:
-                        raise ValueError(f'"{st}" is not a valid +/-/blank entry')
+                    and bool(np.ma.is_masked(result["QN'"])
+                             or np.any(np.char.count(np.ma.getdata(result["QN'"]).astype(str), '+')
+                                       + np.char.count(np.ma.getdata(result["QN'"]).astype(str), '-'))))
+
+        def int_or_pm(values):
+            # vectorized version of: int, else letter-coded number, else +/-/blank
+            numbers = parse_letternumber_array(np.where(np.isin(values, ('+', '-')), '', values))
+            pm = numbers == -999999
+            if not pm.any():
+                return numbers
+            if not pm_is_ok:
+                raise ValueError(f'"{values[pm][0]}" is not a valid +/-/blank entry')
+            return np.array([str(number) if not is_pm else value
+                             for number, value, is_pm in zip(numbers, values, pm)], dtype=object)
 
         # At least this molecule, NH, claims 5 QNs but has only 4
         bad_qnfmt_dict = {
@@ -467,28 +489,29 @@ class JPLSpecClass(BaseQuery):
                 n_qns = tbl['QNFMT'][0] % 10
             if n_qns > 1:
                 qnlen = 2 * n_qns
-                for ii in range(n_qns):
-                    if tbl["QN'"].dtype in (int, np.int32, np.int64):
-                        # for the case where it was already parsed as int
-                        # (53005 is an example)
+                if tbl["QN'"].dtype in (int, np.int32, np.int64):
+                    # for the case where it was already parsed as int
+                    # (53005 is an example)
+                    for ii in range(n_qns):
                         tbl[f"QN'{ii+1}"] = tbl["QN'"]
                         tbl[f'QN"{ii+1}'] = tbl['QN"']
-                    else:
-                        # string parsing can truncate to length=2n or 2n-1 depending
-                        # on whether there are any two-digit QNs in the column
-                        ind1 = ii * 2
-                        ind2 = ii * 2 + 2
-                        # rjust(qnlen) is needed to enforce that all strings retain their exact original shape
-                        qnp = [int_or_pm(line.rjust(qnlen)[ind1: ind2].strip()) for line in tbl['QN\'']]
-                        qnpp = [int_or_pm(line.rjust(qnlen)[ind1: ind2].strip()) for line in tbl['QN"']]
-                        dtype = str if any('+' in str(x) for x in qnp) else int
-                        tbl[f"QN'{ii+1}"] = np.array(qnp, dtype=dtype)
-                        tbl[f'QN"{ii+1}'] = np.array(qnpp, dtype=dtype)
+                else:
+                    # string parsing can truncate to length=2n or 2n-1 depending
+                    # on whether there are any two-digit QNs in the column
+                    # rjust(qnlen) is needed to enforce that all strings retain their exact original shape
+                    qnps = split_quantum_numbers(tbl['QN\''], qnlen)
+                    qnpps = split_quantum_numbers(tbl['QN"'], qnlen)
+                    for ii in range(n_qns):
+                        qnp = int_or_pm(qnps[ii])
+                        qnpp = int_or_pm(qnpps[ii])
+                        dtype = str if qnp.dtype == object and any('+' in x for x in qnp) else int
+                        tbl[f"QN'{ii+1}"] = np.array(qnp.tolist() if dtype is str else qnp, dtype=dtype)
+                        tbl[f'QN"{ii+1}'] = np.array(qnpp.tolist() if dtype is str else qnpp, dtype=dtype)
                 del tbl['QN\'']
                 del tbl['QN"']
             else:
-                tbl['QN\''] = np.array(list(map(parse_letternumber, tbl['QN\''])), dtype=int)
-                tbl['QN"'] = np.array(list(map(parse_letternumber, tbl['QN"'])), dtype=int)
+                tbl['QN\''] = parse_letternumber_array(tbl['QN\''])
+                tbl['QN"'] = parse_letternumber_array(tbl['QN"'])
 
         result = table.vstack(tables)
 
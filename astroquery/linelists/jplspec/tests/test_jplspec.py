@@ -5,10 +5,11 @@ from unittest.mock import Mock, MagicMock, patch
 from astroquery.exceptions import EmptyResponseError
 
 import os
+import time
 
 from astropy import units as u
 from astropy.table import Table
-from astroquery.linelists.jplspec.core import JPLSpec
+from astroquery.linelists.jplspec.core import JPLSpec, JPLSpecClass
 
 file1 = 'CO.data'
 file2 = 'CO_6.data'
@@ -153,6 +154,38 @@ def test_parse_cat():
     assert all(tbl['TAG'] > 0)
 
 
+def test_get_molecule_cache_parsed(monkeypatch, tmp_path):
+    jpl = JPLSpecClass()
+    jpl.cache_location = tmp_path
+    response = MockResponseSpec('H2O_sample.cat')
+    response.raise_for_status = lambda: None
+    request = Mock(return_value=response)
+    monkeypatch.setattr(jpl, '_request', request)
+    tbl = jpl.get_molecule(18003, cache_parsed=True)
+    parsed_cache_file = tmp_path / 'parsed' / 'c018003.npz'
+    assert parsed_cache_file.exists()
+
+    # the second call must not need to retrieve the catalog again
+    cached = jpl.get_molecule(18003, cache_parsed=True)
+    assert request.call_count == 1
+    assert cached.colnames == tbl.colnames
+    for name in tbl.colnames:
+        assert cached[name].dtype == tbl[name].dtype
+        assert cached[name].unit == tbl[name].unit
+        np.testing.assert_array_equal(cached[name], tbl[name])
+    assert cached.meta == tbl.meta
+
+    # an expired file is replaced
+    mtime = time.time() - 2 * 604800
+    os.utime(parsed_cache_file, (mtime, mtime))
+    jpl.get_molecule(18003, cache_parsed=True)
+    assert request.call_count == 2
+    assert os.path.getmtime(parsed_cache_file) > mtime
+
+    jpl.clear_cache()
+    assert not parsed_cache_file.exists()
+
+
 def test_get_molecule_input_validation():
     """Test input validation for get_molecule method."""
 
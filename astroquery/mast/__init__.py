@@ -29,10 +29,29 @@ class Conf(_config.ConfigNamespace):
     pagesize = _config.ConfigItem(
         50000,
         'Number of results to request at once from the STScI server.')
+    page_workers = _config.ConfigItem(
+        4,
+        'Maximum number of result pages requested concurrently from the MAST Portal.')
+    batch_workers = _config.ConfigItem(
+        4,
+        'Maximum number of batches requested concurrently when a request is split in batches, '
+        'e.g. by ``get_product_list``.')
+    batch_retries = _config.ConfigItem(
+        2,
+        'Number of times a batch request failing with a connection or server error is retried.')
+    batch_rate_limit = _config.ConfigItem(
+        10.0,
+        'Maximum number of batch requests started per second, 0 for no limit.')
     enable_cloud_dataset = _config.ConfigItem(
         True,
         'Enable access to cloud-hosted datasets (e.g. on AWS S3) by default. '
         'Requires the ``boto3`` and ``botocore`` packages to be installed.')
+    download_workers = _config.ConfigItem(
+        8,
+        'Maximum number of files downloaded concurrently by ``download_products``.')
+    download_workers_per_host = _config.ConfigItem(
+        4,
+        'Maximum number of concurrent downloads from a single server (or from the cloud).')
 
 
 conf = Conf()
@@ -68,6 +68,8 @@ class CloudAccess:  # pragma:no-cover
         self.config = botocore.client.Config(signature_version=botocore.UNSIGNED)
         self.pubdata_bucket = "stpubdata"
         self.s3_client = self.boto3.client('s3', config=self.config)
+        # Creating boto3 resources from the default session isn't thread-safe
+        self._resource_lock = threading.Lock()
 
         # Cached list of datasets available in the cloud
         self._supported_datasets = self._fetch_supported_datasets()
@@ -262,7 +264,8 @@ class CloudAccess:  # pragma:no-cover
                                     expected_size))
 
         # Proceed with download
-        bucket = self.boto3.resource('s3', config=self.config).Bucket(self.pubdata_bucket)
+        with self._resource_lock:
+            bucket = self.boto3.resource('s3', config=self.config).Bucket(self.pubdata_bucket)
         if not verbose:
             bucket.download_file(s3_key, local_path)
             return
@@ -11,6 +11,9 @@ import warnings
 import uuid
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
 
 import numpy as np
 
@@ -51,6 +54,65 @@ def _prepare_service_request_string(json_obj):
     return 'request={}'.format(urlencode(request_string))
 
 
+def _object_column(values, atype, ignore_value):
+    """
+    Converts a column of JSON values to its data and mask going through an object array.
+
+    This is slower than `_typed_column` but copes with any mix of values.
+    """
+
+    # Make the column list (don't assign final type yet or there will be errors)
+    col_data = np.array(values, dtype=object)
+    if ignore_value is not None:
+        col_data[np.where(np.equal(col_data, None))] = ignore_value
+
+    # no consistent way to make the mask because np.equal fails on ''
+    # and array == value fails with None
+    if atype == 'str':
+        col_mask = (col_data == ignore_value)
+    else:
+        col_mask = np.equal(col_data, ignore_value)
+
+    return col_data.astype(atype), col_mask
+
+
+def _typed_column(values, atype, ignore_value):
+    """
+    Converts a column of JSON values to its data and mask, building the typed array directly.
+
+    Falls back to `_object_column` for types and values that can't take the direct route.
+    """
+
+    has_none = None in values
+    try:
+        if atype is np.float64:
+            # None converts to nan
+            col_data = np.array(values, dtype=np.float64)
+            if has_none and not (isinstance(ignore_value, float) and np.isnan(ignore_value)):
+                col_data[np.equal(np.array(values, dtype=object), None)] = ignore_value
+            col_mask = np.equal(col_data, ignore_value)
+        elif atype is np.int64 and ignore_value is not None:
+            if has_none:
+                values = [ignore_value if x is None else x for x in values]
+            col_data = np.array(values, dtype=np.int64)
+            col_mask = np.equal(col_data, ignore_value)
+        elif atype is str and isinstance(ignore_value, str):
+            if has_none:
+                values = [ignore_value if x is None else x for x in values]
+            col_data = np.array(values, dtype=str)
+            col_mask = (col_data == ignore_value)
+        elif atype is bool and ignore_value is None:
+            col_data = np.array(values, dtype=object)
+            col_mask = np.equal(col_data, None)
+            col_data = col_data.astype(bool)
+        else:
+            return _object_column(values, atype, ignore_value)
+    except (TypeError, ValueError, OverflowError):
+        return _object_column(values, atype, ignore_value)
+
+    return col_data, col_mask
+
+
 def _json_to_table(json_obj, col_config=None):
     """
     Takes a JSON object as returned from a Mashup request and turns it into an `~astropy.table.Table`.
@@ -72,11 +134,21 @@ def _json_to_table(json_obj, col_config=None):
     if not all(x in json_obj.keys() for x in ['fields', 'data']):
         raise KeyError("Missing required key(s) 'data' and/or 'fields.'")
 
-    for col, atype in [(x['name'], x['type']) for x in json_obj['fields']]:
+    # Removing "_selected_" column, and keeping the first of any duplicated columns
+    fields = {}
+    for field in json_obj['fields']:
+        if field['name'] != "_selected_":
+            fields.setdefault(field['name'], field['type'])
+
+    rows = json_obj['data']
+    for col, atype in fields.items():
 
-        # Removing "_selected_" column
-        if col == "_selected_":
-            continue
+        # Gathering the column values with a C-level pass over the rows, missing values
+        # are None which is then handled like a null value
+        try:
+            values = list(map(itemgetter(col), rows))
+        except KeyError:
+            values = [row.get(col) for row in rows]
 
         # reading the column config if given
         ignore_value = None
@@ -89,21 +161,9 @@ def _json_to_table(json_obj, col_config=None):
         atype = reg_type[1]
         ignore_value = reg_type[2] if (ignore_value is None) else ignore_value
 
-        # Make the column list (don't assign final type yet or there will be errors)
-        col_data = np.array([x.get(col, ignore_value) for x in json_obj['data']], dtype=object)
-        if ignore_value is not None:
-            col_data[np.where(np.equal(col_data, None))] = ignore_value
-
-        # no consistent way to make the mask because np.equal fails on ''
-        # and array == value fails with None
-        if atype == 'str':
-            col_mask = (col_data == ignore_value)
-        else:
-            col_mask = np.equal(col_data, ignore_value)
-
-        # add the column if it does not exist already
-        if col not in data_table.colnames:
-            data_table.add_column(MaskedColumn(col_data.astype(atype), name=col, mask=col_mask))
+        col_data, col_mask = _typed_column(values, atype, ignore_value)
+        # the arrays are freshly built, no need to copy them again
+        data_table.add_column(MaskedColumn(col_data, name=col, mask=col_mask, copy=False), copy=False)
 
     return data_table
 
@@ -124,6 +184,7 @@ class PortalAPI(BaseQuery):
 
     TIMEOUT = conf.timeout
     PAGESIZE = conf.pagesize
+    PAGE_WORKERS = conf.page_workers
 
     _column_configs = dict()
     _current_service = None
@@ -150,6 +211,10 @@ class PortalAPI(BaseQuery):
         interferes with follow requests after an 'Executing' response was returned.)
         Also parameters that allow for file download through this method are removed
 
+        Once the first page of results reports the number of pages, the remaining
+        pages are requested concurrently, by at most ``PAGE_WORKERS`` threads
+        (see ``conf.page_workers``).
+
 
         Parameters
         ----------
@@ -172,45 +237,76 @@ class PortalAPI(BaseQuery):
         """
 
         start_time = time.time()
-        all_responses = []
-        total_pages = 1
-        cur_page = 0
-
-        while cur_page < total_pages:
-            status = "EXECUTING"
+        request = partial(self._request_page, method, url, params=params, headers=headers, files=files,
+                          stream=stream, auth=auth, start_time=start_time)
+
+        response, result, status = request(data)
+        all_responses = [response]
+
+        paging = result.get("paging") if status == "COMPLETE" else None
+        if not retrieve_all or paging is None:
+            return all_responses
+
+        # Once the number of pages is known, the remaining ones are requested concurrently
+        cur_page = paging['page']
+        page_data = [data.replace("page%22%3A%20"+str(cur_page)+"%2C", "page%22%3A%20"+str(page)+"%2C")
+                     for page in range(cur_page + 1, paging['pagesFiltered'] + 1)]
+        if not page_data:
+            return all_responses
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.PAGE_WORKERS, len(page_data)))) as executor:
+            pages = [executor.submit(request, page) for page in page_data]
+            try:
+                # reassembling the pages in order, stopping at the first one that did not complete
+                for page in pages:
+                    response, _, status = page.result()
+                    all_responses.append(response)
+                    if status != "COMPLETE":
+                        break
+            finally:
+                for page in pages:
+                    page.cancel()
 
-            while status == "EXECUTING":
-                response = super(PortalAPI, self)._request(method, url, params=params, data=data,
-                                                           headers=headers, files=files, cache=False,
-                                                           stream=stream, auth=auth)
+        return all_responses
 
-                if (time.time() - start_time) >= self.TIMEOUT:
-                    raise TimeoutError("Timeout limit of {} exceeded.".format(self.TIMEOUT))
+    def _request_page(self, method, url, data, *, params=None, headers=None, files=None, stream=False,
+                      auth=None, start_time=None):
+        """
+        Requests a single page of results, polling the server until it is no longer executing.
 
-                # Raising error based on HTTP status if necessary
-                response.raise_for_status()
+        The JSON result is decoded as soon as the page arrives, see `~astroquery.mast.utils._response_json`.
 
-                result = response.json()
+        Returns
+        -------
+        response : `~requests.Response`
+            The response from the server.
+        result : dict
+            The decoded JSON result.
+        status : str
+            The status of the result, e.g. "COMPLETE" or "ERROR".
+        """
+        start_time = start_time or time.time()
+        status = "EXECUTING"
 
-                if not result:  # kind of hacky, but col_config service returns nothing if there is an error
-                    status = "ERROR"
-                else:
-                    status = result.get("status")
+        while status == "EXECUTING":
+            response = super(PortalAPI, self)._request(method, url, params=params, data=data,
+                                                       headers=headers, files=files, cache=False,
+                                                       stream=stream, auth=auth)
 
-            all_responses.append(response)
+            if (time.time() - start_time) >= self.TIMEOUT:
+                raise TimeoutError("Timeout limit of {} exceeded.".format(self.TIMEOUT))
 
-            if (status != "COMPLETE") or (not retrieve_all):
-                break
+            # Raising error based on HTTP status if necessary
+            response.raise_for_status()
 
-            paging = result.get("paging")
-            if paging is None:
-                break
-            total_pages = paging['pagesFiltered']
-            cur_page = paging['page']
+            result = utils._response_json(response)
 
-            data = data.replace("page%22%3A%20"+str(cur_page)+"%2C", "page%22%3A%20"+str(cur_page+1)+"%2C")
+            if not result:  # kind of hacky, but col_config service returns nothing if there is an error
+                status = "ERROR"
+            else:
+                status = result.get("status")
 
-        return all_responses
+        return response, result, status
 
     def _get_col_config(self, service, fetch_name=None):
         """
@@ -235,7 +331,7 @@ class PortalAPI(BaseQuery):
         response = self._request("POST", self.COLUMNS_CONFIG_URL,
                                  data=("colConfigId="+fetch_name), headers=headers)
 
-        self._column_configs[service] = response[0].json()
+        self._column_configs[service] = utils._response_json(response[0])
 
         more = False  # for some catalogs this is not enough information
         if "tess" in fetch_name.lower():
@@ -249,7 +345,7 @@ class PortalAPI(BaseQuery):
             mashup_request = {'service': all_name, 'params': {}, 'format': 'extjs'}
             req_string = _prepare_service_request_string(mashup_request)
             response = self._request("POST", self.MAST_REQUEST_URL, data=req_string, headers=headers)
-            json_response = response[0].json()
+            json_response = utils._response_json(response[0])
 
             self._column_configs[service].update(json_response['data']['Tables'][0]
                                                  ['ExtendedProperties']['discreteHistogram'])
@@ -285,7 +381,7 @@ class PortalAPI(BaseQuery):
             self._current_service = None  # clearing current service
 
         for resp in responses:
-            result = resp.json()
+            result = utils._response_json(resp)
 
             # check for error message
             if result['status'] == "ERROR":
@@ -10,9 +10,10 @@ import difflib
 import json
 import warnings
 from collections.abc import Iterable
+from functools import partial
 from json import JSONDecodeError
 from pathlib import Path
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 
 import astropy.units as u
 import numpy as np
@@ -821,11 +822,15 @@ class MastMissionsClass(MastQueryWithLogin):
         Returns
         -------
         response : `~astropy.table.Table`
-            Table containing download results for each data product file.
+            Table containing download results for each data product file, with the size, duration
+            and throughput of each download. Files are downloaded concurrently, see
+            ``conf.download_workers``.
         """
 
-        manifest_entries = []
+        downloads = []
         base_dir = Path(base_dir)
+        missions_host = urlparse(self._service_api_connection.MISSIONS_DOWNLOAD_URL).netloc
+        mast_host = urlparse(self._service_api_connection.MAST_DOWNLOAD_URL).netloc
 
         for data_product in products:
             col_names = data_product.colnames
@@ -850,17 +855,13 @@ class MastMissionsClass(MastQueryWithLogin):
             local_path.mkdir(parents=True, exist_ok=True)
             local_file_path = local_path / Path(filename).name
 
-            # Download files and record status
-            status, msg, url = self.download_file(uri,
-                                                  local_path=local_file_path,
-                                                  cache=cache,
-                                                  mission=mission,
-                                                  verbose=verbose)
-            manifest_entries.append([local_file_path, status, msg, url])
+            # Queue the download, the status of each file is recorded in the manifest
+            host = missions_host if mission in ['hst', 'jwst', 'roman', 'roman_spectra', 'roman_cgi'] else mast_host
+            download = partial(self.download_file, uri, local_path=local_file_path, cache=cache, mission=mission)
+            downloads.append((local_file_path, host, download))
 
         # Return manifest as Astropy Table
-        manifest = Table(rows=manifest_entries, names=('Local Path', 'Status', 'Message', 'URL'))
-        return manifest
+        return utils._download_concurrently(downloads, verbose=verbose)
 
     def download_products(self, products, *, download_dir=None, flat=False,
                           cache=True, extension=None, verbose=True, **filters):
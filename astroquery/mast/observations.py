@@ -9,8 +9,9 @@ This module contains various methods for querying MAST observations.
 import os
 import time
 import warnings
+from functools import partial
 from pathlib import Path
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 
 import astropy.coordinates as coord
 import astropy.units as u
@@ -830,15 +831,17 @@ class ObservationsClass(MastQueryWithLogin):
         Returns
         -------
         manifest : `~astropy.table.Table`
-            Table summarizing the download results.
+            Table summarizing the download results, with the size, duration and throughput of each
+            download. Files are downloaded concurrently, see ``conf.download_workers``.
         """
         base_dir = Path(base_dir)
-        manifest_rows = []
+        downloads = []
 
         # Resolve cloud URIs once if cloud is enabled
         cloud_uri_map = None
         if self._cloud_connection is not None:
             cloud_uri_map = self.get_cloud_uris(products, return_uri_map=True, verbose=False)
+        on_prem_host = urlparse(self._portal_api_connection.MAST_DOWNLOAD_URL).netloc
 
         for product in products:
             mast_uri = product['dataURI']
@@ -852,51 +855,65 @@ class ObservationsClass(MastQueryWithLogin):
                 local_dir.mkdir(parents=True, exist_ok=True)
             local_path = local_dir / filename
 
-            status, msg, url = 'ERROR', None, None
-
             cloud_uri = cloud_uri_map.get(mast_uri) if cloud_uri_map else None
-            if cloud_uri:
-                try:
-                    self._cloud_connection.download_file_from_cloud(cloud_uri, local_path, cache, verbose)
-                    status = 'COMPLETE'
-                except (ClientError, BotoCoreError) as ex:
-                    # Should be in cloud, but download failed
-                    if cloud_only:
-                        warnings.warn(f'Could not download {cloud_uri} from cloud: {ex}. Skipping download.',
-                                      NoResultsWarning)
-                        status = 'SKIPPED'
-                        msg = str(ex)
-                    else:
-                        if self._cloud_enabled_explicitly:
-                            warnings.warn(f'Could not download {cloud_uri} from cloud: {ex}. '
-                                          'Falling back to MAST download.', InputWarning)
-                        status, msg, url = self.download_file(mast_uri, local_path=local_path, cache=cache,
-                                                              force_on_prem=True, verbose=verbose)
-            else:
-                if cloud_uri_map is not None:
-                    # Cloud is enabled, but product was not found in cloud
-                    if cloud_only:
-                        warnings.warn(f'The product {mast_uri} was not found in the cloud. Skipping download.',
-                                      NoResultsWarning)
-                        status = 'SKIPPED'
-                        msg = 'Product not found in cloud'
-                    else:
-                        if self._cloud_enabled_explicitly:
-                            warnings.warn(f'The product {mast_uri} was not found in the cloud. '
-                                          'Falling back to MAST download.', InputWarning)
-                        status, msg, url = self.download_file(mast_uri, local_path=local_path, cache=cache,
-                                                              force_on_prem=True, verbose=verbose)
+            download = partial(self._download_product, mast_uri, local_path, cloud_uri=cloud_uri,
+                               cloud_enabled=cloud_uri_map is not None, cache=cache, cloud_only=cloud_only)
+            downloads.append((str(local_path), 's3' if cloud_uri else on_prem_host, download))
+
+        return utils._download_concurrently(downloads, verbose=verbose)
+
+    def _download_product(self, mast_uri, local_path, *, cloud_uri=None, cloud_enabled=False, cache=True,
+                          cloud_only=False, verbose=True):
+        """
+        Download a single data product for `_download_files`, from the cloud if ``cloud_uri`` is given.
+
+        Returns
+        -------
+        status, msg, url : tuple
+            The download status (COMPLETE, SKIPPED or ERROR), error message and url, as for `download_file`.
+        """
+        status, msg, url = 'ERROR', None, None
+
+        if cloud_uri:
+            try:
+                self._cloud_connection.download_file_from_cloud(cloud_uri, local_path, cache, verbose)
+                status = 'COMPLETE'
+            except (ClientError, BotoCoreError) as ex:
+                # Should be in cloud, but download failed
+                if cloud_only:
+                    warnings.warn(f'Could not download {cloud_uri} from cloud: {ex}. Skipping download.',
+                                  NoResultsWarning)
+                    status = 'SKIPPED'
+                    msg = str(ex)
                 else:
-                    # Cloud is not enabled
-                    if cloud_only:
-                        warnings.warn("`cloud_only` is True but cloud data access is not enabled. "
-                                      "Falling back to MAST download.", InputWarning)
+                    if self._cloud_enabled_explicitly:
+                        warnings.warn(f'Could not download {cloud_uri} from cloud: {ex}. '
+                                      'Falling back to MAST download.', InputWarning)
                     status, msg, url = self.download_file(mast_uri, local_path=local_path, cache=cache,
-                                                          cloud_only=False, force_on_prem=True, verbose=verbose)
-
-            manifest_rows.append([str(local_path), status, msg, url])
+                                                          force_on_prem=True, verbose=verbose)
+        else:
+            if cloud_enabled:
+                # Cloud is enabled, but product was not found in cloud
+                if cloud_only:
+                    warnings.warn(f'The product {mast_uri} was not found in the cloud. Skipping download.',
+                                  NoResultsWarning)
+                    status = 'SKIPPED'
+                    msg = 'Product not found in cloud'
+                else:
+                    if self._cloud_enabled_explicitly:
+                        warnings.warn(f'The product {mast_uri} was not found in the cloud. '
+                                      'Falling back to MAST download.', InputWarning)
+                    status, msg, url = self.download_file(mast_uri, local_path=local_path, cache=cache,
+                                                          force_on_prem=True, verbose=verbose)
+            else:
+                # Cloud is not enabled
+                if cloud_only:
+                    warnings.warn("`cloud_only` is True but cloud data access is not enabled. "
+                                  "Falling back to MAST download.", InputWarning)
+                status, msg, url = self.download_file(mast_uri, local_path=local_path, cache=cache,
+                                                      cloud_only=False, force_on_prem=True, verbose=verbose)
 
-        return Table(rows=manifest_rows, names=('Local Path', 'Status', 'Message', 'URL'))
+        return status, msg, url
 
     def _download_curl_script(self, products, out_dir, verbose=True):
         """
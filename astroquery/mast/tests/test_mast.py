@@ -3,7 +3,10 @@
 import json
 import os
 import re
+import threading
+import time
 import warnings
+from functools import partial
 from shutil import copyfile
 from unittest.mock import MagicMock, patch
 from pathlib import Path
@@ -68,6 +71,10 @@ DATA_FILES = {'Mast.Caom.Cone': 'caom.json',
               'z_survey': 'zcut_survey.json'}
 
 
+# The real PortalAPI._request, which the patch_post fixture replaces
+portal_request = discovery_portal.PortalAPI._request
+
+
 def data_path(filename):
     data_dir = os.path.join(os.path.dirname(__file__), 'data')
     return os.path.join(data_dir, filename)
@@ -1881,6 +1888,165 @@ def test_json_to_table_fallback_type_coercion():
     assert col.mask[4]  # ignore_value
 
 
+@pytest.mark.parametrize('data_file', ['caom.json', 'products.json', 'hsc.json', 'advSearch.json'])
+def test_portal_json_to_table(data_file):
+    with open(data_path(data_file), 'rb') as f:
+        json_obj = json.load(f)
+    # Drop some values to exercise the null and missing value handling
+    for row in json_obj['data'][::3]:
+        for field in json_obj['fields'][::2]:
+            row[field['name']] = None
+        row.pop(json_obj['fields'][1]['name'], None)
+
+    table = discovery_portal._json_to_table(json_obj)
+
+    assert '_selected_' not in table.colnames
+    assert len(table) == len(json_obj['data'])
+    for field in json_obj['fields']:
+        if field['name'] == '_selected_':
+            continue
+        _, atype, ignore_value = utils.parse_type(field['type'])
+        values = [row.get(field['name'], ignore_value) for row in json_obj['data']]
+        expected_data, expected_mask = discovery_portal._object_column(values, atype, ignore_value)
+        col = table[field['name']]
+        assert col.dtype == expected_data.dtype
+        assert np.array_equal(col.mask, expected_mask)
+        if col.dtype.kind == 'f':
+            assert np.array_equal(col.data, expected_data, equal_nan=True)
+        else:
+            assert np.array_equal(col.data, expected_data)
+
+
+def test_portal_json_to_table_mixed_values():
+    json_obj = {'fields': [{'name': 'flt', 'type': 'float'}, {'name': 'int', 'type': 'int'},
+                           {'name': 'str', 'type': 'string'}, {'name': 'bool', 'type': 'boolean'}],
+                'data': [{'flt': 1.5, 'int': 1, 'str': 'a', 'bool': True},
+                         {'flt': None, 'int': None, 'str': None, 'bool': None},
+                         {'flt': '2', 'int': '3', 'str': 4}]}
+
+    table = discovery_portal._json_to_table(json_obj, {'flt': {'ignoreValue': -1.0}})
+
+    assert table['flt'].dtype == np.float64
+    assert list(table['flt'].filled(0)) == [1.5, 0, 2]
+    assert list(table['int'].mask) == [False, True, False]
+    assert table['int'][2] == 3
+    assert list(table['str'].filled('?')) == ['a', '?', '4']
+    assert list(table['bool'].mask) == [False, True, True]
+
+
+def test_response_json():
+    assert utils._response_json(MockResponse(b'{"data": [1, 2]}')) == {'data': [1, 2]}
+    # NaN isn't valid JSON, but json accepts it
+    assert np.isnan(utils._response_json(MockResponse(b'{"value": NaN}'))['value'])
+
+
+def test_batched_request(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    calls = []
+    lock = threading.Lock()
+
+    def make_response(content, status_code):
+        response = Response()
+        response._content = json.dumps(content).encode()
+        response.status_code = status_code
+        response.url = 'https://mast.stsci.edu'
+        return response
+
+    def request(params):
+        with lock:
+            calls.append(list(params['ids']))
+            failures = sum(call == params['ids'] for call in calls)
+        # The second batch fails once with a server error
+        return make_response(params['ids'], 503 if params['ids'] == [3, 4, 5] and failures == 1 else 200)
+
+    results = utils._batched_request(list(range(10)), {'other': 1}, 3, 'ids', request,
+                                     extract_func=lambda r: r.json(), max_workers=3, rate_limit=0)
+
+    # Results are merged in the order of the batches
+    assert results == list(range(10))
+    assert sorted(calls) == [[0, 1, 2], [3, 4, 5], [3, 4, 5], [6, 7, 8], [9]]
+
+    # Client errors are not retried
+    def bad_request(params):
+        calls.append(params['ids'])
+        return make_response([], 400)
+
+    calls.clear()
+    with pytest.raises(HTTPError):
+        utils._batched_request(list(range(4)), {}, 2, 'ids', bad_request, extract_func=lambda r: r.json(),
+                               max_workers=1)
+    assert calls == [[0, 1]]
+
+
+def test_portal_request_pages(monkeypatch):
+    monkeypatch.setattr(discovery_portal.PortalAPI, '_request', portal_request)
+    polls = {}
+    lock = threading.Lock()
+
+    def base_request(self, method, url, data=None, **kwargs):
+        page = int(re.search(r"page%22%3A%20(\d+)%2C", data).group(1))
+        with lock:
+            polls[page] = polls.get(page, 0) + 1
+            executing = polls[page] == 1 and page % 2 == 0
+        # later pages come back first
+        time.sleep(0.01 * (6 - page))
+        result = {'status': 'EXECUTING'} if executing else {
+            'status': 'COMPLETE', 'fields': [{'name': 'page', 'type': 'int'}], 'data': [{'page': page}],
+            'paging': {'page': page, 'pageSize': 1, 'pagesFiltered': 5, 'rows': 1, 'rowsFiltered': 5}}
+        return MockResponse(json.dumps(result).encode())
+
+    monkeypatch.setattr(discovery_portal.BaseQuery, '_request', base_request)
+    portal = discovery_portal.PortalAPI()
+    data = discovery_portal._prepare_service_request_string({'service': 'Mast.Caom.Cone', 'page': 1,
+                                                             'pagesize': 1, 'params': {}})
+
+    responses = portal._request('POST', portal.MAST_REQUEST_URL, data=data)
+
+    assert [utils._response_json(response)['paging']['page'] for response in responses] == [1, 2, 3, 4, 5]
+    assert polls == {1: 1, 2: 2, 3: 1, 4: 2, 5: 1}
+    assert list(portal._parse_result(responses)['page']) == [1, 2, 3, 4, 5]
+
+    # Only the requested page is fetched if retrieve_all is False
+    polls.clear()
+    responses = portal._request('POST', portal.MAST_REQUEST_URL, data=data, retrieve_all=False)
+    assert len(responses) == 1
+    assert polls == {1: 1}
+
+
+def test_download_concurrently(tmp_path):
+    running = {'s3': 0, 'mast.stsci.edu': 0}
+    peaks = {'s3': 0, 'mast.stsci.edu': 0}
+    lock = threading.Lock()
+
+    def download(local_path, host, *, verbose):
+        with lock:
+            running[host] += 1
+            peaks[host] = max(peaks[host], running[host])
+        time.sleep(0.02)
+        local_path.write_bytes(b'data')
+        with lock:
+            running[host] -= 1
+        return 'COMPLETE', None, None
+
+    downloads = []
+    for i in range(12):
+        local_path = tmp_path / f'file{i}.fits'
+        host = 's3' if i % 2 else 'mast.stsci.edu'
+        downloads.append((local_path, host, partial(download, local_path, host)))
+
+    manifest = utils._download_concurrently(downloads, max_workers=6, max_per_host=2, verbose=False)
+
+    # Rows are in input order, whatever the order in which downloads completed
+    assert list(manifest['Local Path']) == [d[0] for d in downloads]
+    assert all(manifest['Status'] == 'COMPLETE')
+    assert all(manifest['Size'] == 4)
+    assert all(manifest['Duration'] > 0)
+    assert manifest['Throughput'].unit == u.byte / u.s
+    assert manifest.meta['total_size'] == 48
+    assert manifest.meta['throughput'] > 0
+    assert peaks == {'s3': 2, 'mast.stsci.edu': 2}
+
+
 ################
 # Cloud tests #
 ################
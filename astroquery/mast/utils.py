@@ -6,8 +6,13 @@ MAST Utils
 Miscellaneous functions used throughout the MAST module.
 """
 
+import io
+import os
 import re
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import numpy as np
 import requests
@@ -24,6 +29,13 @@ from ..version import version
 from ..exceptions import InputWarning, NoResultsWarning, ResolverError, InvalidQueryError
 from ..utils import commons
 
+try:
+    # Optional dependency, faster decoding of large JSON responses
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 __all__ = []
 
@@ -73,6 +85,30 @@ def parse_type(dbtype):
     }.get(dbtype, (dbtype, dbtype, dbtype))
 
 
+def _response_json(response):
+    """
+    Decodes the JSON body of a response, using ``orjson`` if it is installed.
+
+    The decoded body is kept on the response, so that responses decoded while polling
+    the server are not decoded again when their results are parsed.
+    """
+    result = getattr(response, '_mast_json', None)
+    if result is not None:
+        return result
+
+    result = None
+    if HAS_ORJSON:
+        try:
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (e.g. NaN values), let json have a go
+            pass
+    if result is None:
+        result = response.json()
+    response._mast_json = result
+    return result
+
+
 def _simple_request(url, params=None):
     """
     Light wrapper on requests.session().get basically to make monkey patched testing easier/more effective.
@@ -98,10 +134,18 @@ def _batched_request(
     request_func,
     extract_func,
     desc="Fetching items",
+    *,
+    max_workers=None,
+    max_retries=None,
+    rate_limit=None,
 ):
     """
     Generic helper for batching API requests.
 
+    When the items don't fit in a single batch, the batches are requested on a bounded pool of
+    threads. Batches that fail with a connection error, a timeout or a server error are retried, and
+    the results are merged in the order of the batches.
+
     Parameters
     ----------
     items : list
@@ -113,42 +157,176 @@ def _batched_request(
     param_key : str
         Key in the params dictionary that will hold the batch of items.
     request_func : callable
-        Function to call for each batch request.
+        Function to call for each batch request. It is given its own copy of ``params``.
     extract_func : callable
         Function to extract the relevant data from the response.
     desc : str
         Description of the operation for progress reporting.
+    max_workers : int, optional
+        Maximum number of batches requested concurrently. Defaults to ``conf.batch_workers``.
+        Set to 1 to request the batches one after the other.
+    max_retries : int, optional
+        Number of times a failed batch is retried. Defaults to ``conf.batch_retries``.
+    rate_limit : float, optional
+        Maximum number of batch requests started per second, 0 for no limit.
+        Defaults to ``conf.batch_rate_limit``.
 
     Returns
     -------
     results : list
         List of results extracted from the responses.
     """
-    if len(items) > max_batch:
-        chunks = list(split_list_into_chunks(items, max_batch))
-        results = []
-        with ProgressBarOrSpinner(len(items), f"{desc} in {len(chunks)} batches ...") as pb:
-            fetched = 0
-            pb.update(0)
-            for chunk in chunks:
-                params[param_key] = chunk
-                resp = request_func(params)
-                resp.raise_for_status()
-
-                # Extend results with new response
-                new_resp = extract_func(resp)
-                results.extend(new_resp)
-
-                # Update progress bar
-                fetched += len(chunk)
-                pb.update(fetched)
-        return results
-    else:
+    if len(items) <= max_batch:
         params[param_key] = items
         resp = request_func(params)
         resp.raise_for_status()
         return extract_func(resp)
 
+    from . import conf
+
+    max_retries = conf.batch_retries if max_retries is None else max_retries
+    rate_limit = conf.batch_rate_limit if rate_limit is None else rate_limit
+    chunks = list(split_list_into_chunks(items, max_batch))
+    max_workers = max(1, min(max_workers or conf.batch_workers, len(chunks)))
+
+    # Spacing out the start of the requests to honour the rate limit
+    next_start = [time.monotonic()]
+    next_start_lock = threading.Lock()
+
+    def wait_turn():
+        if not rate_limit:
+            return
+        with next_start_lock:
+            start = max(next_start[0], time.monotonic())
+            next_start[0] = start + 1 / rate_limit
+        time.sleep(max(0, start - time.monotonic()))
+
+    def request_chunk(index, chunk):
+        for attempt in range(max_retries + 1):
+            wait_turn()
+            start = time.monotonic()
+            try:
+                resp = request_func({**params, param_key: chunk})
+                resp.raise_for_status()
+                result = extract_func(resp)
+            except requests.RequestException as ex:
+                status = getattr(ex.response, 'status_code', None)
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt == max_retries:
+                    raise
+                delay = 2 ** attempt
+                log.warning(f"{desc}: batch {index + 1} of {len(chunks)} failed ({ex}), "
+                            f"retrying in {delay} s")
+                time.sleep(delay)
+            else:
+                log.debug(f"{desc}: batch {index + 1} of {len(chunks)} ({len(chunk)} items) "
+                          f"took {time.monotonic() - start:.2f} s")
+                return result
+
+    results = [None] * len(chunks)
+    with ProgressBarOrSpinner(len(items), f"{desc} in {len(chunks)} batches ...") as pb:
+        fetched = 0
+        pb.update(0)
+        if max_workers == 1:
+            for index, chunk in enumerate(chunks):
+                results[index] = request_chunk(index, chunk)
+                fetched += len(chunk)
+                pb.update(fetched)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(request_chunk, index, chunk): index
+                           for index, chunk in enumerate(chunks)}
+                try:
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        results[index] = future.result()
+                        fetched += len(chunks[index])
+                        pb.update(fetched)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+    # Merging the results in the order of the batches
+    return [result for batch_results in results for result in batch_results]
+
+
+def _download_concurrently(downloads, *, max_workers=None, max_per_host=None, verbose=True):
+    """
+    Runs file downloads on a bounded pool of threads and returns their manifest.
+
+    Parameters
+    ----------
+    downloads : list of tuple
+        One ``(local_path, host, download)`` tuple per file. ``download`` is called
+        with a ``verbose`` keyword argument and returns the ``(status, message, url)`` of the
+        download. At most ``max_per_host`` downloads run at the same time for a given ``host``.
+    max_workers : int, optional
+        Maximum number of concurrent downloads. Defaults to ``conf.download_workers``.
+    max_per_host : int, optional
+        Maximum number of concurrent downloads from a single host. Defaults to
+        ``conf.download_workers_per_host``.
+    verbose : bool, optional
+        Default True. Whether to show download progress in the console. With more than one
+        worker, a single progress bar counts the downloaded files.
+
+    Returns
+    -------
+    manifest : `~astropy.table.Table`
+        Table with the local path, status, message and URL of each download, as well as its
+        size, duration and throughput. The total size, time and throughput are stored in the
+        table metadata.
+    """
+    from . import conf
+
+    max_workers = max(1, min(max_workers or conf.download_workers, len(downloads)))
+    max_per_host = max_per_host or conf.download_workers_per_host
+    host_slots = {}
+    host_slots_lock = threading.Lock()
+
+    def download_one(local_path, host, download):
+        with host_slots_lock:
+            slot = host_slots.setdefault(host, threading.BoundedSemaphore(max_per_host))
+        with slot:
+            start = time.monotonic()
+            status, msg, url = download(verbose=verbose and max_workers == 1)
+            duration = time.monotonic() - start
+
+        size = os.path.getsize(local_path) if status == 'COMPLETE' and os.path.exists(local_path) else 0
+        throughput = size / duration if duration > 0 else 0.
+        return [local_path, status, msg, url, size, duration, throughput]
+
+    start = time.monotonic()
+    if max_workers == 1:
+        rows = [download_one(*download) for download in downloads]
+    else:
+        rows = [None] * len(downloads)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(download_one, *download): index for index, download in enumerate(downloads)}
+            try:
+                with ProgressBarOrSpinner(len(downloads), f"Downloading {len(downloads)} files with "
+                                          f"{max_workers} workers ...",
+                                          file=None if verbose else io.StringIO()) as pb:
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        rows[futures[future]] = future.result()
+                        pb.update(done)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    total_time = time.monotonic() - start
+
+    manifest = Table(rows=rows, names=('Local Path', 'Status', 'Message', 'URL', 'Size', 'Duration', 'Throughput'))
+    manifest['Size'].unit = u.byte
+    manifest['Duration'].unit = u.s
+    manifest['Throughput'].unit = u.byte / u.s
+    manifest.meta['total_size'] = int(np.sum(manifest['Size']))
+    manifest.meta['total_time'] = total_time
+    manifest.meta['throughput'] = manifest.meta['total_size'] / total_time if total_time > 0 else 0.
+    log.debug(f"Downloaded {manifest.meta['total_size']} bytes in {total_time:.2f} s "
+              f"({manifest.meta['throughput'] / 1e6:.2f} MB/s)")
+    return manifest
+
 
 @deprecated_renamed_argument('objectname', 'object_name', since='0.4.12')
 def resolve_object(object_name, *, resolver=None, resolve_all=False, batch_size=30):
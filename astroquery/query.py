@@ -2,7 +2,6 @@
 import abc
 import inspect
 import pickle
-import copy
 import getpass
 import hashlib
 import keyring
@@ -12,7 +11,6 @@ import platform
 import requests
 import textwrap
 
-from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 from astropy.config import paths
@@ -24,32 +22,18 @@ from astropy.utils import deprecated
 import pyvo
 
 from astroquery import version, log, cache_conf
+from astroquery.cache import CacheStore
 from astroquery.utils import system_tools
 
 
 __all__ = ['BaseVOQuery', 'BaseQuery', 'QueryWithLogin']
 
 
+@deprecated(since="0.4.12", message=("The to_cache function is deprecated, responses are cached "
+                                     "with `~astroquery.cache.CacheStore` instead."))
 def to_cache(original_response, cache_file):
-    log.debug("Caching data to {0}".format(cache_file))
-
-    # Copying a TAPService instance with an auth session produces some warnings
-    # as a side affect. The hooks are not needed in the cache, so we remove
-    # them before caching and restore them afterwards.
-    # Related pyvo issue: https://github.com/astropy/pyvo/issues/755
-    hooks = None
-    if hasattr(original_response, 'request'):
-        hooks = original_response.request.hooks
-        del original_response.request.hooks
-    if hasattr(original_response, 'history'):
-        for r in original_response.history:
-            if hasattr(r, 'request'):
-                del r.request.hooks
-    response_copy = copy.deepcopy(original_response)
-    if hooks:
-        original_response.request.hooks = hooks
-    with open(cache_file, "wb") as f:
-        pickle.dump(response_copy, f, protocol=4)
+    cache_file = Path(cache_file)
+    CacheStore(cache_file.parent).put(cache_file.name.split('.')[0], original_response)
 
 
 def _replace_none_iterable(iterable):
@@ -121,44 +105,17 @@ class AstroQuery:
         return self._hash
 
     def request_file(self, cache_location):
-        fn = cache_location.joinpath(self.hash() + ".pickle")
-        return fn
+        return CacheStore(cache_location, compress=cache_conf.cache_compression).entry_file(self.hash())
 
     def from_cache(self, cache_location, cache_timeout):
-        request_file = self.request_file(cache_location)
-        try:
-            if cache_timeout == -1:
-                expired = False
-            else:
-                current_time = datetime.now(timezone.utc)
-                cache_time = datetime.fromtimestamp(request_file.stat().st_mtime, timezone.utc)
-                expired = current_time-cache_time > timedelta(seconds=cache_timeout)
-            if not expired:
-                with open(request_file, "rb") as f:
-                    response = pickle.load(f)
-                if not isinstance(response, requests.Response):
-                    response = None
-            else:
-                log.debug(f"Cache expired for {request_file}...")
-                response = None
-        except FileNotFoundError:
-            response = None
-        if response:
-            log.debug("Retrieved data from {0}".format(request_file))
-        return response
+        return CacheStore(cache_location).get(self.hash(), cache_timeout)
 
     def remove_cache_file(self, cache_location):
         """
         Remove the cache file - may be needed if a query fails during parsing
         (successful request, but failed return)
         """
-        request_file = self.request_file(cache_location)
-
-        if request_file.exists:
-            request_file.unlink()
-        else:
-            raise FileNotFoundError(f"Tried to remove cache file {request_file} but "
-                                    "it does not exist")
+        CacheStore(cache_location).remove(self.hash())
 
 
 class LoginABCMeta(abc.ABCMeta):
@@ -238,6 +195,11 @@ class BaseQuery(metaclass=LoginABCMeta):
     is implemented as an abstract class and must not be directly instantiated.
     """
 
+    # Maximum size of this service's cache in bytes, overrides
+    # ``cache_conf.cache_max_size`` when set.
+    cache_max_size = None
+    _cache_store = None
+
     def __init__(self):
         self._session = requests.Session()
         self._session.hooks['response'].append(self._response_hook)
@@ -300,10 +262,31 @@ class BaseQuery(metaclass=LoginABCMeta):
         """Resets the cache location to the default astropy cache"""
         self._cache_location = None
 
+    @property
+    def cache_store(self):
+        """
+        The store holding the cached responses of this service, by default an
+        indexed `~astroquery.cache.CacheStore` in ``cache_location``.
+        """
+        if self._cache_store is not None:
+            return self._cache_store
+        max_size = self.cache_max_size if self.cache_max_size is not None else cache_conf.cache_max_size
+        return CacheStore(self.cache_location, max_size=max_size, compress=cache_conf.cache_compression)
+
+    @cache_store.setter
+    def cache_store(self, store):
+        self._cache_store = store
+
     def clear_cache(self):
         """Removes all cache files."""
-        for fle in self.cache_location.glob("*.pickle"):
-            fle.unlink()
+        self.cache_store.clear()
+
+    def cache_info(self):
+        """
+        Return the number of cached entries, their total size, the size limit
+        and the hit/miss counters of the cache of this service.
+        """
+        return self.cache_store.info()
 
     def _request(self, method, url,
                  params=None, data=None, headers=None,
@@ -398,7 +381,8 @@ class BaseQuery(metaclass=LoginABCMeta):
                                              allow_redirects=allow_redirects,
                                              json=json)
             else:
-                response = query.from_cache(self.cache_location, cache_conf.cache_timeout)
+                cache_store = self.cache_store
+                response = cache_store.get(query.hash(), cache_conf.cache_timeout, stream=stream)
                 if not response:
                     response = query.request(self._session,
                                              self.cache_location,
@@ -407,7 +391,7 @@ class BaseQuery(metaclass=LoginABCMeta):
                                              allow_redirects=allow_redirects,
                                              verify=verify,
                                              json=json)
-                    to_cache(response, query.request_file(self.cache_location))
+                    cache_store.put(query.hash(), response)
 
             self._last_query = query
             return response
@@ -481,15 +465,16 @@ class BaseQuery(metaclass=LoginABCMeta):
                 # bytes are indexed from 0:
                 # https://en.wikipedia.org/wiki/List_of_HTTP_header_fields#range-request-header
                 end = "{0}".format(length-1) if length is not None else ""
-                self._session.headers['Range'] = "bytes={0}-{1}".format(existing_file_length,
-                                                                        end)
-                log.debug(f"Continuing with range={self._session.headers['Range']}")
+                # The range goes in the request headers rather than the session ones, so that
+                # concurrent downloads sharing the session don't pick it up
+                headers = dict(kwargs.pop('headers', None) or {})
+                headers['Range'] = "bytes={0}-{1}".format(existing_file_length, end)
+                log.debug(f"Continuing with range={headers['Range']}")
 
                 response = self._session.request(method, url,
                                                  timeout=timeout, stream=True,
-                                                 auth=auth, **kwargs)
+                                                 auth=auth, headers=headers, **kwargs)
                 response.raise_for_status()
-                del self._session.headers['Range']
 
         elif cache and os.path.exists(local_filepath):
             if length is not None:
@@ -1,13 +1,19 @@
 import requests
 import os
+import sqlite3
 import pytest
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
 from time import mktime
 from datetime import datetime
 
 from astropy.config import paths
+from astropy.utils.exceptions import AstropyDeprecationWarning
 
-from astroquery.query import QueryWithLogin
+from astroquery.cache import CacheStore
+from astroquery.query import QueryWithLogin, to_cache
 from astroquery import cache_conf
 
 URL1 = "http://fakeurl.edu"
@@ -82,22 +88,22 @@ def test_basic_caching(changing_mocked_response):
     assert cache_conf.cache_active
 
     mytest.clear_cache()
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT1
-    assert len(os.listdir(mytest.cache_location)) == 1
+    assert mytest.cache_info()['entries'] == 1
 
     resp = mytest.test_func(URL2)  # query that has not been cached
     assert resp.content == TEXT2
-    assert len(os.listdir(mytest.cache_location)) == 2
+    assert mytest.cache_info()['entries'] == 2
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT1  # query that was cached
-    assert len(os.listdir(mytest.cache_location)) == 2  # no new cache file
+    assert mytest.cache_info()['entries'] == 2  # no new cache file
 
     mytest.clear_cache()
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT2  # Now get new response
@@ -134,11 +140,11 @@ def test_login(changing_mocked_response):
     assert cache_conf.cache_active
 
     mytest.clear_cache()
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     mytest.login("ceb")
     assert mytest.authenticated()
-    assert len(os.listdir(mytest.cache_location)) == 0  # request should not be cached
+    assert mytest.cache_info()['entries'] == 0  # request should not be cached
 
     mytest.login("ceb")
     assert not mytest.authenticated()  # Should not be accessing cache
@@ -151,7 +157,7 @@ def test_timeout(changing_mocked_response, monkeypatch):
     assert cache_conf.cache_active
 
     mytest.clear_cache()
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     resp = mytest.test_func(URL1)  # should be cached
     assert resp.content == TEXT1
@@ -159,10 +165,10 @@ def test_timeout(changing_mocked_response, monkeypatch):
     resp = mytest.test_func(URL1)  # should access cached value
     assert resp.content == TEXT1
 
-    # Changing the file date so the cache will consider it expired
-    cache_file = next(mytest.cache_location.iterdir())
+    # Changing the entry date so the cache will consider it expired
     modTime = mktime(datetime(1970, 1, 1).timetuple())
-    os.utime(cache_file, (modTime, modTime))
+    with closing(sqlite3.connect(mytest.cache_store.index_file)) as conn, conn:
+        conn.execute("UPDATE entries SET created = ?", (modTime,))
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT2  # now see the new response
@@ -183,15 +189,15 @@ def test_deactivate_directly(changing_mocked_response):
     cache_conf.cache_active = False
 
     mytest.clear_cache()
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT1
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT2
-    assert len(os.listdir(mytest.cache_location)) == 0
+    assert mytest.cache_info()['entries'] == 0
 
     cache_conf.reset()
     assert cache_conf.cache_active is True
@@ -201,14 +207,190 @@ def test_deactivate_with_set_temp(changing_mocked_response):
     mytest = CacheTestClass()
     with cache_conf.set_temp('cache_active', False):
         mytest.clear_cache()
-        assert len(os.listdir(mytest.cache_location)) == 0
+        assert mytest.cache_info()['entries'] == 0
 
         resp = mytest.test_func(URL1)
         assert resp.content == TEXT1
-        assert len(os.listdir(mytest.cache_location)) == 0
+        assert mytest.cache_info()['entries'] == 0
 
         resp = mytest.test_func(URL1)
         assert resp.content == TEXT2
-        assert len(os.listdir(mytest.cache_location)) == 0
+        assert mytest.cache_info()['entries'] == 0
 
     assert cache_conf.cache_active is True
+
+
+def test_hit_miss_counters(changing_mocked_response):
+    cache_conf.reset()
+
+    mytest = CacheTestClass()
+    mytest.clear_cache()
+
+    mytest.test_func(URL1)
+    mytest.test_func(URL1)
+    mytest.test_func(URL2)
+
+    info = mytest.cache_info()
+    assert info['entries'] == 2
+    assert info['hits'] == 1
+    assert info['misses'] == 2
+    assert info['size'] > 0
+
+    # No stray files besides the entries and the index
+    assert len(os.listdir(mytest.cache_location)) == 3
+
+    mytest.clear_cache()
+    assert mytest.cache_info() == {'entries': 0, 'size': 0, 'max_size': 0, 'hits': 0, 'misses': 0}
+
+
+def test_lru_eviction(tmp_path):
+    store = CacheStore(tmp_path)
+    for key in "abc":
+        store.put(key, _create_response(TEXT1))
+    entry_size = store.info()['size'] // 3
+
+    # Touch "a" so that "b" becomes the least recently used entry
+    assert store.get("a").content == TEXT1
+
+    store.max_size = 3 * entry_size
+    store.put("d", _create_response(TEXT2))
+
+    assert store.info()['entries'] == 3
+    assert store.get("b") is None
+    assert not store.entry_file("b").exists()
+    for key in "acd":
+        assert store.get(key) is not None
+
+
+def test_service_quota(changing_mocked_response):
+    cache_conf.reset()
+
+    mytest = CacheTestClass()
+    mytest.clear_cache()
+
+    mytest.test_func(URL1)
+    quota = mytest.cache_info()['size']
+    mytest.cache_max_size = quota
+
+    # The quota only fits one entry, so the older one is evicted
+    assert mytest.test_func(URL2).content == TEXT2
+    assert mytest.cache_info()['entries'] == 1
+    assert mytest.cache_info()['max_size'] == quota
+
+    mytest.cache_max_size = None
+    mytest.clear_cache()
+
+
+def test_custom_store(changing_mocked_response):
+    cache_conf.reset()
+
+    class DictStore:
+        def __init__(self):
+            self.entries = {}
+
+        def get(self, key, timeout=-1, stream=False):
+            return self.entries.get(key)
+
+        def put(self, key, response):
+            self.entries[key] = response
+
+        def remove(self, key):
+            del self.entries[key]
+
+        def clear(self):
+            self.entries.clear()
+
+        def info(self):
+            return {'entries': len(self.entries)}
+
+    mytest = CacheTestClass()
+    mytest.cache_store = DictStore()
+
+    assert mytest.test_func(URL1).content == TEXT1
+    assert mytest.test_func(URL1).content == TEXT1
+    assert mytest.cache_info() == {'entries': 1}
+    mytest.clear_cache()
+    assert mytest.test_func(URL1).content == TEXT2
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_raw_body_entries(tmp_path, compress):
+    store = CacheStore(tmp_path, compress=compress)
+
+    response = _create_response(b"<?xml version='1.0'?><VOTABLE/>")
+    response.headers['Content-Type'] = 'text/xml'
+    response.url = URL1
+    response.request.method = 'POST'
+    response.request.url = URL1
+    response.request.body = 'raty=a'
+    store.put("key", response)
+
+    body_file = store.entry_file("key")
+    assert body_file.name == ("key.body.gz" if compress else "key.body")
+    if not compress:
+        assert body_file.read_bytes() == response.content
+
+    cached = store.get("key")
+    assert cached.content == response.content
+    assert cached.text == response.text
+    assert cached.status_code == 200
+    assert cached.url == URL1
+    assert cached.headers['content-type'] == 'text/xml'
+    assert cached.request.method == 'POST'
+    assert cached.request.body == 'raty=a'
+
+    streamed = store.get("key", stream=True)
+    assert b"".join(streamed.iter_content(8)) == response.content
+    streamed.close()
+
+
+def test_cookies_and_history(tmp_path):
+    store = CacheStore(tmp_path)
+
+    redirect = _create_response(b"")
+    redirect.status_code = 302
+    redirect.url = URL2
+    redirect.headers['Location'] = URL1
+    response = _create_response(b"Penguin")
+    response.url = URL1
+    response.history = [redirect]
+    response.cookies.set_cookie(requests.cookies.create_cookie('session', 'abc', domain='fakeurl.edu'))
+    store.put("key", response)
+
+    cached = store.get("key")
+    assert cached.cookies.get('session', domain='fakeurl.edu') == 'abc'
+    assert len(cached.history) == 1
+    assert cached.history[0].status_code == 302
+    assert cached.history[0].url == URL2
+    assert cached.history[0].headers['location'] == URL1
+
+
+def test_to_cache(tmp_path):
+    response = _create_response(b"Penguin")
+    with pytest.warns(AstropyDeprecationWarning, match="to_cache function is deprecated"):
+        to_cache(response, tmp_path / "key.pickle")
+    assert CacheStore(tmp_path).get("key").content == b"Penguin"
+
+
+def test_legacy_index_upgrade(tmp_path):
+    cache_file = tmp_path / "old.pickle"
+    cache_file.write_bytes(b"")
+    with closing(sqlite3.connect(tmp_path / CacheStore.INDEX_NAME)) as conn, conn:
+        conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, filename TEXT NOT NULL)")
+        conn.execute("INSERT INTO entries VALUES ('old', 'old.pickle')")
+        conn.execute("PRAGMA user_version = 1")
+
+    store = CacheStore(tmp_path)
+    assert store.get("old") is None
+    assert not cache_file.exists()
+    assert store.info()['entries'] == 0
+
+
+def test_concurrent_index_creation(tmp_path):
+    # Stores opening the same new location at once must create the index only once
+    response = _create_response(TEXT1)
+    stores = [CacheStore(tmp_path) for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda ii: stores[ii].put(f"key{ii}", response), range(8)))
+
+    assert stores[0].info()['entries'] == 8
@@ -20,16 +20,21 @@ import mimetypes
 import os
 import platform
 import requests
+import threading
 import time
+import weakref
 
 from astroquery import version
 from astroquery.utils.tap import taputils
 from astroquery.utils.tap.xmlparser import utils
 
-__all__ = ['TapConn']
+__all__ = ['TapConn', 'ConnectionHandler', 'ConnectionPool']
 
 CONTENT_TYPE_POST_DEFAULT = "application/x-www-form-urlencoded"
 
+# Errors raised when a kept-alive socket has been closed by the server
+STALE_CONNECTION_ERRORS = (httplib.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
 
 class TapConn:
     """TAP plus connection class
@@ -124,8 +129,9 @@ class TapConn:
         }
         self.__getHeaders = {}
         self.__cookie = None
-        self.__currentStatus = 0
-        self.__currentReason = ""
+        # Status of the latest response of each thread, as requests can be
+        # sent concurrently
+        self.__current = threading.local()
 
     def __get_tap_context(self, subContext):
         return f"{self.__tapContext}/{subContext}"
@@ -236,10 +242,8 @@ class TapConn:
         if verbose:
             print(f"host = {conn.host}:{conn.port}")
             print(f"context = {context}")
-        conn.request("GET", context, None, self.__getHeaders)
-        response = conn.getresponse()
-        self.__currentReason = response.reason
-        self.__currentStatus = response.status
+        response = self.__send(conn, "GET", context, None, dict(self.__getHeaders))
+        self.__set_current_response(response)
         return response
 
     def execute_tappost(self, subcontext, data,
@@ -418,13 +422,36 @@ class TapConn:
             print(f"host = {conn.host}:{conn.port}")
             print(f"context = {context}")
             print(f"Content-type = {content_type}")
-        self.__postHeaders["Content-type"] = content_type
-        conn.request("POST", context, data, self.__postHeaders)
-        response = conn.getresponse()
-        self.__currentReason = response.reason
-        self.__currentStatus = response.status
+        headers = dict(self.__postHeaders)
+        headers["Content-type"] = content_type
+        response = self.__send(conn, "POST", context, data, headers)
+        self.__set_current_response(response)
         return response
 
+    def __send(self, conn, method, context, body, headers):
+        try:
+            try:
+                conn.request(method, context, body, headers)
+                return conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                # A pooled connection may have been closed by the server while
+                # idle: retry once on a fresh socket.
+                if not getattr(conn, 'reused', False):
+                    raise
+                conn.close()
+                conn.request(method, context, body, headers)
+                return conn.getresponse()
+        except BaseException:
+            # Give the connection back to its pool, there is no response to read
+            release = getattr(conn, 'release', None)
+            if release is not None:
+                release()
+            raise
+
+    def __set_current_response(self, response):
+        self.__current.status = response.status
+        self.__current.reason = response.reason
+
     def execute_secure(self, subcontext, data, *, verbose=False):
         """Executes a secure POST request
         The connection is done through HTTPS
@@ -444,30 +471,29 @@ class TapConn:
         """
         conn = self.__get_connection_secure(verbose=verbose)
         context = self.__get_server_context(subcontext)
-        self.__postHeaders["Content-type"] = CONTENT_TYPE_POST_DEFAULT
-        conn.request("POST", context, data, self.__postHeaders)
-        response = conn.getresponse()
-        self.__currentReason = response.reason
-        self.__currentStatus = response.status
+        headers = dict(self.__postHeaders)
+        headers["Content-type"] = CONTENT_TYPE_POST_DEFAULT
+        response = self.__send(conn, "POST", context, data, headers)
+        self.__set_current_response(response)
         return response
 
     def get_response_status(self):
-        """Returns the latest connection status
+        """Returns the latest connection status of the calling thread
 
         Returns
         -------
         The current (latest) HTTP(s) response status
         """
-        return self.__currentStatus
+        return getattr(self.__current, 'status', 0)
 
     def get_response_reason(self):
-        """Returns the latest connection reason (message)
+        """Returns the latest connection reason (message) of the calling thread
 
         Returns
         -------
         The current (latest) HTTP(s) response reason
         """
-        return self.__currentReason
+        return getattr(self.__current, 'reason', "")
 
     def find_header(self, headers, key):
         """Searches for the specified keyword
@@ -501,7 +527,7 @@ class TapConn:
         """
         return taputils.taputil_find_all_headers(headers, key)
 
-    def dump_to_file(self, output, response):
+    def dump_to_file(self, output, response, *, chunk_size=None):
         """Writes the connection response into the specified output
 
         Parameters
@@ -510,14 +536,16 @@ class TapConn:
             output file
         response : HTTP(s) response object, mandatory
             HTTP(s) response object
+        chunk_size : int, optional, default utils.DEFAULT_CHUNK_SIZE
+            number of bytes read at once from the response
         """
+        chunk_size = chunk_size or utils.DEFAULT_CHUNK_SIZE
         with open(output, "wb") as f:
             while True:
-                data = response.read(4096)
-                if len(data) < 1:
+                data = response.read(chunk_size)
+                if not data:
                     break
                 f.write(data)
-            f.close()
 
     def get_suitable_extension_by_format(self, output_format):
         """Returns the suitable extension for a file based on the output format
@@ -741,11 +769,188 @@ class TapConn:
                f"\n\tPort: {self.__connPort}\n\tSSL Port: {self.__connPortSsl}"
 
 
+class _PooledHTTPResponse(httplib.HTTPResponse):
+    """Response telling its pooled connection when it is closed (explicitly
+    or when it is garbage collected) before being read to the end."""
+
+    pooled_connection = None
+
+    def close(self):
+        conn = self.pooled_connection() if self.pooled_connection is not None else None
+        if conn is not None and self.fp is not None:
+            # The rest of the body is still in the socket
+            conn.abandon()
+        super().close()
+
+
+class _PooledConnectionMixin:
+    """Keeps track of the state of a connection handed out by a ConnectionPool.
+
+    A connection stays checked out from the moment it is handed out until the
+    response to its request has been completely read, or until it is released
+    after a failed request. A connection whose response is closed or dropped
+    before being read to the end is abandoned: it is closed, and removed from
+    the pool.
+    """
+
+    response_class = _PooledHTTPResponse
+
+    def __init__(self, *args, pool_lock, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_lock = pool_lock
+        self.checked_out = False
+        self.reused = False
+        self.abandoned = False
+        self.last_used = time.monotonic()
+        self.__last_response = None
+
+    @property
+    def last_response(self):
+        """The response to the last request, while it is referenced"""
+        return self.__last_response() if self.__last_response is not None else None
+
+    @last_response.setter
+    def last_response(self, response):
+        self.__last_response = weakref.ref(response) if response is not None else None
+
+    def getresponse(self):
+        response = super().getresponse()
+        response.pooled_connection = weakref.ref(self)
+        # HTTPConnection keeps the response until it is read to the end: only
+        # keep a weak reference, so that an abandoned response is collected
+        self._HTTPConnection__response = None
+        self.last_response = response
+        self.last_used = time.monotonic()
+        return response
+
+    def abandon(self):
+        """Closes the connection, whose response won't be read to the end"""
+        self.abandoned = True
+        self.close()
+
+    def release(self):
+        """Closes the connection and makes it available again, e.g. after a failed request"""
+        with self.pool_lock:
+            self.close()
+            self.last_response = None
+            self.checked_out = False
+
+    def is_idle(self):
+        """True if no request is in flight and the last response was fully read.
+
+        Must be called with the pool lock held.
+        """
+        if not self.checked_out:
+            return True
+        if self.abandoned or self.__last_response is None:
+            return False
+        # A response read to the end may have been collected since
+        response = self.last_response
+        return response is None or response.isclosed()
+
+
+class _PooledHTTPConnection(_PooledConnectionMixin, httplib.HTTPConnection):
+    pass
+
+
+class _PooledHTTPSConnection(_PooledConnectionMixin, httplib.HTTPSConnection):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections, one bucket per
+    scheme, host and port.
+
+    A pooled connection is only handed out again once the response to its
+    previous request has been completely read, and is dropped from the pool
+    if that response is closed or garbage collected before. When every
+    connection of a bucket is busy and the bucket is full, a new connection
+    that is not kept in the pool is returned instead of blocking.
+    """
+
+    def __init__(self, *, maxsize=10, idle_timeout=30):
+        """Constructor
+
+        Parameters
+        ----------
+        maxsize : int, optional, default 10
+            maximum number of connections kept per scheme, host and port
+        idle_timeout : float, optional, default 30
+            seconds after which an unused connection is closed rather than
+            reused, as servers drop idle keep-alive sockets
+        """
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+
+    def get_connection(self, host, port, *, ishttps=False):
+        """Returns an idle pooled connection to host:port, or a new one
+
+        Parameters
+        ----------
+        host : str, mandatory
+            host name
+        port : int, mandatory
+            port
+        ishttps : bool, optional, default False
+            'True' for an HTTPS connection
+
+        Returns
+        -------
+        An HTTP(s) connection object
+        """
+        key = ("https" if ishttps else "http", host, port)
+        now = time.monotonic()
+        with self.__lock:
+            bucket = self.__buckets.setdefault(key, [])
+            for conn in list(bucket):
+                if conn.abandoned:
+                    conn.close()
+                    bucket.remove(conn)
+                    continue
+                if not conn.is_idle():
+                    # Closing it would also close the response still being read
+                    continue
+                if now - conn.last_used > self.idle_timeout:
+                    conn.close()
+                    bucket.remove(conn)
+                else:
+                    conn.checked_out = True
+                    conn.reused = True
+                    conn.last_response = None
+                    return conn
+            conn_class = _PooledHTTPSConnection if ishttps else _PooledHTTPConnection
+            conn = conn_class(host, port, pool_lock=self.__lock)
+            conn.checked_out = True
+            if len(bucket) < self.maxsize:
+                bucket.append(conn)
+            return conn
+
+    def clear(self):
+        """Closes and forgets all the pooled connections"""
+        with self.__lock:
+            for bucket in self.__buckets.values():
+                for conn in bucket:
+                    conn.close()
+            self.__buckets.clear()
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(bucket) for bucket in self.__buckets.values())
+
+
+# Pool shared by all the connection handlers, so that every TAP+ service on
+# the same host reuses the same warm connections.
+default_connection_pool = ConnectionPool()
+
+
 class ConnectionHandler:
-    def __init__(self, host, port, sslport):
+    def __init__(self, host, port, sslport, *, pool=None):
         self.__connHost = host
         self.__connPort = port
         self.__connPortSsl = sslport
+        self.__pool = pool if pool is not None else default_connection_pool
 
     def get_connection(self, *, ishttps=False, cookie=None, verbose=False):
         if (ishttps) or (cookie is not None):
@@ -755,7 +960,7 @@ class ConnectionHandler:
         else:
             if verbose:
                 print("------>http")
-            return httplib.HTTPConnection(self.__connHost, self.__connPort)
+            return self.__pool.get_connection(self.__connHost, self.__connPort)
 
     def get_connection_secure(self, verbose):
-        return httplib.HTTPSConnection(self.__connHost, self.__connPortSsl)
+        return self.__pool.get_connection(self.__connHost, self.__connPortSsl, ishttps=True)
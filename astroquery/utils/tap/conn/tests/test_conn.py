@@ -14,10 +14,17 @@ Created on 30 jun. 2016
 
 
 """
+import http.client as httplib
+import gc
+import http.server
 import os
+import threading
 
-from astroquery.utils.tap.conn.tapconn import TapConn
+import pytest
+
+from astroquery.utils.tap.conn.tapconn import TapConn, ConnectionHandler, ConnectionPool
 from astroquery.utils.tap.conn.tests.DummyConn import DummyConn
+from astroquery.utils.tap.core import TapPlus
 
 
 def data_path(filename):
@@ -171,3 +178,231 @@ def test_get_file_from_header():
     result = tap.get_file_from_header(headers)
 
     assert (result == "my_file.vot.gz")
+
+
+class ReadResponse:
+    def __init__(self, closed):
+        self.closed = closed
+
+    def isclosed(self):
+        return self.closed
+
+
+def test_connection_pool_reuse():
+    pool = ConnectionPool(maxsize=2)
+    conn1 = pool.get_connection("testHost", 80)
+    assert isinstance(conn1, httplib.HTTPConnection)
+    assert not conn1.reused
+
+    # conn1 is still checked out: a second connection is created
+    conn2 = pool.get_connection("testHost", 80)
+    assert conn2 is not conn1
+    assert len(pool) == 2
+
+    # Response not read yet: conn1 is still busy, and the pool is full
+    response = ReadResponse(closed=False)
+    conn1.last_response = response
+    conn3 = pool.get_connection("testHost", 80)
+    assert conn3 not in (conn1, conn2)
+    assert len(pool) == 2
+
+    # Response read: conn1 is reused
+    response.closed = True
+    assert pool.get_connection("testHost", 80) is conn1
+    assert conn1.reused
+
+    # Other scheme or port use different connections
+    assert isinstance(pool.get_connection("testHost", 443, ishttps=True), httplib.HTTPSConnection)
+    assert len(pool) == 3
+
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_connection_pool_idle_timeout():
+    pool = ConnectionPool(idle_timeout=10)
+    conn = pool.get_connection("testHost", 80)
+    conn.checked_out = False
+    conn.last_used -= 20
+    assert pool.get_connection("testHost", 80) is not conn
+    assert len(pool) == 1
+
+
+def test_connection_pool_keeps_unread_responses():
+    # A response read slowly must not be closed by other callers of the pool
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "200000")
+            self.end_headers()
+            self.wfile.write(b"x" * 200000)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        pool = ConnectionPool(idle_timeout=10)
+        conn = pool.get_connection("127.0.0.1", server.server_port)
+        conn.request("GET", "/")
+        response = conn.getresponse()
+        data = response.read(1000)
+        conn.last_used -= 20
+
+        other = pool.get_connection("127.0.0.1", server.server_port)
+        assert other is not conn
+        data += response.read()
+        assert len(data) == 200000
+
+        # Fully read and idle for too long: closed and replaced
+        other.release()
+        conn.last_used -= 20
+        pool.get_connection("127.0.0.1", server.server_port)
+        assert conn.sock is None
+        pool.clear()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def keep_alive_server():
+    """Local keep-alive server answering to the launch of async TAP jobs,
+    which records the client port of each request."""
+    client_ports = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            client_ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", "200000")
+            self.end_headers()
+            self.wfile.write(b"x" * 200000)
+
+        def do_POST(self):
+            client_ports.append(self.client_address[1])
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b"<html>See other</html>"
+            self.send_response(303)
+            self.send_header("Location", f"http://127.0.0.1:{self.server.server_port}/tap/async/{len(client_ports)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.client_ports = client_ports
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_pool_async_launches(keep_alive_server):
+    # The body of the redirection returned on launch is read, so that more
+    # jobs than the size of the pool can be launched on the same connection
+    pool = ConnectionPool(maxsize=2)
+    port = keep_alive_server.server_port
+    tap = TapPlus(url=f"http://127.0.0.1:{port}/tap",
+                  connhandler=TapConn(False, "127.0.0.1", server_context="", tap_context="tap", port=port,
+                                      connhandler=ConnectionHandler("127.0.0.1", port, port, pool=pool)))
+    jobs = [tap.launch_job_async("SELECT 1", background=True) for _ in range(5)]
+    assert [job.jobid for job in jobs] == ["1", "2", "3", "4", "5"]
+    assert len(set(keep_alive_server.client_ports)) == 1
+    assert len(pool) == 1
+    pool.clear()
+
+
+def test_connection_pool_abandoned_responses(keep_alive_server):
+    pool = ConnectionPool(maxsize=2)
+    port = keep_alive_server.server_port
+
+    # Closed before being read to the end
+    conn = pool.get_connection("127.0.0.1", port)
+    conn.request("GET", "/")
+    response = conn.getresponse()
+    response.read(1000)
+    response.close()
+    assert conn.abandoned and conn.sock is None
+
+    # Dropped without being read
+    other = pool.get_connection("127.0.0.1", port)
+    other.request("GET", "/")
+    other.getresponse()
+    gc.collect()
+    assert other.abandoned
+
+    # Both are removed from the pool, and a new connection is reused
+    new = pool.get_connection("127.0.0.1", port)
+    assert new not in (conn, other)
+    assert len(pool) == 1
+    new.request("GET", "/")
+    assert len(new.getresponse().read()) == 200000
+    assert pool.get_connection("127.0.0.1", port) is new
+    pool.clear()
+
+
+def test_connection_pool_release():
+    pool = ConnectionPool()
+    conn = pool.get_connection("testHost", 80)
+    conn.release()
+    assert not conn.checked_out
+    assert pool.get_connection("testHost", 80) is conn
+
+
+def test_connection_handler_pool():
+    pool = ConnectionPool()
+    handler = ConnectionHandler("testHost", 80, 443, pool=pool)
+    conn = handler.get_connection()
+    assert (conn.host, conn.port) == ("testHost", 80)
+    assert isinstance(conn, httplib.HTTPConnection)
+    secure = handler.get_connection(cookie="cookie")
+    assert (secure.host, secure.port) == ("testHost", 443)
+    assert isinstance(secure, httplib.HTTPSConnection)
+    assert len(pool) == 2
+
+
+class StaleConn(DummyConn):
+
+    def __init__(self, reused):
+        super().__init__("http")
+        self.httpConn.reused = reused
+        self.httpConn.closed = 0
+        self.httpConn.close = self.close
+        self.fail = True
+        original_getresponse = self.httpConn.getresponse
+
+        def getresponse():
+            if self.fail:
+                self.fail = False
+                raise httplib.RemoteDisconnected("Remote end closed connection without response")
+            return original_getresponse()
+
+        self.httpConn.getresponse = getresponse
+
+    def close(self):
+        self.httpConn.closed += 1
+
+
+def test_stale_connection_retry():
+    conn = StaleConn(reused=True)
+    conn.response.status = 200
+    tap = TapConn(ishttps=False, host="testHost", connhandler=conn)
+    r = tap.execute_tapget(subcontext="sync", verbose=False)
+    assert r.status == 200
+    assert conn.httpConn.closed == 1
+
+    # A brand new connection failing is a genuine error
+    conn = StaleConn(reused=False)
+    tap = TapConn(ishttps=False, host="testHost", connhandler=conn)
+    with pytest.raises(httplib.RemoteDisconnected):
+        tap.execute_tapget(subcontext="sync", verbose=False)
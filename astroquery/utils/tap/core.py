@@ -7,10 +7,14 @@ TAP plus
 """
 import getpass
 import os
+import random
 import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import urlencode
 
 import requests
+from astropy.table import vstack
 from astropy.table.table import Table
 
 from astroquery import log
@@ -246,7 +250,7 @@ class Tap:
 
     def launch_job(self, query, *, name=None, output_file=None, output_format="votable", verbose=False,
                    dump_to_file=False, upload_resource=None, upload_table_name=None, maxrec=None,
-                   format_with_results_compressed=('votable', 'fits', 'ecsv')):
+                   format_with_results_compressed=('votable', 'fits', 'ecsv'), chunk_size=None):
         """Launches a synchronous job
 
         Parameters
@@ -273,6 +277,9 @@ class Tap:
             maximum number of rows to return (TAP ``MAXREC`` parameter)
         format_with_results_compressed: tuple, zipped result formats
             list of result formats that are returned as zipped files
+        chunk_size : int, optional, default None
+            number of bytes read at once from the response while the results
+            are parsed. If not provided, ``utils.DEFAULT_CHUNK_SIZE`` is used
 
         Returns
         -------
@@ -353,7 +360,8 @@ class Tap:
                     print(f"Saving results to: {suitableOutputFile}")
                 self.__connHandler.dump_to_file(suitableOutputFile, response)
             else:
-                results = utils.read_http_response(response, output_format, use_names_over_ids=self.use_names_over_ids)
+                results = utils.read_http_response(response, output_format, use_names_over_ids=self.use_names_over_ids,
+                                                   chunk_size=chunk_size)
                 job.set_results(results)
             if verbose:
                 print("Query finished.")
@@ -455,6 +463,8 @@ class Tap:
             raise requests.exceptions.HTTPError(response.reason)
         else:
             location = self.__connHandler.find_header(response.getheaders(), "location")
+            # Read the body of the redirection, so that the connection can be reused
+            response.read()
             jobid = taputils.get_jobid_from_location(location)
             if verbose:
                 print(f"job {jobid}, at: {location}")
@@ -759,6 +769,13 @@ class TapPlus(Tap):
     Provides TAP and TAP+ capabilities
     """
 
+    # Identifiers sent in a single datalink request: larger lists are split
+    # into batches of this size, submitted concurrently by up to
+    # DATALINK_MAX_WORKERS threads and retried up to DATALINK_MAX_RETRIES times
+    DATALINK_BATCH_SIZE = 1000
+    DATALINK_MAX_WORKERS = 4
+    DATALINK_MAX_RETRIES = 2
+
     def __init__(self, *, url=None,
                  host=None,
                  server_context=None,
@@ -853,7 +870,7 @@ class TapPlus(Tap):
         return self._Tap__load_tables(only_names=only_names, include_shared_tables=include_shared_tables,  # noqa
                                       verbose=verbose)
 
-    def load_data(self, *, params_dict=None, output_file=None, verbose=False):
+    def load_data(self, *, params_dict=None, output_file=None, verbose=False, chunk_size=None):
         """Loads the specified data
 
         Parameters
@@ -865,6 +882,9 @@ class TapPlus(Tap):
             If it is not provided, the http response contents are returned.
         verbose : bool, optional, default 'False'
             flag to display information about the process
+        chunk_size : int, optional, default None
+            number of bytes read at once from the response. If not provided,
+            ``utils.DEFAULT_CHUNK_SIZE`` is used
 
         Returns
         -------
@@ -889,7 +909,7 @@ class TapPlus(Tap):
         if output_file is not None:
             with open(output_file, 'wb') as file:
                 while chunk:
-                    chunk = response.read(8 * 1024)
+                    chunk = response.read(chunk_size or utils.DEFAULT_CHUNK_SIZE)
                     if chunk:
                         file.write(chunk)
             if verbose:
@@ -903,7 +923,8 @@ class TapPlus(Tap):
                     output_format = params_dict['FORMAT'].lower()
                 else:
                     output_format = "votable"
-            results = utils.read_http_response(response, output_format, use_names_over_ids=self.use_names_over_ids)
+            results = utils.read_http_response(response, output_format, use_names_over_ids=self.use_names_over_ids,
+                                               chunk_size=chunk_size)
             if verbose:
                 print("Done.")
             return results
@@ -1244,6 +1265,10 @@ class TapPlus(Tap):
     def get_datalinks(self, ids, *, linking_parameter=None, extra_options=None, verbose=False):
         """Gets datalinks associated to the provided identifiers
 
+        Lists of more than ``DATALINK_BATCH_SIZE`` identifiers are split into
+        batches, which are retrieved concurrently and stacked into a single
+        table.
+
         Parameters
         ----------
         ids : str list, mandatory
@@ -1268,13 +1293,32 @@ class TapPlus(Tap):
 
         if ids is None:
             raise ValueError("Missing mandatory argument 'ids'")
-        if isinstance(ids, str):
-            ids_arg = f"ID={ids}"
-        else:
-            if isinstance(ids, int):
-                ids_arg = f"ID={str(ids)}"
+        batches = taputils.split_ids(ids, self.DATALINK_BATCH_SIZE)
+        if len(batches) <= 1:
+            if isinstance(ids, str):
+                ids_arg = ids
+            elif isinstance(ids, int):
+                ids_arg = str(ids)
             else:
-                ids_arg = f"ID={','.join(str(item) for item in ids)}"
+                ids_arg = ','.join(str(item) for item in ids)
+            results = self.__get_datalinks_batch(ids_arg, linking_parameter=linking_parameter,
+                                                 extra_options=extra_options, verbose=verbose)
+        else:
+            if verbose:
+                print(f"Retrieving datalink in {len(batches)} batches of up to {self.DATALINK_BATCH_SIZE} "
+                      f"identifiers.")
+            tables = taputils.run_batches(
+                lambda batch: self.__get_datalinks_batch(batch, linking_parameter=linking_parameter,
+                                                         extra_options=extra_options, verbose=verbose),
+                batches, max_workers=self.DATALINK_MAX_WORKERS, max_retries=self.DATALINK_MAX_RETRIES,
+                description="Datalink batch")
+            results = vstack(tables, metadata_conflicts='silent')
+        if verbose:
+            print("Done.")
+        return results
+
+    def __get_datalinks_batch(self, ids_arg, *, linking_parameter=None, extra_options=None, verbose=False):
+        ids_arg = f"ID={ids_arg}"
 
         if linking_parameter is not None:
             ids_arg = f'{ids_arg}&LINKING_PARAMETER={linking_parameter}'
@@ -1290,11 +1334,7 @@ class TapPlus(Tap):
         if verbose:
             print(response.status, response.reason)
         conn_handler.check_launch_response_status(response, verbose, 200)
-        if verbose:
-            print("Done.")
-        results = utils.read_http_response(response, "votable", use_names_over_ids=self.use_names_over_ids)
-
-        return results
+        return utils.read_http_response(response, "votable", use_names_over_ids=self.use_names_over_ids)
 
     def remove_jobs(self, jobs_list, *, verbose=False):
         """Removes the specified jobs
@@ -1329,6 +1369,140 @@ class TapPlus(Tap):
         msg = f"Removed jobs: '{jobs_list}'."
         log.info(msg)
 
+    def launch_jobs_async(self, queries, *, names=None, output_format=None, dump_to_file=False,
+                          max_running=4, max_downloads=4, verbose=False):
+        """Launches a group of asynchronous jobs and returns them as they finish
+
+        At most ``max_running`` jobs are active on the server at any time; the
+        remaining queries are submitted as running jobs finish. The phases of
+        the active jobs are followed in a single polling loop and the results
+        of the finished jobs are downloaded in parallel.
+
+        Parameters
+        ----------
+        queries : iterable of str, mandatory
+            queries to be executed
+        names : iterable of str, optional, default None
+            custom names of the jobs, one per query
+        output_format : str, optional, default None
+            results format. If not provided, the default of
+            ``launch_job_async`` is used
+        dump_to_file : bool, optional, default 'False'
+            if True, the results are saved in files instead of using memory
+        max_running : int, optional, default 4
+            maximum number of jobs submitted to the server at the same time
+        max_downloads : int, optional, default 4
+            maximum number of results downloaded at the same time
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A generator of Job objects, in completion order. Their results are
+        loaded (or saved, if ``dump_to_file`` is True). Jobs that could not be
+        launched or completed, or whose phase could not be retrieved, have
+        their ``failed`` attribute set to True. If the generator is closed before
+        all the jobs are returned, the jobs still running are aborted.
+        """
+        queries = list(queries)
+        names = [None] * len(queries) if names is None else list(names)
+        if len(names) != len(queries):
+            raise ValueError("The number of names must match the number of queries")
+        launch_args = {'dump_to_file': dump_to_file, 'background': True, 'verbose': verbose}
+        if output_format is not None:
+            launch_args['output_format'] = output_format
+
+        to_launch = list(zip(queries, names))
+        running = {}
+        downloads = set()
+        interval = Job.POLL_INITIAL_INTERVAL
+        executor = ThreadPoolExecutor(max_workers=max_downloads)
+        try:
+            while to_launch or running or downloads:
+                while to_launch and len(running) < max_running:
+                    query, name = to_launch.pop(0)
+                    try:
+                        job = self.launch_job_async(query, name=name, **launch_args)
+                    except Exception as ex:
+                        # one query that cannot be launched must not stop the others
+                        log.warning(f"Could not launch query '{query}': {ex}")
+                        job = Job(async_job=True, query=query, connhandler=self.__getconnhandler(),
+                                  use_names_over_ids=self.use_names_over_ids)
+                        job.name = name
+                        job._phase = 'ERROR'
+                        job.failed = True
+                        yield job
+                        continue
+                    running[job.jobid] = job
+                    interval = Job.POLL_INITIAL_INTERVAL
+
+                for jobid, job in list(running.items()):
+                    try:
+                        phase = job.get_phase(update=True)
+                    except requests.exceptions.HTTPError as ex:
+                        # one job that cannot be followed must not stop the others
+                        log.warning(f"Could not retrieve the phase of job {jobid}: {ex}")
+                        del running[jobid]
+                        job.failed = True
+                        yield job
+                        continue
+                    phase = phase.upper().strip()
+                    if phase in ('PENDING', 'QUEUED', 'EXECUTING'):
+                        continue
+                    del running[jobid]
+                    job._phase = phase
+                    if verbose:
+                        print(f"Job {jobid} finished: {phase}")
+                    if phase == 'COMPLETED':
+                        downloads.add(executor.submit(self.__retrieve_job_results, job,
+                                                      dump_to_file=dump_to_file, verbose=verbose))
+                    else:
+                        job.failed = True
+                        yield job
+
+                if downloads:
+                    # Waiting for downloads also paces the polling of the running jobs
+                    done, downloads = wait(downloads, timeout=interval if running else None,
+                                           return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                elif running:
+                    time.sleep(random.uniform(interval / 2, interval))
+                interval = min(interval * Job.POLL_BACKOFF_FACTOR, Job.POLL_MAX_INTERVAL)
+        finally:
+            # Reached when the generator is closed (or fails) before all the
+            # jobs are returned: the jobs still active on the server are aborted
+            for job in running.values():
+                self.__abort_job(job, verbose=verbose)
+            executor.shutdown(cancel_futures=True)
+
+    def __abort_job(self, job, *, verbose=False):
+        # Job.abort only handles PENDING jobs, but UWS allows aborting a job in any phase
+        try:
+            response = self.__getconnhandler().execute_tappost(
+                subcontext=f"async/{job.jobid}/phase", data=urlencode({"PHASE": "ABORT"}), verbose=verbose)
+            if response.status not in (200, 303):
+                raise requests.exceptions.HTTPError(taputils.get_http_response_error(response))
+            # Read the body, so that the connection can be reused
+            response.read()
+        except Exception as ex:
+            log.warning(f"Could not abort job {job.jobid}: {ex}")
+            return
+        job._phase = 'ABORTED'
+        job.failed = True
+
+    @staticmethod
+    def __retrieve_job_results(job, *, dump_to_file=False, verbose=False):
+        try:
+            if dump_to_file:
+                job.save_results(verbose=verbose)
+            else:
+                job.get_results()
+        except Exception as ex:
+            log.warning(f"Could not retrieve the results of job {job.jobid}: {ex}")
+            job.failed = True
+        return job
+
     def __execLogin(self, usr, pwd, *, verbose=False):
         subContext = "login"
         args = {
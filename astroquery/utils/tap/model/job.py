@@ -5,8 +5,10 @@ TAP plus
 =============
 """
 import os
+import random
 import time
 from urllib.parse import urlencode
+from xml.etree import ElementTree
 
 import requests
 from astropy.io.votable.tree import VOTableFile
@@ -23,6 +25,15 @@ class Job:
     """Job class
     """
 
+    # Seconds a UWS 1.1 server is asked to block while the job is active
+    # (WAIT parameter), before falling back to polling
+    WAIT_TIME = 30
+    # Polling interval (seconds): starts at POLL_INITIAL_INTERVAL and grows
+    # by POLL_BACKOFF_FACTOR up to POLL_MAX_INTERVAL, with random jitter
+    POLL_INITIAL_INTERVAL = 0.5
+    POLL_MAX_INTERVAL = 30
+    POLL_BACKOFF_FACTOR = 1.5
+
     def __init__(self, async_job, *, query=None, connhandler=None, use_names_over_ids=False):
         """Constructor
 
@@ -64,6 +75,11 @@ class Job:
         self.locationId = None
         self.name = None
         self.quote = None
+        # number of requests made to follow the job phase, and the total
+        # time (seconds) spent in them
+        self.poll_count = 0
+        self.poll_latency = 0.0
+        self.__wait_supported = None
 
         self.connHandler = connhandler
         self.parameters = {}
@@ -176,6 +192,7 @@ class Job:
         """
         if update:
             phase_request = f"async/{self.jobid}/phase"
+            start = time.monotonic()
             response = self.connHandler.execute_tapget(phase_request)
 
             self.__last_phase_response_status = response.status
@@ -185,8 +202,48 @@ class Job:
                 raise requests.exceptions.HTTPError(err_msg)
 
             self._phase = str(response.read().decode('utf-8'))
+            self.poll_count += 1
+            self.poll_latency += time.monotonic() - start
         return self._phase
 
+    def __wait_for_phase_change(self, phase, *, verbose=False):
+        """Blocks on the job resource with the UWS 1.1 WAIT parameter.
+
+        Returns the new phase, or None if the blocking request failed, in
+        which case the phase is polled instead this time. A server that
+        ignores WAIT is not sent blocking requests any more.
+        """
+        wait_request = f"async/{self.jobid}?{urlencode({'WAIT': self.WAIT_TIME, 'PHASE': phase})}"
+        start = time.monotonic()
+        try:
+            response = self.connHandler.execute_tapget(wait_request, verbose=verbose)
+            if response.status != 200:
+                response.read()
+                return None
+            root = ElementTree.fromstring(response.read())
+        except Exception as ex:
+            if verbose:
+                print("Blocking wait not available:", ex)
+            return None
+        elapsed = time.monotonic() - start
+        self.poll_count += 1
+        self.poll_latency += elapsed
+
+        new_phase = None
+        for element in root.iter():
+            if element.tag.split('}')[-1].lower() == 'phase':
+                new_phase = (element.text or '').strip()
+                break
+        if not new_phase:
+            return None
+        # A UWS 1.0 server ignores WAIT and answers straight away
+        if new_phase.upper() == phase and elapsed < 1:
+            self.__wait_supported = False
+            return None
+        self.__last_phase_response_status = response.status
+        self._phase = new_phase
+        return new_phase
+
     def set_response_status(self, status, msg):
         """Sets the HTTP(s) connection status
 
@@ -211,11 +268,17 @@ class Job:
         """
         return self.get_results()
 
-    def get_results(self):
+    def get_results(self, *, chunk_size=None):
         """Returns the job results
         This method will block if the job is asynchronous and the job has not
         finished yet.
 
+        Parameters
+        ----------
+        chunk_size : int, optional, default None
+            number of bytes read at once from the server while the results are
+            parsed. If not provided, ``utils.DEFAULT_CHUNK_SIZE`` is used
+
         Returns
         -------
         The job results (astropy.table).
@@ -225,9 +288,7 @@ class Job:
         # try load results from file
         # read_results_table_from_file checks whether
         # the file already exists or not
-        output_format = self.parameters['format']
-        if 'responseformat' in self.parameters:
-            output_format = self.parameters['responseformat']
+        output_format = self.__get_results_format()
 
         results = modelutils.read_results_table_from_file(self.outputFile,
                                                           output_format, use_names_over_ids=self.use_names_over_ids)
@@ -240,9 +301,70 @@ class Job:
             return None
         else:
             # async: result is in the server once the job is finished
-            self.__load_async_job_results()
+            self.__load_async_job_results(chunk_size=chunk_size)
             return self.results
 
+    def iter_results(self, chunk_rows=100000, *, output_file=None, verbose=False, chunk_size=None):
+        """Returns the job results as successive tables of ``chunk_rows`` rows
+
+        The results are parsed incrementally, from the results file if it
+        exists or from the server otherwise, so that results that do not fit
+        in memory can be processed chunk by chunk. This method will block if
+        the job is asynchronous and the job has not finished yet.
+
+        VOTable and ECSV results declare the types of their columns, which
+        are the same in all chunks. The types of CSV columns are guessed for
+        each chunk and widened (integer, then float, then string) from a
+        chunk to the next, so they may change along the results.
+
+        Parameters
+        ----------
+        chunk_rows : int, optional, default 100000
+            number of rows of each table (the last one may be shorter)
+        output_file : str, optional, default None
+            Parquet ('.parquet', '.pq') or HDF5 ('.h5', '.hdf5') file where
+            the chunks are appended as they are returned, see
+            `~astroquery.utils.tap.xmlparser.utils.TableChunkWriter`
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+        chunk_size : int, optional, default None
+            number of bytes read at once from the server. If not provided,
+            ``utils.DEFAULT_CHUNK_SIZE`` is used
+
+        Returns
+        -------
+        A generator of tables (astropy.table).
+        """
+        if output_file is not None:
+            with utils.TableChunkWriter(output_file) as writer:
+                for chunk in self.iter_results(chunk_rows, verbose=verbose, chunk_size=chunk_size):
+                    writer.write(chunk)
+                    yield chunk
+            if verbose:
+                print(f"Saved {writer.rows} rows to: {output_file}")
+            return
+
+        if self.results is not None:
+            for start in range(0, max(len(self.results), 1), chunk_rows):
+                yield self.results[start:start + chunk_rows]
+            return
+
+        output_format = self.__get_results_format()
+        chunks = modelutils.iter_results_table_from_file(self.outputFile, output_format, chunk_rows,
+                                                         use_names_over_ids=self.use_names_over_ids)
+        if chunks is not None:
+            if verbose:
+                print(f"Reading results from: {self.outputFile}")
+            yield from chunks
+        elif self.async_:
+            # async: result is in the server once the job is finished
+            resultsResponse = self.__get_async_results_response(debug=verbose)
+            yield from utils.iter_http_response(resultsResponse, output_format, chunk_rows,
+                                                use_names_over_ids=self.use_names_over_ids, chunk_size=chunk_size)
+        else:
+            # sync: cannot access server again
+            log.info("No results to iterate over")
+
     def set_results(self, results):
         """Sets the job results
 
@@ -318,6 +440,12 @@ class Job:
     def wait_for_job_end(self, *, verbose=False):
         """Waits until a job is finished
 
+        If the server supports it, the UWS 1.1 blocking ``WAIT`` parameter
+        is used so that the server answers when the job phase changes.
+        Otherwise, the phase is polled with an exponential backoff (see the
+        ``POLL_*`` class attributes). The number of requests and the time
+        spent in them are available in ``poll_count`` and ``poll_latency``.
+
         Parameters
         ----------
         verbose : bool, optional, default 'False'
@@ -335,8 +463,9 @@ class Job:
                 # ignore
                 if verbose:
                     print("Exception when trying to start job", ex)
+        responseData = self.get_phase(update=True)
+        interval = self.POLL_INITIAL_INTERVAL
         while True:
-            responseData = self.get_phase(update=True)
             currentResponse = self.__last_phase_response_status
 
             lphase = responseData.upper().strip()
@@ -346,10 +475,22 @@ class Job:
                 break
             # PENDING, QUEUED, EXECUTING, COMPLETED, ERROR, ABORTED, UNKNOWN,
             # HELD, SUSPENDED, ARCHIVED:
-            time.sleep(0.5)
+            if self.__wait_supported is not False:
+                responseData = self.__wait_for_phase_change(lphase, verbose=verbose)
+                if responseData is not None:
+                    continue
+            time.sleep(random.uniform(interval / 2, interval))
+            interval = min(interval * self.POLL_BACKOFF_FACTOR, self.POLL_MAX_INTERVAL)
+            responseData = self.get_phase(update=True)
         return currentResponse, lphase
 
-    def __load_async_job_results(self, *, debug=False):
+    def __load_async_job_results(self, *, debug=False, chunk_size=None):
+        resultsResponse = self.__get_async_results_response(debug=debug)
+        results = utils.read_http_response(resultsResponse, self.__get_results_format(),
+                                           use_names_over_ids=self.use_names_over_ids, chunk_size=chunk_size)
+        self.set_results(results)
+
+    def __get_async_results_response(self, *, debug=False):
         wjResponse, phase = self.wait_for_job_end()
         subContext = f"async/{self.jobid}/results/result"
         resultsResponse = self.connHandler.execute_tapget(subContext)
@@ -364,19 +505,17 @@ class Job:
         if phase == 'ERROR':
             err_msg = self.get_error(verbose=debug)
             raise SystemError(err_msg)
-        else:
-            if is_error:
-                err_msg = taputils.get_http_response_error(resultsResponse)
-                print(resultsResponse.status, err_msg)
-                raise requests.exceptions.HTTPError(err_msg)
-            else:
-                output_format = self.parameters['format']
-                if 'responseformat' in self.parameters:
-                    output_format = self.parameters['responseformat']
+        elif is_error:
+            err_msg = taputils.get_http_response_error(resultsResponse)
+            print(resultsResponse.status, err_msg)
+            raise requests.exceptions.HTTPError(err_msg)
+        return resultsResponse
 
-                results = utils.read_http_response(resultsResponse, output_format,
-                                                   use_names_over_ids=self.use_names_over_ids)
-                self.set_results(results)
+    def __get_results_format(self):
+        output_format = self.parameters['format']
+        if 'responseformat' in self.parameters:
+            output_format = self.parameters['responseformat']
+        return output_format
 
     def __handle_redirect_if_required(self, resultsResponse, *, verbose=False):
         # Thanks @emeraldTree24
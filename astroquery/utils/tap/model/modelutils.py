@@ -77,3 +77,23 @@ def read_results_table_from_file(file_name, output_format, *, correct_units=True
             return result
     else:
         return None
+
+
+def iter_results_table_from_file(file_name, output_format, chunk_rows, *, correct_units=True,
+                                 use_names_over_ids=False):
+    """Reads the results saved in a file into successive tables of
+    ``chunk_rows`` rows (see `~astroquery.utils.tap.xmlparser.utils.iter_http_response`)
+
+    Returns
+    -------
+    A generator of tables, or None if the file does not exist
+    """
+    if not check_file_exists(file_name):
+        return None
+    return _iter_file_chunks(file_name, output_format, chunk_rows, correct_units=correct_units,
+                             use_names_over_ids=use_names_over_ids)
+
+
+def _iter_file_chunks(file_name, output_format, chunk_rows, **kwargs):
+    with open(file_name, 'rb') as f:
+        yield from utils.iter_http_response(f, output_format, chunk_rows, **kwargs)
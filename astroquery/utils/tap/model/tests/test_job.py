@@ -14,6 +14,7 @@ Created on 30 jun. 2016
 
 
 """
+import io
 import os
 from pathlib import Path
 
@@ -111,6 +112,47 @@ def test_job_get_results(capsys, tmpdir, extension, output_format):
         p.unlink()
 
 
+@pytest.mark.parametrize("output_format", ['votable', 'ecsv', 'csv'])
+def test_job_iter_results(tmp_path, output_format):
+    table = Table({'source_id': range(25), 'ra': [float(i) for i in range(25)]})
+    if output_format == 'votable':
+        data = io.BytesIO()
+        from_table(table).to_xml(data)
+        body = data.getvalue().decode()
+    else:
+        data = io.StringIO()
+        table.write(data, format=f"ascii.{output_format}")
+        body = data.getvalue()
+
+    job = Job(async_job=True)
+    jobid = "12345"
+    job.jobid = jobid
+    job.parameters['format'] = output_format
+    connHandler = DummyConnHandler()
+    responseCheckPhase = DummyResponse(200)
+    responseCheckPhase.set_data(method='GET', body='COMPLETED')
+    connHandler.set_response(f"async/{jobid}/phase", responseCheckPhase)
+    responseGetData = DummyResponse(200)
+    responseGetData.set_data(method='GET', body=body)
+    connHandler.set_response(f"async/{jobid}/results/result", responseGetData)
+    job.connHandler = connHandler
+
+    # From the server
+    chunks = list(job.iter_results(10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[2]['source_id']) == [20, 21, 22, 23, 24]
+    assert job.results is None
+
+    # From the results file
+    job.outputFile = str(tmp_path / f"result.{output_format}")
+    Path(job.outputFile).write_text(body)
+    assert [len(chunk) for chunk in job.iter_results(20)] == [20, 5]
+
+    # From memory
+    job.set_results(table)
+    assert [len(chunk) for chunk in job.iter_results(25)] == [25]
+
+
 @pytest.mark.parametrize("extension, output_format",
                          [('.vot', 'votable'), ('.xml', 'votable'), ('.ecsv', 'ecsv'), ('.csv', 'csv'),
                           ('.fits', 'fits')])
@@ -174,3 +216,95 @@ def test_job_phase():
     except ValueError:
         # ok
         pass
+
+
+class ScriptedConnHandler(DummyConnHandler):
+    """Answers the phase and blocking wait requests of a job in turn."""
+
+    def __init__(self, phases, *, wait_supported, wait_failures=0):
+        super().__init__()
+        self.phases = list(phases)
+        self.wait_supported = wait_supported
+        self.wait_failures = wait_failures
+        self.requests = []
+
+    def execute_tapget(self, request=None, verbose=False):
+        self.requests.append(request)
+        response = DummyResponse(200)
+        if request.endswith("/phase"):
+            response.set_data(method='GET', body=self.phases.pop(0))
+        elif self.wait_failures:
+            self.wait_failures -= 1
+            response.set_status_code(503)
+            response.set_data(method='GET', body='Service unavailable')
+        else:
+            # A server without WAIT support answers straight away with the current phase
+            phase = self.phases.pop(0) if self.wait_supported else self.phases[0]
+            response.set_data(method='GET', body=(
+                '<uws:job xmlns:uws="http://www.ivoa.net/xml/UWS/v1.0">'
+                f'<uws:jobId>12345</uws:jobId><uws:phase>{phase}</uws:phase>'
+                '</uws:job>'))
+        return response
+
+
+def test_wait_for_job_end_blocking(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    job = Job(async_job=True)
+    job.jobid = "12345"
+    job.connHandler = ScriptedConnHandler(["QUEUED", "EXECUTING", "COMPLETED"], wait_supported=True)
+    # Pretend the server blocked for a while before answering
+    times = iter(range(0, 100, 5))
+    monkeypatch.setattr("time.monotonic", lambda: next(times))
+
+    status, phase = job.wait_for_job_end()
+
+    assert (status, phase) == (200, "COMPLETED")
+    assert job.connHandler.requests == ["async/12345/phase",
+                                        "async/12345?WAIT=30&PHASE=QUEUED",
+                                        "async/12345?WAIT=30&PHASE=EXECUTING"]
+    assert sleeps == []
+    assert job.poll_count == 3
+    assert job.poll_latency == 15
+
+
+def test_wait_for_job_end_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    job = Job(async_job=True)
+    job.jobid = "12345"
+    job.POLL_MAX_INTERVAL = 1
+    job.connHandler = ScriptedConnHandler(["EXECUTING"] * 5 + ["COMPLETED"], wait_supported=False)
+
+    status, phase = job.wait_for_job_end()
+
+    assert (status, phase) == (200, "COMPLETED")
+    # A single attempt to block, then plain polling
+    assert job.connHandler.requests.count("async/12345?WAIT=30&PHASE=EXECUTING") == 1
+    assert job.connHandler.requests.count("async/12345/phase") == 6
+    assert job.poll_count == 7
+    assert len(sleeps) == 5
+    assert sleeps[0] <= 0.5
+    assert all(0.5 <= s <= 1 for s in sleeps[2:])
+
+
+def test_wait_for_job_end_transient_wait_failure(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    job = Job(async_job=True)
+    job.jobid = "12345"
+    job.connHandler = ScriptedConnHandler(["QUEUED", "QUEUED", "EXECUTING", "COMPLETED"],
+                                          wait_supported=True, wait_failures=1)
+    times = iter(range(0, 100, 5))
+    monkeypatch.setattr("time.monotonic", lambda: next(times))
+
+    status, phase = job.wait_for_job_end()
+
+    assert (status, phase) == (200, "COMPLETED")
+    # The failed blocking request is replaced by a single poll, then WAIT is used again
+    assert job.connHandler.requests == ["async/12345/phase",
+                                        "async/12345?WAIT=30&PHASE=QUEUED",
+                                        "async/12345/phase",
+                                        "async/12345?WAIT=30&PHASE=QUEUED",
+                                        "async/12345?WAIT=30&PHASE=EXECUTING"]
+    assert len(sleeps) == 1
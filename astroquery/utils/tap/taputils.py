@@ -16,9 +16,13 @@ Created on 30 jun. 2016
 """
 
 import re
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 
+from astroquery import log
+
 TAP_UTILS_QUERY_TOP_PATTERN = re.compile(
     r"\s*SELECT\s+(ALL\s+|DISTINCT\s+)?TOP\s+\d+\s+", re.IGNORECASE)
 TAP_UTILS_QUERY_ALL_DISTINCT_PATTERN = re.compile(
@@ -315,3 +319,81 @@ def get_suitable_output_file_name_for_current_output_format(output_file, output_
             warnings.warn(f'The output format selected is not compatible with compression. {output_file}'
                           f' will be renamed to {output_file_renamed}')
     return output_file_with_extension
+
+
+def split_ids(ids, batch_size):
+    """Splits a list of identifiers into batches
+
+    Parameters
+    ----------
+    ids : str, int, str list or int list, mandatory
+        identifiers; a string is taken as a comma-separated list
+    batch_size : int, mandatory
+        maximum number of identifiers of each batch
+
+    Returns
+    -------
+    A list of comma-separated identifiers strings
+    """
+    if isinstance(ids, str):
+        ids = [item.strip() for item in ids.split(',') if item.strip()]
+    elif isinstance(ids, int):
+        ids = [ids]
+    ids = [str(item) for item in ids]
+    return [','.join(ids[start:start + batch_size]) for start in range(0, len(ids), batch_size)]
+
+
+def run_batches(function, batches, *, max_workers=4, max_retries=2, retry_delay=1, description="Batch"):
+    """Calls ``function`` for each batch on a pool of threads
+
+    Failed batches are retried up to ``max_retries`` times, with an exponential
+    backoff. The progress and the time spent in each batch are logged.
+
+    Parameters
+    ----------
+    function : callable, mandatory
+        function called with each batch as argument
+    batches : list, mandatory
+        batches to be processed
+    max_workers : int, optional, default 4
+        maximum number of batches processed at the same time
+    max_retries : int, optional, default 2
+        number of times a failed batch is retried before giving up
+    retry_delay : float, optional, default 1
+        seconds before the first retry, doubled for each new attempt
+    description : str, optional, default 'Batch'
+        name of the batches in the log messages
+
+    Returns
+    -------
+    The list of results of ``function``, in the order of ``batches``.
+    If a batch still fails after all the retries, its exception is raised.
+    """
+    total = len(batches)
+
+    def run(index):
+        for attempt in range(max_retries + 1):
+            start = time.monotonic()
+            try:
+                return function(batches[index]), time.monotonic() - start
+            except Exception as err:
+                if attempt == max_retries:
+                    raise
+                delay = retry_delay * 2 ** attempt
+                log.warning(f"{description} {index + 1}/{total} failed ({err}), retrying in {delay} s")
+                time.sleep(delay)
+
+    results = [None] * total
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as executor:
+        futures = {executor.submit(run, index): index for index in range(total)}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                results[index], elapsed = future.result()
+                log.info(f"{description} {index + 1}/{total} done in {elapsed:.2f} s "
+                         f"({done}/{total} completed)")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
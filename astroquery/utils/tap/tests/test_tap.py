@@ -611,6 +611,135 @@ def test_list_async_jobs():
     assert jobs[1].get_phase() == 'ERROR'
 
 
+def test_launch_jobs_async(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap", connhandler=conn_handler)
+    for query, jobid in [('query1', '12345'), ('query2', '77777')]:
+        responseLaunchJob = DummyResponse(303)
+        responseLaunchJob.set_data(method='POST', headers=[['location', f'http://test:1111/tap/async/{jobid}']])
+        dictTmp = {
+            "REQUEST": "doQuery",
+            "LANG": "ADQL",
+            "FORMAT": "votable",
+            "tapclient": str(tap.tap_client_id),
+            "PHASE": "RUN",
+            "QUERY": query}
+        sortedKey = taputils.taputil_create_sorted_dict_key(dictTmp)
+        conn_handler.set_response(f"async?{sortedKey}", responseLaunchJob)
+        responsePhase = DummyResponse(200)
+        responsePhase.set_data(method='GET', body="COMPLETED" if jobid == '12345' else "ERROR")
+        conn_handler.set_response(f"async/{jobid}/phase", responsePhase)
+    responseResultsJob = DummyResponse(200)
+    responseResultsJob.set_data(method='GET', body=TEST_DATA["job_1.vot"])
+    conn_handler.set_response("async/12345/results/result", responseResultsJob)
+    requests = []
+    execute_tapget = conn_handler.execute_tapget
+
+    def record_tapget(request=None, verbose=False):
+        requests.append(request)
+        return execute_tapget(request, verbose)
+
+    monkeypatch.setattr(conn_handler, 'execute_tapget', record_tapget)
+
+    with pytest.raises(ValueError):
+        list(tap.launch_jobs_async(['query1', 'query2'], names=['name1']))
+
+    jobs = {job.jobid: job for job in tap.launch_jobs_async(['query1', 'query2'], max_running=1)}
+    assert set(jobs) == {'12345', '77777'}
+    # Only the phases of the jobs in flight are requested, not the whole job list
+    assert "async" not in requests
+    assert "async/12345/phase" in requests and "async/77777/phase" in requests
+    assert jobs['12345'].failed is False
+    assert jobs['12345'].get_phase() == 'COMPLETED'
+    assert len(jobs['12345'].get_results()) == 3
+    assert jobs['77777'].failed is True
+    assert jobs['77777'].get_phase() == 'ERROR'
+
+
+def _set_launch_jobs_responses(conn_handler, tap, phases):
+    for query, jobid, phase in phases:
+        responseLaunchJob = DummyResponse(303)
+        responseLaunchJob.set_data(method='POST', headers=[['location', f'http://test:1111/tap/async/{jobid}']])
+        dictTmp = {
+            "REQUEST": "doQuery",
+            "LANG": "ADQL",
+            "FORMAT": "votable",
+            "tapclient": str(tap.tap_client_id),
+            "PHASE": "RUN",
+            "QUERY": query}
+        sortedKey = taputils.taputil_create_sorted_dict_key(dictTmp)
+        conn_handler.set_response(f"async?{sortedKey}", responseLaunchJob)
+        responsePhase = DummyResponse(200 if phase else 500)
+        responsePhase.set_data(method='GET', body=phase or "Internal error")
+        conn_handler.set_response(f"async/{jobid}/phase", responsePhase)
+
+
+def test_launch_jobs_async_phase_error(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap", connhandler=conn_handler)
+    _set_launch_jobs_responses(conn_handler, tap, [('query1', '12345', "COMPLETED"), ('query2', '77777', None)])
+    responseResultsJob = DummyResponse(200)
+    responseResultsJob.set_data(method='GET', body=TEST_DATA["job_1.vot"])
+    conn_handler.set_response("async/12345/results/result", responseResultsJob)
+
+    jobs = {job.jobid: job for job in tap.launch_jobs_async(['query1', 'query2'])}
+    assert set(jobs) == {'12345', '77777'}
+    assert jobs['12345'].failed is False
+    assert len(jobs['12345'].get_results()) == 3
+    assert jobs['77777'].failed is True
+
+
+def test_launch_jobs_async_launch_error(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap", connhandler=conn_handler)
+    _set_launch_jobs_responses(conn_handler, tap, [('query1', '12345', "COMPLETED"), ('query3', '77777', "COMPLETED")])
+    responseLaunchJob = DummyResponse(500)
+    responseLaunchJob.set_data(method='POST', body="Internal error")
+    dictTmp = {
+        "REQUEST": "doQuery",
+        "LANG": "ADQL",
+        "FORMAT": "votable",
+        "tapclient": str(tap.tap_client_id),
+        "PHASE": "RUN",
+        "QUERY": 'query2'}
+    conn_handler.set_response(f"async?{taputils.taputil_create_sorted_dict_key(dictTmp)}", responseLaunchJob)
+    for jobid in ('12345', '77777'):
+        responseResultsJob = DummyResponse(200)
+        responseResultsJob.set_data(method='GET', body=TEST_DATA["job_1.vot"])
+        conn_handler.set_response(f"async/{jobid}/results/result", responseResultsJob)
+
+    # The query that cannot be launched is reported as a failed job
+    jobs = list(tap.launch_jobs_async(['query1', 'query2', 'query3']))
+    assert len(jobs) == 3
+    failed = [job for job in jobs if job.failed]
+    assert len(failed) == 1
+    assert failed[0].parameters['query'] == 'query2'
+    assert failed[0].jobid is None
+    assert failed[0].get_phase() == 'ERROR'
+    assert sorted(job.jobid for job in jobs if not job.failed) == ['12345', '77777']
+
+
+def test_launch_jobs_async_close(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap", connhandler=conn_handler)
+    _set_launch_jobs_responses(conn_handler, tap, [('query1', '12345', "ERROR"), ('query2', '77777', "EXECUTING")])
+    responseAbort = DummyResponse(303)
+    responseAbort.set_data(method='POST')
+    conn_handler.set_response("async/77777/phase?PHASE=ABORT", responseAbort)
+
+    jobs = tap.launch_jobs_async(['query1', 'query2', 'query3'], max_running=2)
+    job = next(jobs)
+    assert job.jobid == '12345'
+    assert job.failed is True
+    jobs.close()
+    # The running job is aborted and the pending query is never launched
+    assert conn_handler.request == "async/77777/phase?PHASE=ABORT"
+
+
 def test_data():
     conn_handler = DummyConnHandler()
     tap = TapPlus(url="http://test:1111/tap",
@@ -675,6 +804,50 @@ def test_datalink():
     assert len(results) == 3
 
 
+def test_datalink_batches(monkeypatch):
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap",
+                  datalink_context="datalink",
+                  connhandler=conn_handler)
+    monkeypatch.setattr(tap, "DATALINK_BATCH_SIZE", 2)
+    monkeypatch.setattr(taputils.time, "sleep", lambda seconds: None)
+    for ids in ("1,2", "3,4", "5"):
+        response = DummyResponse(200)
+        response.set_data(method='GET', body=TEST_DATA["job_1.vot"])
+        conn_handler.set_response(f"links?ID={ids}", response)
+
+    results = tap.get_datalinks([1, 2, 3, 4, 5])
+    assert len(results) == 9
+    results = tap.get_datalinks("1, 2, 3, 4, 5", verbose=True)
+    assert len(results) == 9
+
+    with pytest.raises(Exception):
+        # Unknown batch
+        tap.get_datalinks("1,2,3,4,5,6")
+
+
+def test_run_batches(monkeypatch):
+    monkeypatch.setattr(taputils.time, "sleep", lambda seconds: None)
+    attempts = {}
+
+    def square(batch):
+        attempts[batch] = attempts.get(batch, 0) + 1
+        if batch == 3 and attempts[batch] < 3:
+            raise ConnectionError("Transient failure")
+        return batch * batch
+
+    assert taputils.run_batches(square, [1, 2, 3, 4], max_workers=2, max_retries=2) == [1, 4, 9, 16]
+    assert attempts[3] == 3
+
+    attempts.clear()
+    with pytest.raises(ConnectionError):
+        taputils.run_batches(square, [1, 2, 3, 4], max_workers=2, max_retries=1)
+
+    assert taputils.split_ids("1, 2,3", 2) == ["1,2", "3"]
+    assert taputils.split_ids(range(5), 5) == ["0,1,2,3,4"]
+    assert taputils.split_ids(7, 5) == ["7"]
+
+
 def test_get_new_column_values_for_update():
     # Different column (no modifications)
     list_of_changes = [['column2', 'flags', 'Dec'],
@@ -15,8 +15,16 @@ Created on 30 jun. 2016
 
 """
 
+import gzip
+import io
 import os
 
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.io.votable import from_table
+from astropy.table import MaskedColumn, Table, vstack
+
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap.xmlparser.jobListSaxParser import JobListSaxParser
 from astroquery.utils.tap.xmlparser.jobSaxParser import JobSaxParser
@@ -156,6 +164,163 @@ def test_job_results_parser_ecsv():
     file.close()
 
 
+class ChunkedResponse:
+    """Response serving its body in chunks, recording the requested sizes"""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+        self.read_sizes = []
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        return self.data.read(size)
+
+
+@pytest.mark.parametrize('output_format', ['votable_plain', 'votable_gzip', 'csv', 'json'])
+def test_job_results_parser_streamed(output_format):
+    file_name = data_path({'csv': '1714556098855O-result.csv', 'json': 'test.json'}.get(
+        output_format, '1714556098855O-result.vot'))
+    with open(file_name, 'rb') as file:
+        data = file.read()
+    if output_format == 'votable_gzip':
+        data = gzip.compress(data)
+
+    response = ChunkedResponse(data)
+    result_table = utils.read_http_response(response, output_format, chunk_size=1024)
+    assert len(result_table.columns) == 152
+    # The body is never requested as a whole
+    assert set(response.read_sizes) == {1024}
+    assert len(response.read_sizes) > len(data) // 1024
+
+
+def test_job_results_parser_output_file(tmp_path):
+    with open(data_path('1714556098855O-result.vot'), 'rb') as file:
+        data = gzip.compress(file.read())
+    output_file = tmp_path / 'result.vot.gz'
+
+    result_table = utils.read_http_response(ChunkedResponse(data), 'votable_gzip', chunk_size=1024,
+                                            output_file=str(output_file))
+    assert len(result_table.columns) == 152
+    assert output_file.read_bytes() == data
+
+
+def test_http_response_stream():
+    data = b''.join(gzip.compress(bytes(range(i, i + 100))) for i in range(0, 200, 100))
+    stream = utils.HttpResponseStream(ChunkedResponse(data), chunk_size=16)
+    assert stream.read(6) == bytes(range(6))
+    assert stream.seek(0) == 0
+    assert stream.read(20) == bytes(range(20))
+    with pytest.raises(io.UnsupportedOperation):
+        stream.seek(0)
+    assert stream.seek(50) == 50
+    # Concatenated gzip members are decompressed as a single stream
+    assert stream.read() == bytes(range(50, 200))
+    assert stream.read() == b''
+
+
+@pytest.mark.parametrize('serialization', ['tabledata', 'binary2'])
+def test_iter_http_response_votable(serialization):
+    table = Table({'source_id': np.arange(25), 'ra': np.linspace(0, 1, 25) * u.deg,
+                   'mag': MaskedColumn(np.arange(25.), mask=np.arange(25) % 3 == 0)})
+    votable = from_table(table)
+    votable.get_first_table().format = serialization
+    data = io.BytesIO()
+    votable.to_xml(data)
+
+    chunks = list(utils.iter_http_response(ChunkedResponse(gzip.compress(data.getvalue())), 'votable_gzip',
+                                           10, chunk_size=256))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    result = vstack(chunks)
+    assert result['ra'].unit == u.deg
+    assert (result['source_id'] == table['source_id']).all()
+    assert (result['mag'].mask == table['mag'].mask).all()
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'ecsv', 'json'])
+def test_iter_http_response_ascii(output_format):
+    file_name = data_path('1714556098855O-result.' + output_format if output_format != 'json' else 'test.json')
+    with open(file_name, 'rb') as file:
+        data = file.read()
+    expected = utils.read_http_response(io.BytesIO(data), output_format)
+
+    chunks = list(utils.iter_http_response(ChunkedResponse(data), output_format, 1, chunk_size=512))
+    assert len(chunks) == len(expected)
+    assert chunks[0].colnames == expected.colnames
+    assert chunks[0]['solution_id'].dtype == expected['solution_id'].dtype
+
+
+def test_read_http_response_csv_types():
+    # The types are guessed from all the rows, even when they change after a large number of them
+    rows = 150000
+    data = ('source_id,mag,name\n' + '1,10,\n' * rows + '2,2.5,x\n3,10,abc\n').encode()
+    result = utils.read_http_response(ChunkedResponse(data), 'csv', chunk_size=65536)
+    assert len(result) == rows + 2
+    assert result['mag'].dtype.kind == 'f'
+    assert result['mag'][-2] == 2.5
+    assert result['name'].dtype.kind == 'U'
+    assert result['name'].mask.sum() == rows
+    assert list(result['name'][-2:]) == ['x', 'abc']
+
+
+def test_iter_http_response_csv_multiline():
+    data = b'source_id,comment\n1,"first\nline"\n2,"say ""hi""\nagain"\n3,plain\n'
+    chunks = list(utils.iter_http_response(ChunkedResponse(data), 'csv', 2, chunk_size=8))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert list(vstack(chunks)['comment']) == ['first\nline', 'say "hi"\nagain', 'plain']
+
+
+def test_iter_http_response_csv_types():
+    data = b'source_id,mag,name\n1,10,\n2,11,\n3,2.5,"x\ny"\n4,12,\n5,abc,007\n6,13,8\n'
+    chunks = list(utils.iter_http_response(ChunkedResponse(data), 'csv', 2, chunk_size=8))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+    # The types are widened from a chunk to the next, never narrowed
+    assert [chunk['mag'].dtype.kind for chunk in chunks] == ['i', 'f', 'U']
+    assert list(chunks[1]['mag']) == [2.5, 12.]
+    assert list(chunks[2]['mag']) == ['abc', '13']
+    assert chunks[1]['name'].dtype.kind == 'U'
+    assert list(chunks[1]['name'].mask) == [False, True]
+    assert list(chunks[2]['name']) == ['007', '8']
+
+
+def test_iter_http_response_empty_and_error():
+    data = io.BytesIO()
+    from_table(Table({'source_id': np.arange(0)})).to_xml(data)
+    chunks = list(utils.iter_http_response(io.BytesIO(data.getvalue()), 'votable', 10))
+    assert len(chunks) == 1
+    assert len(chunks[0]) == 0
+    assert chunks[0].colnames == ['source_id']
+
+    error = (b'<VOTABLE xmlns="http://www.ivoa.net/xml/VOTable/v1.3"><RESOURCE type="results">'
+             b'<INFO name="QUERY_STATUS" value="ERROR">Unknown table</INFO></RESOURCE></VOTABLE>')
+    with pytest.raises(ValueError, match='Unknown table'):
+        list(utils.iter_http_response(io.BytesIO(error), 'votable', 10))
+
+
+@pytest.mark.parametrize('file_name', ['result.parquet', 'result.h5'])
+def test_table_chunk_writer(tmp_path, file_name):
+    pytest.importorskip('pyarrow' if file_name.endswith('parquet') else 'h5py')
+    output_file = str(tmp_path / file_name)
+    table = Table({'source_id': np.arange(25), 'designation': [f"Gaia DR3 {i}" for i in range(25)],
+                   'pm': np.arange(50.).reshape(25, 2)})
+    with utils.TableChunkWriter(output_file) as writer:
+        for start in range(0, 25, 10):
+            writer.write(table[start:start + 10])
+    assert writer.rows == 25
+
+    if file_name.endswith('parquet'):
+        import pyarrow.parquet
+        result = pyarrow.parquet.read_table(output_file).to_pydict()
+        assert result['designation'][-1] == 'Gaia DR3 24'
+    else:
+        result = Table.read(output_file, path='data')
+        assert result['designation'][-1] in ('Gaia DR3 24', b'Gaia DR3 24')
+    assert list(result['source_id']) == list(range(25))
+    assert list(result['pm'][-1]) == [48., 49.]
+
+    with pytest.raises(ValueError, match='parquet'):
+        utils.TableChunkWriter(str(tmp_path / 'result.fits'))
+
+
 def __check_table(table, qualifiedName, numColumns, columnsData, size_bytes=None):
     assert str(table.get_qualified_name()) == str(qualifiedName)
     c = table.columns
@@ -14,75 +14,220 @@ Created on 30 jun. 2016
 
 
 """
-import gzip
+import csv
 import io
 import json
+import os
 import sys
 import warnings
+import zlib
+from xml.etree import ElementTree
 
 import numpy as np
 
 from astropy import units as u
+from astropy.table import Column, MaskedColumn
 from astropy.table import Table as APTable
 from astropy.table.table import Table
 from astropy.utils.exceptions import AstropyWarning
 
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Number of bytes read at once from HTTP(s) responses
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
 
 def util_create_string_from_buffer(buffer):
     return ''.join(map(str, buffer))
 
 
-def read_http_response(response, output_format, *, correct_units=True, use_names_over_ids=False):
-    astropy_format = get_suitable_astropy_format(output_format)
+class HttpResponseStream(io.RawIOBase):
+    """
+    Forward-only, read-only file-like view of the body of an HTTP(s) response.
 
-    # If we want to use astropy.table, we have to read the data
-    data = io.BytesIO(response.read())
+    The body is pulled from ``response`` in chunks of ``chunk_size`` bytes and,
+    if it starts with the gzip magic number, decompressed on the fly, so that a
+    parser consuming the stream never needs the whole (compressed or
+    decompressed) body in memory. The first ``chunk_size`` bytes are kept, which
+    allows readers that sniff a signature and rewind (as astropy does) to seek
+    back to any position within them.
 
-    try:
-        if astropy_format == 'votable':
-            result = APTable.read(io.BytesIO(gzip.decompress(data.read())), format=astropy_format,
-                                  use_names_over_ids=use_names_over_ids)
-        else:
-            result = APTable.read(io.BytesIO(gzip.decompress(data.read())), format=astropy_format)
+    Parameters
+    ----------
+    response : HTTP(s) response object or file object, mandatory
+        object providing ``read(size)``
+    chunk_size : int, optional, default DEFAULT_CHUNK_SIZE
+        number of bytes requested to ``response`` at once
+    output_file : file object, optional
+        if provided, the raw (i.e. still compressed) body is written to it as it
+        is read, so that results can be saved and parsed in a single pass
+    """
 
-    except OSError:
-        # data is not a valid gzip file by BadGzipFile.
+    def __init__(self, response, *, chunk_size=None, output_file=None):
+        super().__init__()
+        self._response = response
+        self._chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self._output_file = output_file
+        self._pending = bytearray()
+        self._head = bytearray()
+        self._pos = 0
+        self._eof = False
+        self._decompressor = None
+        first = self._read_raw()
+        if first[:2] == GZIP_MAGIC:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._feed(first)
 
-        if output_format == 'json':
+    def readable(self):
+        return True
 
-            # Set the file’s current position
-            data.seek(0)
-            data_json = json.load(data)
+    def seekable(self):
+        return True
 
-            if data_json.get('data') and data_json.get('metadata'):
+    def tell(self):
+        return self._pos
 
-                column_name = []
-                for name in data_json['metadata']:
-                    column_name.append(name['name'])
+    def _read_raw(self):
+        data = self._response.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return b''
+        if self._output_file is not None:
+            self._output_file.write(data)
+        return data
 
-                result = Table(rows=data_json['data'], names=column_name, masked=True)
+    def _feed(self, data):
+        decompressor = self._decompressor
+        if decompressor is None:
+            self._pending += data
+            return
+        while data:
+            self._pending += decompressor.decompress(data)
+            data = decompressor.unused_data
+            if decompressor.eof and data:
+                # Concatenated gzip members
+                decompressor = self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
 
-                for v in data_json['metadata']:
-                    col_name = v['name']
-                    result[col_name].unit = v['unit']
-                    result[col_name].description = v['description']
-                    result[col_name].meta = {'metadata': v}
+    def _fill(self, size):
+        while not self._eof and (size < 0 or len(self._pending) < size):
+            self._feed(self._read_raw())
+        if self._eof and self._decompressor is not None:
+            self._pending += self._decompressor.flush()
 
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        if size is None:
+            size = -1
+        self._fill(size)
+        if size < 0 or size >= len(self._pending):
+            data = bytes(self._pending)
+            self._pending.clear()
+        else:
+            data = bytes(self._pending[:size])
+            del self._pending[:size]
+        if self._head is not None:
+            if self._pos + len(data) <= self._chunk_size:
+                self._head += data
             else:
-                result = APTable.read(data, format=astropy_format)
+                self._head = None
+        self._pos += len(data)
+        return data
+
+    def readall(self):
+        return self.read(-1)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("HTTP response streams can only seek from the start or current position")
+        if offset > self._pos:
+            self.read(offset - self._pos)
+        elif offset < self._pos:
+            if self._head is None or offset < 0:
+                raise io.UnsupportedOperation("HTTP response streams can only rewind within their first "
+                                              f"{self._chunk_size} bytes")
+            self._pending[0:0] = self._head[offset:]
+            del self._head[offset:]
+            self._pos = offset
+        return self._pos
+
+
+def read_http_response(response, output_format, *, correct_units=True, use_names_over_ids=False,
+                       chunk_size=None, output_file=None):
+    """Parses the results held by an HTTP(s) response into a table
+
+    The response is streamed (see `HttpResponseStream`) so that gzip
+    compressed results are decompressed on the fly and the body is never
+    buffered as a whole before parsing.
+
+    Parameters
+    ----------
+    response : HTTP(s) response object or file object, mandatory
+        response providing the results
+    output_format : str, mandatory
+        format of the results
+    correct_units : bool, optional, default True
+        whether to fix unrecognized units of the result
+    use_names_over_ids : bool, optional, default False
+        VOTable only: whether to use the FIELD names (instead of their IDs)
+        as column names
+    chunk_size : int, optional, default DEFAULT_CHUNK_SIZE
+        number of bytes read at once from the response
+    output_file : str or file object, optional
+        if provided, the raw response is saved to it while it is parsed
+
+    Returns
+    -------
+    A table
+    """
+    astropy_format = get_suitable_astropy_format(output_format)
+
+    if isinstance(output_file, (str, os.PathLike)):
+        with open(output_file, 'wb') as f:
+            return read_http_response(response, output_format, correct_units=correct_units,
+                                      use_names_over_ids=use_names_over_ids, chunk_size=chunk_size,
+                                      output_file=f)
+
+    data = HttpResponseStream(response, chunk_size=chunk_size, output_file=output_file)
+
+    if output_format == 'json':
+        content = data.read()
+        data_json = json.loads(content)
+
+        if data_json.get('data') and data_json.get('metadata'):
+
+            column_name = []
+            for name in data_json['metadata']:
+                column_name.append(name['name'])
+
+            result = Table(rows=data_json['data'], names=column_name, masked=True)
+
+            for v in data_json['metadata']:
+                col_name = v['name']
+                result[col_name].unit = v['unit']
+                result[col_name].description = v['description']
+                result[col_name].meta = {'metadata': v}
 
-        elif astropy_format == 'votable':
-            result = APTable.read(data, format=astropy_format, use_names_over_ids=use_names_over_ids)
         else:
-            with warnings.catch_warnings():
-                # Capturing the warning and converting the objid column to int64 is necessary for consistency as
-                # it was converted to string on systems with default integer int32 due to an overflow.
-                if sys.platform.startswith('win'):
-                    warnings.filterwarnings("ignore", category=AstropyWarning,
-                                            message=r'OverflowError converting to IntType in column.*')
-                result = APTable.read(data, format=astropy_format)
-                if 'solution_id' in result.columns:
-                    result['solution_id'] = result['solution_id'].astype(np.uint64)
+            result = APTable.read(io.BytesIO(content), format=astropy_format)
+
+    elif astropy_format == 'votable':
+        result = APTable.read(data, format=astropy_format, use_names_over_ids=use_names_over_ids)
+    else:
+        # CSV and ECSV results are parsed in a single read, so that the types of their columns are
+        # guessed from all the rows (see iter_http_response to parse them by blocks of rows)
+        result = _read_ascii_table(data, astropy_format)
+
+    if output_file is not None:
+        # Make sure the saved file is complete even if the parser stopped early
+        data.read()
 
     if correct_units:
         modify_unrecognized_table_units(result)
@@ -90,6 +235,353 @@ def read_http_response(response, output_format, *, correct_units=True, use_names
     return result
 
 
+def _read_ascii_table(data, astropy_format, **kwargs):
+    with warnings.catch_warnings():
+        # Capturing the warning and converting the objid column to int64 is necessary for consistency as
+        # it was converted to string on systems with default integer int32 due to an overflow.
+        if sys.platform.startswith('win'):
+            warnings.filterwarnings("ignore", category=AstropyWarning,
+                                    message=r'OverflowError converting to IntType in column.*')
+        result = APTable.read(data, format=astropy_format, **kwargs)
+        if 'solution_id' in result.columns:
+            result['solution_id'] = result['solution_id'].astype(np.uint64)
+    return result
+
+
+def iter_http_response(response, output_format, chunk_rows, *, correct_units=True, use_names_over_ids=False,
+                       chunk_size=None):
+    """Parses the results held by an HTTP(s) response into successive tables
+
+    VOTable (``TABLEDATA`` serialization), CSV and ECSV results are parsed
+    incrementally while the response is streamed, so that only one chunk of
+    rows is held in memory at a time. Results in other formats or
+    serializations are parsed as a whole and then split.
+
+    The types of CSV columns are guessed for each chunk and widened
+    (integer, then float, then string) from a chunk to the next.
+
+    Parameters
+    ----------
+    response : HTTP(s) response object or file object, mandatory
+        response providing the results
+    output_format : str, mandatory
+        format of the results
+    chunk_rows : int, mandatory
+        number of rows of each table (the last one may be shorter)
+    correct_units : bool, optional, default True
+        whether to fix unrecognized units of the result
+    use_names_over_ids : bool, optional, default False
+        VOTable only: whether to use the FIELD names (instead of their IDs)
+        as column names
+    chunk_size : int, optional, default DEFAULT_CHUNK_SIZE
+        number of bytes read at once from the response
+
+    Returns
+    -------
+    A generator of tables. A result without rows gives a single empty table.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive integer")
+    astropy_format = get_suitable_astropy_format(output_format)
+
+    if astropy_format == 'votable':
+        data = HttpResponseStream(response, chunk_size=chunk_size)
+        chunks = _iter_votable_chunks(data, chunk_rows, use_names_over_ids=use_names_over_ids,
+                                      chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+    elif astropy_format in ('ascii.csv', 'ascii.ecsv'):
+        data = HttpResponseStream(response, chunk_size=chunk_size)
+        chunks = _iter_ascii_chunks(data, astropy_format, chunk_rows)
+    else:
+        chunks = _iter_table_slices(read_http_response(response, output_format, correct_units=False,
+                                                       use_names_over_ids=use_names_over_ids,
+                                                       chunk_size=chunk_size),
+                                    chunk_rows)
+
+    for chunk in chunks:
+        if correct_units:
+            modify_unrecognized_table_units(chunk)
+        yield chunk
+
+
+def _iter_table_slices(table, chunk_rows):
+    for start in range(0, max(len(table), 1), chunk_rows):
+        yield table[start:start + chunk_rows]
+
+
+def _iter_votable_chunks(data, chunk_rows, *, use_names_over_ids, chunk_size):
+    """
+    Splits the first table of a VOTable into tables of ``chunk_rows`` rows.
+
+    The document is pulled with an incremental XML parser. Each chunk is
+    parsed by astropy as a document made of the table header (i.e. everything
+    read before its rows) and the rows of the chunk, which are then dropped,
+    so that all chunks get the column names, types, units and masks the
+    whole table would have.
+    """
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    root = None
+    tabledata = None
+    binary = False
+    rows = 0
+    total = 0
+
+    def parse_document():
+        return APTable.read(io.BytesIO(ElementTree.tostring(root)), format='votable',
+                            use_names_over_ids=use_names_over_ids)
+
+    def parse_rows(nrows):
+        if tabledata is None:
+            return parse_document()
+        # The parser may already be filling the rows after the chunk
+        pending = list(tabledata)[nrows:]
+        for tr in pending:
+            tabledata.remove(tr)
+        chunk = parse_document()
+        tabledata.clear()
+        tabledata.extend(pending)
+        return chunk
+
+    while True:
+        content = data.read(chunk_size)
+        if content:
+            parser.feed(content)
+        else:
+            parser.close()
+        for event, elem in parser.read_events():
+            if event == 'start':
+                # Namespaces are dropped so that the header can be serialized again as is
+                elem.tag = elem.tag.rpartition('}')[2]
+                if root is None:
+                    root = elem
+                elif elem.tag == 'TABLEDATA' and tabledata is None:
+                    tabledata = elem
+                elif elem.tag in ('BINARY', 'BINARY2', 'FITS'):
+                    binary = True
+            elif elem.tag == 'TR' and tabledata is not None:
+                rows += 1
+                if rows == chunk_rows:
+                    yield parse_rows(rows)
+                    total += rows
+                    rows = 0
+            elif elem.tag == 'INFO' and elem.get('name') == 'QUERY_STATUS' and elem.get('value') == 'ERROR':
+                raise ValueError(f"Query failed: {(elem.text or '').strip()}")
+            elif elem.tag == 'TABLE':
+                if binary:
+                    # Rows of binary serializations can't be told apart without decoding the whole stream
+                    yield from _iter_table_slices(parse_document(), chunk_rows)
+                elif rows or not total:
+                    yield parse_rows(rows)
+                return
+        if not content:
+            return
+
+
+def _iter_ascii_chunks(data, astropy_format, chunk_rows):
+    """
+    Splits a CSV or ECSV table into tables of ``chunk_rows`` rows, each
+    one parsed along with the header lines of the table.
+
+    ECSV chunks get the types declared in the header. The types of CSV
+    columns are guessed for each chunk and widened (integer, then float,
+    then string) to the widest type of the previous chunks, so that a
+    column may get a wider type than in the previous chunks, but never a
+    narrower one.
+    """
+    lines = io.TextIOWrapper(io.BufferedReader(data), encoding='utf-8', newline='')
+    header = []
+    for line in lines:
+        header.append(line)
+        if astropy_format == 'ascii.csv' or not line.startswith('#'):
+            # The CSV header is made of the column names, ECSV ones are preceded by the metadata
+            break
+
+    ranks = {}
+
+    def parse_rows(rows):
+        chunk = _read_ascii_table(_join_ascii_lines(header + rows), astropy_format)
+        if astropy_format == 'ascii.csv':
+            _widen_csv_types(chunk, rows, ranks)
+        return chunk
+
+    rows = []
+    total = 0
+    for row in _iter_ascii_records(lines):
+        rows.append(row)
+        if len(rows) == chunk_rows:
+            yield parse_rows(rows)
+            total += len(rows)
+            rows = []
+    if rows or not total:
+        yield parse_rows(rows)
+
+
+def _csv_type_rank(dtype):
+    # Types guessed by astropy for CSV columns, from the narrowest to the widest
+    return {'i': 0, 'u': 0, 'f': 1}.get(dtype.kind, 2)
+
+
+def _widen_csv_types(chunk, rows, ranks):
+    """
+    Casts the columns of a CSV chunk to the widest type in ``ranks`` (the
+    ranks of the types of the previous chunks, updated with the ones of
+    ``chunk``). Numbers widened to strings are taken from the text of
+    ``rows``, so that they are kept as written.
+    """
+    values = None
+    for index, (name, column) in enumerate(chunk.columns.items()):
+        rank = _csv_type_rank(column.dtype)
+        widest = ranks.get(name, rank)
+        if rank >= widest:
+            ranks[name] = rank
+        elif widest == 1:
+            chunk.replace_column(name, column.astype(np.float64))
+        else:
+            if values is None:
+                values = [record for record in csv.reader(rows) if record]
+            text = [record[index] for record in values]
+            mask = [not value for value in text]
+            chunk.replace_column(name, MaskedColumn(text, name=name, mask=mask) if any(mask)
+                                 else Column(text, name=name))
+
+
+def _iter_ascii_records(lines):
+    # A quoted value may contain line breaks: a row only ends with a line closing all its quotes
+    # (quotes inside quoted values are doubled, so they don't change the parity)
+    record = ''
+    for line in lines:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ''
+    if record:
+        yield record
+
+
+def _join_ascii_lines(lines):
+    # astropy reads a string as the table itself only if it has a line break, else as a file name
+    text = ''.join(lines)
+    return text if '\n' in text else text + '\n'
+
+
+class TableChunkWriter:
+    """
+    Appends successive tables with the same columns to a single Parquet or
+    HDF5 file, so that results too large to fit in memory can be saved chunk
+    by chunk.
+
+    Parquet files are written with ``pyarrow`` and can be read back with
+    ``Table.read(file_name, format='parquet')``. HDF5 files are written with
+    ``h5py``: the rows are appended to a single compound dataset at ``path``,
+    which can be read back with ``Table.read(file_name, path=path)``. Masked
+    values are written with their fill value, and strings are stored as
+    variable-length UTF-8 strings.
+
+    Parameters
+    ----------
+    output_file : str, mandatory
+        file name
+    file_format : str, optional, default None
+        'parquet' or 'hdf5'. By default, it is guessed from the extension of
+        ``output_file`` ('.parquet', '.pq', '.h5', '.hdf5')
+    path : str, optional, default 'data'
+        HDF5 only: path of the dataset within the file
+    """
+
+    FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.h5': 'hdf5', '.hdf5': 'hdf5'}
+
+    def __init__(self, output_file, *, file_format=None, path='data'):
+        if file_format is None:
+            file_format = self.FORMATS.get(os.path.splitext(output_file)[1].lower())
+        if file_format not in ('parquet', 'hdf5'):
+            raise ValueError(f"Cannot write table chunks to {output_file}: "
+                             "the file format must be either 'parquet' or 'hdf5'")
+        self.output_file = output_file
+        self.file_format = file_format
+        self.path = path
+        self.rows = 0
+        self.__writer = None
+        self.__dataset = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, table):
+        """Appends the rows of ``table`` to the file
+
+        Parameters
+        ----------
+        table : Table object, mandatory
+            table with the same columns as the previous ones
+        """
+        if self.file_format == 'parquet':
+            self.__write_parquet(table)
+        else:
+            self.__write_hdf5(table)
+        self.rows += len(table)
+
+    def close(self):
+        """Closes the file"""
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+            self.__dataset = None
+
+    def __write_parquet(self, table):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as err:
+            raise ImportError("The module 'pyarrow' is mandatory to write Parquet files. "
+                              "Install it with 'pip install pyarrow'") from err
+        arrays = []
+        for col in table.itercols():
+            values = np.asarray(col)
+            mask = np.ma.getmaskarray(col) if hasattr(col, 'mask') else None
+            if values.ndim > 1:
+                values = list(values)
+                mask = mask.reshape(len(col), -1).all(axis=1) if mask is not None else None
+            arrays.append(pyarrow.array(values, mask=mask))
+        if self.__writer is None:
+            fields = []
+            for col, array in zip(table.itercols(), arrays):
+                metadata = {'unit': str(col.unit)} if col.unit is not None else None
+                fields.append(pyarrow.field(col.info.name, array.type, metadata=metadata))
+            self.__writer = pyarrow.parquet.ParquetWriter(self.output_file, pyarrow.schema(fields))
+        schema = self.__writer.schema
+        self.__writer.write_table(pyarrow.Table.from_arrays(
+            [array.cast(field.type) for array, field in zip(arrays, schema)], schema=schema))
+
+    def __write_hdf5(self, table):
+        try:
+            import h5py
+        except ImportError as err:
+            raise ImportError("The module 'h5py' is mandatory to write HDF5 files. "
+                              "Install it with 'pip install h5py'") from err
+        if self.__writer is None:
+            self.__writer = h5py.File(self.output_file, 'w')
+        columns = []
+        for col in table.itercols():
+            values = col.filled() if hasattr(col, 'filled') else col
+            values = np.asarray(values)
+            if values.dtype.kind in 'US':
+                values = values.astype(h5py.string_dtype('utf-8') if values.dtype.kind == 'U'
+                                       else h5py.string_dtype('ascii'))
+            columns.append((col.info.name, values))
+        if self.__dataset is None:
+            dtype = np.dtype([(name, values.dtype, values.shape[1:]) for name, values in columns])
+            self.__dataset = self.__writer.create_dataset(self.path, shape=(0,), maxshape=(None,),
+                                                          dtype=dtype, chunks=True)
+        dataset = self.__dataset
+        rows = np.empty(len(table), dtype=dataset.dtype)
+        for name, values in columns:
+            rows[name] = values
+        dataset.resize((dataset.shape[0] + len(rows),))
+        dataset[dataset.shape[0] - len(rows):] = rows
+
+
 def get_suitable_astropy_format(output_format):
     if 'ecsv' == output_format:
         return 'ascii.ecsv'
@@ -14,6 +14,18 @@ class Conf(_config.ConfigNamespace):
         300,
         'time limit for connecting to xMatch server')
 
+    chunk_size = _config.ConfigItem(
+        100000,
+        'Maximum number of rows of an uploaded table sent in a single xMatch request.')
+
+    query_workers = _config.ConfigItem(
+        2,
+        'Maximum number of chunks of an uploaded table cross-matched concurrently.')
+
+    upload_format = _config.ConfigItem(
+        ['csv', 'votable'],
+        'Format of the uploaded tables: csv, or votable for the (smaller) VOTable BINARY2 serialization.')
+
 
 conf = Conf()
 
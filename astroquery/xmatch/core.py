@@ -1,10 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO, BytesIO
 
 from astropy.io import votable
 import astropy.units as u
-from astropy.table import Table
+from astropy.table import Table, vstack
 from requests import HTTPError
 
 from astroquery.query import BaseQuery
@@ -18,14 +20,27 @@ except ImportError:
     pass
 
 
+class _SerializedTable(namedtuple('_SerializedTable', ['filename', 'content'])):
+    """
+    Table already serialized for upload, sent as is with each chunk of a
+    chunked query.
+    """
+
+    def __str__(self):
+        return self.filename
+
+
 @async_to_sync
 class XMatchClass(BaseQuery):
     URL = conf.url
     TIMEOUT = conf.timeout
+    CHUNK_SIZE = conf.chunk_size
+    QUERY_WORKERS = conf.query_workers
 
     def query(self, cat1, cat2, max_distance, *,
               colRA1=None, colDec1=None, colRA2=None, colDec2=None,
-              area='allsky', cache=True, get_query_payload=False, **kwargs):
+              area='allsky', cache=True, get_query_payload=False,
+              chunk_size=None, upload_format=None, **kwargs):
         """
         Query the `CDS cross-match service
         <http://cdsxmatch.u-strasbg.fr/xmatch>`_ by finding matches between
@@ -66,26 +81,66 @@ class XMatchClass(BaseQuery):
         cache : bool
             Defaults to True. If set overrides global caching behavior.
             See :ref:`caching documentation <astroquery_cache>`.
+        chunk_size : int, optional
+            If ``cat1`` is an `~astropy.table.Table` with more rows than
+            ``chunk_size``, it is uploaded in chunks of ``chunk_size`` rows,
+            which are cross-matched concurrently by at most ``QUERY_WORKERS``
+            threads (``conf.query_workers``). The results are concatenated in
+            the order of the chunks. Defaults to ``conf.chunk_size``.
+        upload_format : str, optional
+            Format of the uploaded `~astropy.table.Table`: ``'csv'``, or
+            ``'votable'`` for the more compact VOTable BINARY2 serialization.
+            Defaults to ``conf.upload_format``.
 
         Returns
         -------
         table : `~astropy.table.Table`
             Query results table
         """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        if isinstance(cat1, Table) and len(cat1) > chunk_size and not get_query_payload:
+            return self._query_chunks(cat1, cat2, max_distance, chunk_size=chunk_size,
+                                      colRA1=colRA1, colDec1=colDec1, colRA2=colRA2, colDec2=colDec2,
+                                      area=area, cache=cache, upload_format=upload_format, **kwargs)
+
         response = self.query_async(cat1, cat2, max_distance, colRA1=colRA1, colDec1=colDec1,
                                     colRA2=colRA2, colDec2=colDec2, area=area, cache=cache,
                                     get_query_payload=get_query_payload,
-                                    **kwargs)
+                                    upload_format=upload_format, **kwargs)
         if get_query_payload:
             return response
 
         content = BytesIO(response.content)
         return Table.read(content, format='votable', use_names_over_ids=True)
 
+    def _query_chunks(self, cat1, cat2, max_distance, *, chunk_size, upload_format=None, **kwargs):
+        """
+        Cross-match ``cat1`` in chunks of ``chunk_size`` rows, concurrently, and
+        concatenate the results in the order of the chunks.
+        """
+        if not isinstance(cat2, str):
+            # uploaded once serialized, rather than serialized again for each chunk
+            cat2 = self._serialize_table(2, cat2, upload_format=upload_format or conf.upload_format)
+
+        def run_query(start):
+            response = self.query_async(cat1[start:start + chunk_size], cat2, max_distance,
+                                        upload_format=upload_format, **kwargs)
+            return Table.read(BytesIO(response.content), format='votable', use_names_over_ids=True)
+
+        starts = range(0, len(cat1), chunk_size)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.QUERY_WORKERS, len(starts))))
+        try:
+            futures = [executor.submit(run_query, start) for start in starts]
+            results = [future.result() for future in futures]
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        return vstack(results, metadata_conflicts='silent')
+
     @prepend_docstr_nosections("\n" + query.__doc__)
     def query_async(self, cat1, cat2, max_distance, *, colRA1=None, colDec1=None,
                     colRA2=None, colDec2=None, area='allsky', cache=True,
-                    get_query_payload=False, **kwargs):
+                    get_query_payload=False, upload_format=None, **kwargs):
         """
         Returns
         -------
@@ -101,8 +156,11 @@ class XMatchClass(BaseQuery):
 
         kwargs = {}
 
-        self._prepare_sending_table(1, payload, kwargs, cat1, colRA1, colDec1)
-        self._prepare_sending_table(2, payload, kwargs, cat2, colRA2, colDec2)
+        upload_format = upload_format or conf.upload_format
+        if upload_format not in ('csv', 'votable'):
+            raise ValueError(f"upload_format must be 'csv' or 'votable', not '{upload_format}'.")
+        self._prepare_sending_table(1, payload, kwargs, cat1, colRA1, colDec1, upload_format=upload_format)
+        self._prepare_sending_table(2, payload, kwargs, cat2, colRA2, colDec2, upload_format=upload_format)
         self._prepare_area(payload, area)
 
         if get_query_payload:
@@ -127,7 +185,7 @@ class XMatchClass(BaseQuery):
 
         return response
 
-    def _prepare_sending_table(self, cat_index, payload, kwargs, cat, colRA, colDec):
+    def _prepare_sending_table(self, cat_index, payload, kwargs, cat, colRA, colDec, *, upload_format='csv'):
         '''Check if table is a string, a `astropy.table.Table`, etc. and set
         query parameters accordingly.
         '''
@@ -142,18 +200,10 @@ class XMatchClass(BaseQuery):
             # create the dictionary of uploaded files
             if "files" not in kwargs:
                 kwargs["files"] = {}
-            if isinstance(cat, Table):
-                # write the Table's content into a new, temporary CSV-file
-                # so that it can be pointed to via the `files` option
-                # file will be closed when garbage-collected
-
-                fp = StringIO()
-                cat.write(fp, format='ascii.csv')
-                fp.seek(0)
-                kwargs['files'].update({catstr: (f'cat{cat_index}.csv', fp.read())})
-            else:
-                # assume it's a file-like object, support duck-typing
-                kwargs['files'].update({catstr: (f'cat{cat_index}.csv', cat.read())})
+            upload = cat
+            if not isinstance(upload, _SerializedTable):
+                upload = self._serialize_table(cat_index, cat, upload_format=upload_format)
+            kwargs['files'].update({catstr: tuple(upload)})
 
         if not self.is_table_available(cat):
             if ((colRA is None) or (colDec is None)):
@@ -168,6 +218,29 @@ class XMatchClass(BaseQuery):
             payload['colRA{0}'.format(cat_index)] = colRA
             payload['colDec{0}'.format(cat_index)] = colDec
 
+    def _serialize_table(self, cat_index, cat, *, upload_format='csv'):
+        '''Return the file name and content with which ``cat``, a
+        `astropy.table.Table` or a file-like object, is uploaded.
+        '''
+        if isinstance(cat, Table) and upload_format == 'votable':
+            # the BINARY2 serialization is much smaller than CSV for
+            # numerical columns
+            fp = BytesIO()
+            votable.from_table(cat).to_xml(fp, tabledata_format='binary2')
+            return _SerializedTable(f'cat{cat_index}.vot', fp.getvalue())
+        elif isinstance(cat, Table):
+            # write the Table's content into a new, temporary CSV-file
+            # so that it can be pointed to via the `files` option
+            # file will be closed when garbage-collected
+
+            fp = StringIO()
+            cat.write(fp, format='ascii.csv')
+            fp.seek(0)
+            return _SerializedTable(f'cat{cat_index}.csv', fp.read())
+        else:
+            # assume it's a file-like object, support duck-typing
+            return _SerializedTable(f'cat{cat_index}.csv', cat.read())
+
     def _prepare_area(self, payload, area):
         '''Set the area parameter in the payload'''
         if area is None or area == 'allsky':
@@ -1,10 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+from io import BytesIO
 from pathlib import Path
 import re
 
 import requests
 import pytest
 from astropy.io import ascii
+from astropy.io import votable
 from astropy.table import Table
 from astropy.units import arcsec
 
@@ -156,3 +158,75 @@ def test_prepare_sending_tables(monkeypatch):
     assert (kwargs == {'files': {'cat1': ('cat1.csv', 'a,b\n0,3\n1,4\n2,5\n')}}
             # for windows systems
             or kwargs == {'files': {'cat1': ('cat1.csv', 'a,b\r\n0,3\r\n1,4\r\n2,5\r\n')}})
+
+
+def test_prepare_sending_table_votable():
+    payload = {}
+    kwargs = {}
+    cat = Table({'a': [0., 1., 2.], 'b': [3., 4., 5.]})
+    XMatch()._prepare_sending_table(1, payload, kwargs, cat, "a", "b", upload_format='votable')
+    filename, content = kwargs['files']['cat1']
+    assert filename == 'cat1.vot'
+    assert b'BINARY2' in content
+    uploaded = Table.read(BytesIO(content), format='votable')
+    assert list(uploaded['a']) == [0., 1., 2.]
+
+    with pytest.raises(ValueError, match="upload_format must be"):
+        XMatch().query_async(cat, 'vizier:II/246/out', 5 * arcsec, colRA1='a', colDec1='b',
+                             get_query_payload=True, upload_format='fits')
+
+
+def test_query_chunks(monkeypatch):
+    xm = XMatch()
+    xm.QUERY_WORKERS = 3
+
+    def chunk_mockreturn(method, url, data, **kwargs):
+        if method == 'GET':
+            return request_mockreturn(method, url, data, **kwargs)
+        # echo the uploaded chunk back with an angDist column
+        chunk = Table.read(kwargs['files']['cat1'][1], format='ascii.csv')
+        chunk.add_column(chunk['ra'] / 10, name='angDist', index=0)
+        fp = BytesIO()
+        votable.from_table(chunk).to_xml(fp)
+        return MockResponse(content=fp.getvalue())
+
+    monkeypatch.setattr(xm, '_request', chunk_mockreturn)
+    cat1 = Table({'ra': [float(ii) for ii in range(10)], 'dec': [0.] * 10, 'my_id': range(10)})
+    table = xm.query(cat1, 'test', 5 * arcsec, colRA1='ra', colDec1='dec', colRA2='ra', colDec2='dec',
+                     chunk_size=3)
+    assert table.colnames == ['angDist', 'ra', 'dec', 'my_id']
+    assert list(table['my_id']) == list(range(10))
+    assert list(table['angDist']) == [ii / 10 for ii in range(10)]
+
+
+@pytest.mark.parametrize('upload_format', ['csv', 'votable'])
+def test_query_chunks_upload_cat2_once(monkeypatch, upload_format):
+    xm = XMatch()
+    uploads = []
+
+    def chunk_mockreturn(method, url, data, **kwargs):
+        uploads.append(kwargs['files']['cat2'])
+        fp = BytesIO()
+        votable.from_table(Table({'angDist': [0.]})).to_xml(fp)
+        return MockResponse(content=fp.getvalue())
+
+    serialize_table = xm._serialize_table
+    serialized = []
+
+    def serialize_mock(cat_index, cat, **kwargs):
+        serialized.append(cat_index)
+        return serialize_table(cat_index, cat, **kwargs)
+
+    monkeypatch.setattr(xm, '_request', chunk_mockreturn)
+    monkeypatch.setattr(xm, '_serialize_table', serialize_mock)
+    cat1 = Table({'ra': [float(ii) for ii in range(10)], 'dec': [0.] * 10})
+    cat2 = Table({'ra': [1., 2.], 'dec': [0., 0.]})
+    table = xm.query(cat1, cat2, 5 * arcsec, colRA1='ra', colDec1='dec', colRA2='ra', colDec2='dec',
+                     chunk_size=3, upload_format=upload_format)
+    assert len(table) == 4
+    # cat2 is serialized once and the same content is sent with each chunk
+    assert serialized.count(2) == 1
+    assert serialized.count(1) == 4
+    assert len(uploads) == 4
+    assert all(upload == uploads[0] for upload in uploads)
+    assert uploads[0][0] == ('cat2.vot' if upload_format == 'votable' else 'cat2.csv')